@@ -1,14 +1,15 @@
 import streamlit as st
 import subprocess
-import time
 import os
-from backend.agents.agents import create_agent
-from langchain.memory import ConversationBufferMemory
-from langchain.schema import HumanMessage, AIMessage
+from backend.api.readiness import is_ready, wait_until_ready
+from backend.observability.tracing import span
 import threading
-import requests
 import sys
 
+API_BASE_URL = "http://localhost:8001"
+# Seconds to wait for a freshly started API server to answer /healthz
+API_STARTUP_TIMEOUT = float(os.getenv("API_STARTUP_TIMEOUT", "30"))
+
 # Page configuration
 st.set_page_config(
     page_title="Grievance Management Chatbot",
@@ -173,60 +174,101 @@ st.markdown("""
 if "messages" not in st.session_state:
     st.session_state.messages = []
 if "memory" not in st.session_state:
-    st.session_state.memory = ConversationBufferMemory(
-        memory_key="chat_history",
-        return_messages=True
-    )
+    # Created on the first turn by get_memory
+    st.session_state.memory = None
 if "api_server_running" not in st.session_state:
     st.session_state.api_server_running = False
-if "agent" not in st.session_state:
-    st.session_state.agent = None
+if "api_server_started" not in st.session_state:
+    st.session_state.api_server_started = False
 if "input_key" not in st.session_state:
     st.session_state.input_key = 0
 if "show_welcome" not in st.session_state:
     st.session_state.show_welcome = True
+if "pending_input" not in st.session_state:
+    st.session_state.pending_input = None
+if "turn_metrics" not in st.session_state:
+    st.session_state.turn_metrics = []
+
+# The agent stack (LangChain, langchain_openai) takes seconds to import, so it is
+# loaded after the first page has rendered instead of before it
+def get_agent():
+    """The process-wide agent, importing the agent stack on first use"""
+    from backend.agents.agents import get_shared_agent
+    return get_shared_agent()
+
+def get_memory():
+    """This session's chat memory, created on its first turn"""
+    if st.session_state.memory is None:
+        from backend.agents.memory import create_memory
+        # Token-bounded window plus rolling summary, so prompts stay flat in long sessions
+        st.session_state.memory = create_memory()
+    return st.session_state.memory
+
+@st.cache_resource
+def start_agent_warmup():
+    """Build the shared agent on a background thread, once per process"""
+    def warm():
+        try:
+            get_agent()
+        except Exception as e:
+            print(f"Warning: agent warm-up failed: {e}")
+
+    thread = threading.Thread(target=warm, name="agent-warmup", daemon=True)
+    thread.start()
+    return thread
 
 def start_api_server():
-    """Start the FastAPI server in the background"""
+    """Start the FastAPI server in the background and wait until /healthz answers"""
+    st.session_state.api_server_started = True
     if not st.session_state.api_server_running:
-        try:
-            response = requests.get("http://localhost:8000/docs")
-            if response.status_code == 200:
-                st.session_state.api_server_running = True
-                return
-        except:
-            pass
+        if is_ready(API_BASE_URL):
+            st.session_state.api_server_running = True
+            return
         
         subprocess.Popen([sys.executable, "-m", "backend.api.api_server"])
-        time.sleep(3)
-        st.session_state.api_server_running = True
+        st.session_state.api_server_running = wait_until_ready(API_BASE_URL, API_STARTUP_TIMEOUT)
 
-def get_chat_response(user_input):
-    """Get response from the agent"""
+def stream_chat_response(user_input, placeholder):
+    """Stream the agent's reply into placeholder and return the final text"""
     try:
-        if st.session_state.agent is None:
-            st.session_state.agent = create_agent()
-        
-        chat_history = st.session_state.memory.chat_memory.messages
-        
-        response = st.session_state.agent.invoke({
-            "input": user_input,
-            "chat_history": chat_history
-        })
-        
-        st.session_state.memory.chat_memory.add_user_message(user_input)
-        st.session_state.memory.chat_memory.add_ai_message(response["output"])
-        
-        return response["output"]
+        # One trace per turn: tool calls, LLM calls and the API requests they make nest under it
+        with span("chat.turn") as turn:
+            # One agent per process; per-session state lives only in the memory object
+            agent = get_agent()
+            memory = get_memory()
+            chat_history = memory.load_memory_variables({})["chat_history"]
+            
+            from backend.agents.streaming import AgentStream
+            stream = AgentStream(agent, {
+                "input": user_input,
+                "chat_history": chat_history
+            })
+            partial = ""
+            for token in stream:
+                partial += token
+                display_message(partial + "▌", container=placeholder)
+            response = stream.output
+            
+            # Logged per turn to confirm prompt size stays flat over long sessions
+            stream.metrics.prompt_tokens = memory.count_prompt_tokens(chat_history, user_input)
+            memory.save_context({"input": user_input}, {"output": response})
+            
+            metrics = stream.metrics.as_dict()
+            turn.set("fast_path", metrics.get("fast_path"))
+            st.session_state.turn_metrics.append(metrics)
+            print(f"Turn metrics: {metrics} request_id={turn.request_id}")
     except Exception as e:
-        return f" Error: {str(e)}"
+        response = f" Error: {str(e)}"
+    
+    display_message(response, container=placeholder)
+    return response
 
-def display_message(msg, is_user=False):
+def display_message(msg, is_user=False, container=None):
     """Display a chat message"""
     message_class = "user" if is_user else "bot"
     avatar = "👤" if is_user else "🤖"
     
-    st.markdown(f"""
+    (container or st).markdown(f"""
     <div class="chat-message {message_class}">
         <div class="avatar">{avatar}</div>
         <div class="message">{msg}</div>
@@ -234,19 +276,15 @@ def display_message(msg, is_user=False):
     """, unsafe_allow_html=True)
 
 def process_input(user_input):
-    """Process user input and add to chat"""
+    """Add user input to the chat; the reply is streamed on the next run"""
     if user_input and user_input.strip():
         st.session_state.show_welcome = False
         st.session_state.messages.append({"role": "user", "content": user_input})
-        
-        with st.spinner("Bot is thinking..."):
-            bot_response = get_chat_response(user_input)
-        
-        st.session_state.messages.append({"role": "assistant", "content": bot_response})
+        st.session_state.pending_input = user_input
         st.session_state.input_key += 1
 
-# Start API server automatically
-if not st.session_state.api_server_running:
+# Start API server automatically (once; the sidebar offers a restart if it does not come up)
+if not st.session_state.api_server_started:
     with st.spinner("Starting services..."):
         start_api_server()
     st.rerun()
@@ -302,6 +340,13 @@ with col2:
         with chat_container:
             for msg in st.session_state.messages:
                 display_message(msg["content"], msg["role"] == "user")
+            
+            # Stream the reply to the latest message token by token
+            if st.session_state.pending_input:
+                pending_input = st.session_state.pending_input
+                st.session_state.pending_input = None
+                bot_response = stream_chat_response(pending_input, st.empty())
+                st.session_state.messages.append({"role": "assistant", "content": bot_response})
     
     # Spacer
     st.markdown("<br>", unsafe_allow_html=True)
@@ -332,7 +377,8 @@ with col2:
     with col_clear:
         if st.button("🔄 New Conversation", use_container_width=True, type="secondary"):
             st.session_state.messages = []
-            st.session_state.memory.clear()
+            if st.session_state.memory is not None:
+                st.session_state.memory.clear()
             st.session_state.input_key += 1
             st.session_state.show_welcome = True
             st.rerun()
@@ -350,7 +396,7 @@ with col2:
             
             2. **Check complaint status:**
                - Click "Check Status" or ask about your complaint
-               - Provide your complaint ID (e.g., CMP-ABC12345)
+               - Provide your complaint ID (e.g., CMP-01M56CBCZT9WSFF9)
             
             3. **View all complaints:**
                - Click "My Complaints" or ask to see all complaints
@@ -358,7 +404,7 @@ with col2:
             
             **Example messages:**
             - "I want to register a complaint about my laptop"
-            - "Check status of CMP-ABC12345"
+            - "Check status of CMP-01M56CBCZT9WSFF9"
             - "Show all complaints for 9876543210"
             """)
 
@@ -387,6 +433,24 @@ with st.sidebar:
     with col_stat2:
         st.metric("Bot", bot_messages)
     
+    if st.session_state.turn_metrics:
+        last_turn = st.session_state.turn_metrics[-1]
+        col_stat3, col_stat4 = st.columns(2)
+        with col_stat3:
+            st.metric("First token", f"{last_turn['ttft_ms'] / 1000:.2f}s")
+        with col_stat4:
+            st.metric("Full reply", f"{last_turn['total_ms'] / 1000:.2f}s")
+    
+    if st.session_state.turn_metrics:
+        # Counted across every session sharing this process's agent
+        from backend.agents.llm_cache import get_shared_response_cache
+        router_stats = get_agent().stats.as_dict()
+        if router_stats["total_turns"]:
+            st.metric("Answered without LLM", f"{router_stats['fast_path_percent']}%")
+        response_cache = get_shared_response_cache()
+        if response_cache is not None:
+            st.metric("LLM cache hit rate", f"{response_cache.stats()['hit_rate'] * 100:.1f}%")
+    
     st.markdown("---")
     
     st.markdown("### 💡 Tips")
@@ -420,4 +484,7 @@ st.markdown(
     </div>
     """,
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+# The page is already on screen; get the agent ready before the first message
+start_agent_warmup()
@@ -1,144 +1,203 @@
 from langchain.agents import Tool, AgentExecutor, create_openai_functions_agent
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.memory import ConversationBufferMemory
-from typing import Dict, Any
-import requests
+from typing import Dict, Any, Optional
+from backend.agents.backends import create_backend, BackendError, DEFAULT_API_BASE_URL
+from backend.agents.router import IntentRouter, FastPathAgent
+from backend.agents.llm_cache import CachedChatOpenAI, get_shared_response_cache
+from backend.observability.tracing import traced
 import json
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
 
+_shared_agent = None
+_shared_agent_lock = threading.Lock()
+
 class ComplaintTools:
-    def __init__(self, api_base_url="http://localhost:8001"):
-        self.api_base_url = api_base_url
+    def __init__(self, api_base_url=DEFAULT_API_BASE_URL, page_size=10, session=None,
+                 timeout=None, backend=None):
+        self.page_size = page_size
+        # HTTP to the API server by default, or Database in process (COMPLAINT_TOOLS_BACKEND)
+        self.backend = backend or create_backend(
+            api_base_url=api_base_url, session=session, timeout=timeout
+        )
+    
+    @staticmethod
+    def _parse_complaint_input(input_str: str) -> Dict[str, str]:
+        """Pull name, mobile and complaint details out of free-form tool input"""
+        name = ""
+        mobile = ""
+        complaint_details = ""
+        
+        # Try JSON parsing first
+        try:
+            if input_str.startswith('{'):
+                data = json.loads(input_str)
+                name = data.get('name', '')
+                mobile = data.get('mobile', '')
+                complaint_details = data.get('complaint_details', '')
+            else:
+                # Parse comma-separated or other formats
+                parts = input_str.split(',')
+                if len(parts) >= 3:
+                    name = parts[0].strip()
+                    mobile = parts[1].strip()
+                    complaint_details = ','.join(parts[2:]).strip()
+        except:
+            # Fallback parsing
+            lines = input_str.strip().split('\n')
+            for line in lines:
+                if 'name:' in line.lower():
+                    name = line.split(':', 1)[1].strip()
+                elif 'mobile:' in line.lower() or 'phone:' in line.lower():
+                    mobile = line.split(':', 1)[1].strip()
+                elif 'complaint:' in line.lower() or 'details:' in line.lower():
+                    complaint_details = line.split(':', 1)[1].strip()
+        
+        return {"name": name, "mobile": mobile, "complaint_details": complaint_details}
+    
+    @staticmethod
+    def _format_registration(data: Dict[str, Any]) -> str:
+        return f" {data['message']}"
+    
+    @staticmethod
+    def _format_status(complaint_id: str, data: Optional[Dict[str, Any]]) -> str:
+        if data is None:
+            return f" No complaint found with ID: {complaint_id}"
+        return f""" Complaint Status:
+- ID: {data['complaint_id']}
+- Status: {data['status']}
+- Created: {data['created_at']}
+- Updated: {data['updated_at']}"""
+    
+    @staticmethod
+    def _format_complaints(mobile: str, data: Dict[str, Any]) -> str:
+        complaints = data["complaints"]
+        if not complaints:
+            return f"No complaints found for mobile number: {mobile}"
+        result = f"📱 Complaints for mobile {mobile}:\n\n"
+        for complaint in complaints:
+            result += f"• ID: {complaint['complaint_id']}\n"
+            result += f"  Status: {complaint['status']}\n"
+            result += f"  Details: {complaint['details']}\n"
+            result += f"  Created: {complaint['created_at']}\n\n"
+        if data.get("next_cursor"):
+            result += f"Showing the {len(complaints)} most recent complaints."
+        return result
     
+    @traced("tool.register_complaint")
     def register_complaint(self, input_str: str) -> str:
         """Register a new complaint with flexible input parsing"""
         try:
-            # Parse input
-            name = ""
-            mobile = ""
-            complaint_details = ""
-            
-            # Try JSON parsing first
-            try:
-                if input_str.startswith('{'):
-                    data = json.loads(input_str)
-                    name = data.get('name', '')
-                    mobile = data.get('mobile', '')
-                    complaint_details = data.get('complaint_details', '')
-                else:
-                    # Parse comma-separated or other formats
-                    parts = input_str.split(',')
-                    if len(parts) >= 3:
-                        name = parts[0].strip()
-                        mobile = parts[1].strip()
-                        complaint_details = ','.join(parts[2:]).strip()
-            except:
-                # Fallback parsing
-                lines = input_str.strip().split('\n')
-                for line in lines:
-                    if 'name:' in line.lower():
-                        name = line.split(':', 1)[1].strip()
-                    elif 'mobile:' in line.lower() or 'phone:' in line.lower():
-                        mobile = line.split(':', 1)[1].strip()
-                    elif 'complaint:' in line.lower() or 'details:' in line.lower():
-                        complaint_details = line.split(':', 1)[1].strip()
+            payload = self._parse_complaint_input(input_str)
             
             # Validate
-            if not all([name, mobile, complaint_details]):
+            if not all(payload.values()):
                 return "Please provide all required information: name, mobile number, and complaint details."
             
-            # Make API call
-            response = requests.post(
-                f"{self.api_base_url}/api/register_complaint",
-                json={
-                    "name": name,
-                    "mobile": mobile,
-                    "complaint_details": complaint_details
-                }
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return f" {data['message']}"
-            else:
-                return f" Failed to register complaint: {response.text}"
-                
+            return self._format_registration(self.backend.register_complaint(payload))
+        except BackendError as e:
+            return f" Failed to register complaint: {e}"
         except Exception as e:
             return f" Error: {str(e)}"
 
+    @traced("tool.check_complaint_status")
     def check_complaint_status(self, complaint_id: str) -> str:
         """Check the status of a complaint"""
         try:
             complaint_id = complaint_id.strip()
-            response = requests.get(
-                f"{self.api_base_url}/api/complaint_status/{complaint_id}"
-            )
-            if response.status_code == 200:
-                data = response.json()
-                return f""" Complaint Status:
-- ID: {data['complaint_id']}
-- Status: {data['status']}
-- Created: {data['created_at']}
-- Updated: {data['updated_at']}"""
-            else:
-                return f" No complaint found with ID: {complaint_id}"
+            return self._format_status(complaint_id, self.backend.get_complaint_status(complaint_id))
+        except BackendError as e:
+            return f" Could not check the status: {e}"
         except Exception as e:
             return f" Error: {str(e)}"
     
+    @traced("tool.get_complaints_by_mobile")
     def get_complaints_by_mobile(self, mobile: str) -> str:
-        """Get all complaints for a mobile number"""
+        """Get the most recent complaints for a mobile number"""
         try:
             mobile = mobile.strip()
-            response = requests.get(
-                f"{self.api_base_url}/api/complaints_by_mobile/{mobile}"
-            )
-            if response.status_code == 200:
-                complaints = response.json()
-                if complaints:
-                    result = f"📱 Complaints for mobile {mobile}:\n\n"
-                    for complaint in complaints:
-                        result += f"• ID: {complaint['complaint_id']}\n"
-                        result += f"  Status: {complaint['status']}\n"
-                        result += f"  Details: {complaint['details']}\n"
-                        result += f"  Created: {complaint['created_at']}\n\n"
-                    return result
-                else:
-                    return f"No complaints found for mobile number: {mobile}"
-            else:
-                return f" Error fetching complaints"
+            # Only the first page; bulk filers can have thousands of complaints
+            data = self.backend.get_complaints_by_mobile(mobile, self.page_size)
+            return self._format_complaints(mobile, data)
+        except BackendError as e:
+            return f" Error fetching complaints: {e}"
+        except Exception as e:
+            return f" Error: {str(e)}"
+    
+    @traced("tool.register_complaint")
+    async def aregister_complaint(self, input_str: str) -> str:
+        """Async variant of register_complaint for AgentExecutor.ainvoke"""
+        try:
+            payload = self._parse_complaint_input(input_str)
+            if not all(payload.values()):
+                return "Please provide all required information: name, mobile number, and complaint details."
+            return self._format_registration(await self.backend.aregister_complaint(payload))
+        except BackendError as e:
+            return f" Failed to register complaint: {e}"
+        except Exception as e:
+            return f" Error: {str(e)}"
+    
+    @traced("tool.check_complaint_status")
+    async def acheck_complaint_status(self, complaint_id: str) -> str:
+        """Async variant of check_complaint_status"""
+        try:
+            complaint_id = complaint_id.strip()
+            return self._format_status(complaint_id, await self.backend.aget_complaint_status(complaint_id))
+        except BackendError as e:
+            return f" Could not check the status: {e}"
+        except Exception as e:
+            return f" Error: {str(e)}"
+    
+    @traced("tool.get_complaints_by_mobile")
+    async def aget_complaints_by_mobile(self, mobile: str) -> str:
+        """Async variant of get_complaints_by_mobile"""
+        try:
+            mobile = mobile.strip()
+            data = await self.backend.aget_complaints_by_mobile(mobile, self.page_size)
+            return self._format_complaints(mobile, data)
+        except BackendError as e:
+            return f" Error fetching complaints: {e}"
         except Exception as e:
             return f" Error: {str(e)}"
 
-def create_agent():
-    # Initialize LLM
-    llm = ChatOpenAI(
-        model="gpt-3.5-turbo",
-        temperature=0.6,
-        openai_api_key=os.getenv("OPENAI_API_KEY")
-    )
+def create_agent(fast_path=True, llm=None, complaint_tools=None):
+    # Initialize LLM (tests and benchmarks pass a FakeStreamingChatModel instead)
+    if llm is None:
+        llm = CachedChatOpenAI(
+            model="gpt-3.5-turbo",
+            temperature=0.6,
+            openai_api_key=os.getenv("OPENAI_API_KEY"),
+            # Tokens reach callbacks as they are generated so the UI can render them live
+            streaming=True,
+            # Repeated openers are answered from cache; tool-calling turns never are
+            response_cache=get_shared_response_cache()
+        )
     
-    # Initialize tools
-    complaint_tools = ComplaintTools()
+    # Initialize tools (benchmarks pass ComplaintTools pointed at their own API server)
+    complaint_tools = complaint_tools or ComplaintTools()
     
     tools = [
         Tool(
             name="register_complaint",
             func=complaint_tools.register_complaint,
+            coroutine=complaint_tools.aregister_complaint,
             description="Register a new complaint. Input format: 'name, mobile, complaint details' or JSON"
         ),
         Tool(
             name="check_complaint_status",
             func=complaint_tools.check_complaint_status,
+            coroutine=complaint_tools.acheck_complaint_status,
             description="Check complaint status. Input: complaint ID only"
         ),
         Tool(
             name="get_complaints_by_mobile",
             func=complaint_tools.get_complaints_by_mobile,
-            description="Get all complaints for a mobile number. Input: mobile number only"
+            coroutine=complaint_tools.aget_complaints_by_mobile,
+            description="Get the most recent complaints for a mobile number. Input: mobile number only"
         )
     ]
     
@@ -177,4 +236,21 @@ Be polite and helpful."""
         max_iterations=3
     )
     
-    return agent_executor
\ No newline at end of file
+    if not fast_path:
+        return agent_executor
+    # Lookups with an obvious complaint ID or mobile number skip the LLM entirely
+    return FastPathAgent(agent_executor, IntentRouter(complaint_tools))
+
+def get_shared_agent():
+    """The process-wide agent, built on first use.
+
+    The agent holds no conversation state (history is passed into every
+    invoke), so one instance, with its OpenAI client and pooled API session,
+    is shared by every chat session in the process.
+    """
+    global _shared_agent
+    if _shared_agent is None:
+        with _shared_agent_lock:
+            if _shared_agent is None:
+                _shared_agent = create_agent()
+    return _shared_agent
@@ -0,0 +1,137 @@
+from typing import Dict, Any, Optional
+from datetime import datetime
+import os
+from backend.agents.http_client import create_session, default_timeout, AsyncHttpClient
+from backend.api.ratelimit import INTERNAL_API_TOKEN, INTERNAL_TOKEN_HEADER
+from backend.observability.tracing import inject_headers
+
+DEFAULT_API_BASE_URL = "http://localhost:8001"
+
+class BackendError(Exception):
+    """The backend rejected a request; the message is safe to show the user"""
+
+def to_json(value: Any) -> Any:
+    """Match what the HTTP API would have returned after JSON encoding"""
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_json(item) for item in value]
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+# 429 and 503 mean rate limited or shedding load, not that the complaint is missing
+BUSY_STATUSES = (429, 503)
+BUSY_MESSAGE = "The complaint service is busy right now, please try again in a moment"
+
+def _error_detail(response) -> str:
+    try:
+        return response.json().get("detail", response.text)
+    except Exception:
+        return response.text
+
+def _check_response(response):
+    """Raise BackendError for anything but a 200"""
+    if response.status_code in BUSY_STATUSES:
+        raise BackendError(BUSY_MESSAGE)
+    if response.status_code != 200:
+        raise BackendError(_error_detail(response))
+
+def _status_response(response) -> Optional[Dict[str, Any]]:
+    # Only a 404 means the complaint does not exist
+    if response.status_code == 404:
+        return None
+    _check_response(response)
+    return response.json()
+
+def _headers() -> Dict[str, str]:
+    headers = inject_headers()
+    if INTERNAL_API_TOKEN:
+        # Lets the API tell the agent's calls apart from public traffic for rate limiting
+        headers[INTERNAL_TOKEN_HEADER] = INTERNAL_API_TOKEN
+    return headers
+
+class HttpComplaintBackend:
+    """Calls the FastAPI complaint API over HTTP"""
+
+    def __init__(self, api_base_url: str = DEFAULT_API_BASE_URL, session=None, timeout=None):
+        self.api_base_url = api_base_url
+        self.session = session or create_session()
+        self.timeout = timeout or default_timeout()
+        self._async_client = None
+
+    @property
+    def async_client(self) -> AsyncHttpClient:
+        if self._async_client is None:
+            self._async_client = AsyncHttpClient(timeout=self.timeout)
+        return self._async_client
+
+    def register_complaint(self, payload: Dict[str, str]) -> Dict[str, Any]:
+        response = self.session.post(
+            f"{self.api_base_url}/api/register_complaint",
+            json=payload,
+            headers=_headers(),
+            timeout=self.timeout
+        )
+        _check_response(response)
+        return response.json()
+
+    def get_complaint_status(self, complaint_id: str) -> Optional[Dict[str, Any]]:
+        response = self.session.get(
+            f"{self.api_base_url}/api/complaint_status/{complaint_id}",
+            headers=_headers(),
+            timeout=self.timeout
+        )
+        return _status_response(response)
+
+    def get_complaints_by_mobile(self, mobile: str, limit: int) -> Dict[str, Any]:
+        response = self.session.get(
+            f"{self.api_base_url}/api/complaints_by_mobile/{mobile}",
+            params={"limit": limit},
+            headers=_headers(),
+            timeout=self.timeout
+        )
+        _check_response(response)
+        return response.json()
+
+    async def aregister_complaint(self, payload: Dict[str, str]) -> Dict[str, Any]:
+        response = await self.async_client.post(
+            f"{self.api_base_url}/api/register_complaint",
+            json=payload,
+            headers=_headers()
+        )
+        _check_response(response)
+        return response.json()
+
+    async def aget_complaint_status(self, complaint_id: str) -> Optional[Dict[str, Any]]:
+        response = await self.async_client.get(
+            f"{self.api_base_url}/api/complaint_status/{complaint_id}",
+            headers=_headers()
+        )
+        return _status_response(response)
+
+    async def aget_complaints_by_mobile(self, mobile: str, limit: int) -> Dict[str, Any]:
+        response = await self.async_client.get(
+            f"{self.api_base_url}/api/complaints_by_mobile/{mobile}",
+            params={"limit": limit},
+            headers=_headers()
+        )
+        _check_response(response)
+        return response.json()
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+def create_backend(kind: Optional[str] = None, api_base_url: str = DEFAULT_API_BASE_URL,
+                   session=None, timeout=None):
+    """Build the backend selected by COMPLAINT_TOOLS_BACKEND (http or direct)"""
+    kind = (kind or os.getenv("COMPLAINT_TOOLS_BACKEND", "http")).lower()
+    if kind == "http":
+        return HttpComplaintBackend(api_base_url=api_base_url, session=session, timeout=timeout)
+    if kind == "direct":
+        # Pulls in Database, the job queue and the duplicate detector, which the HTTP backend never needs
+        from backend.agents.direct_backend import DirectComplaintBackend
+        return DirectComplaintBackend()
+    raise ValueError(f"Unknown COMPLAINT_TOOLS_BACKEND: {kind}")
@@ -0,0 +1,78 @@
+from typing import Dict, Any, Optional
+import asyncio
+import contextvars
+import functools
+from backend.agents.backends import BackendError, to_json
+from backend.api.payloads import new_complaint_document, complaints_page_payload
+from backend.api.registration import register_new_complaint
+from backend.database.database import AsyncDatabase, Database
+from backend.dedup.detector import create_duplicate_detector
+from backend.jobs.handlers import register_complaint_handlers
+from backend.jobs.queue import JobQueue, JobQueueThread, create_job_store_from_env
+
+class DirectComplaintBackend:
+    """Calls Database in process, skipping the HTTP hop when everything runs on one box.
+
+    Registrations go through register_new_complaint like the API's, including
+    the follow-up jobs, which run on a JobQueueThread (JOB_QUEUE_BACKEND
+    selects its store, as for the API).
+    """
+
+    def __init__(self, database: Optional[Database] = None, jobs: Optional[JobQueueThread] = None):
+        # Only a Database or job queue made here is closed by aclose
+        self._owns_database = database is None
+        self.database = database or Database()
+        self.duplicate_detector = create_duplicate_detector(self.database)
+        self._async_database = AsyncDatabase(self.database)
+        self._owns_jobs = jobs is None
+        if jobs is None:
+            queue = JobQueue(create_job_store_from_env(self.database.db))
+            register_complaint_handlers(queue, self._async_database)
+            jobs = JobQueueThread(queue)
+        self.jobs = jobs
+
+    def _submit_registration(self, payload: Dict[str, str]):
+        document = new_complaint_document(payload["name"], payload["mobile"], payload["complaint_details"])
+        # On the job queue's loop, where enqueueing the follow-ups is safe
+        return self.jobs.submit(register_new_complaint(
+            document, self._async_database, self.duplicate_detector, self.jobs.queue
+        ))
+
+    def register_complaint(self, payload: Dict[str, str]) -> Dict[str, Any]:
+        try:
+            return to_json(self._submit_registration(payload).result())
+        except Exception as e:
+            raise BackendError(str(e))
+
+    def get_complaint_status(self, complaint_id: str) -> Optional[Dict[str, Any]]:
+        fields = self.database.get_status_fields(complaint_id)
+        return to_json(fields) if fields else None
+
+    def get_complaints_by_mobile(self, mobile: str, limit: int) -> Dict[str, Any]:
+        documents, next_cursor = self.database.get_summary_documents_by_mobile(mobile, limit=limit)
+        return to_json(complaints_page_payload(documents, next_cursor))
+
+    async def _run(self, func, *args):
+        # pymongo is blocking, keep it off the agent's event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(contextvars.copy_context().run, func, *args))
+
+    async def aregister_complaint(self, payload: Dict[str, str]) -> Dict[str, Any]:
+        try:
+            return to_json(await asyncio.wrap_future(self._submit_registration(payload)))
+        except Exception as e:
+            raise BackendError(str(e))
+
+    async def aget_complaint_status(self, complaint_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run(self.get_complaint_status, complaint_id)
+
+    async def aget_complaints_by_mobile(self, mobile: str, limit: int) -> Dict[str, Any]:
+        return await self._run(self.get_complaints_by_mobile, mobile, limit)
+
+    async def aclose(self):
+        if self._owns_jobs:
+            # Queued acknowledgements and audit entries run before the workers stop
+            await asyncio.get_running_loop().run_in_executor(None, self.jobs.stop)
+        self._async_database.close()
+        if self._owns_database:
+            self.database.close()
@@ -0,0 +1,69 @@
+from typing import Any, Iterator, List, Optional, Union
+import re
+import time
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+class FakeStreamingChatModel(BaseChatModel):
+    """Offline stand-in for ChatOpenAI that streams canned replies.
+
+    Each call returns the next entry of ``responses`` (cycling), emitting its
+    content word by word through ``on_llm_new_token`` just like a streaming
+    ChatOpenAI would. Entries may be AIMessages carrying a ``function_call``
+    in ``additional_kwargs`` to drive the functions agent through a tool call.
+    """
+
+    responses: List[Union[str, AIMessage]]
+    # Delay before each token, to make time-to-first-token measurable
+    token_delay: float = 0.0
+    # Delay before the first token, standing in for model latency
+    first_token_delay: float = 0.0
+    index: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-streaming-chat"
+
+    def _next_message(self) -> AIMessage:
+        response = self.responses[self.index % len(self.responses)]
+        self.index += 1
+        return response if isinstance(response, AIMessage) else AIMessage(content=response)
+
+    def get_num_tokens(self, text: str) -> int:
+        # Rough GPT-style estimate; the base class would need transformers installed
+        return max(1, len(text) // 4)
+
+    @staticmethod
+    def _tokens(content: str) -> List[str]:
+        return re.findall(r"\S+\s*|\s+", content)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        message = self._next_message()
+        if self.first_token_delay:
+            time.sleep(self.first_token_delay)
+        for token in self._tokens(message.content):
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        if message.additional_kwargs:
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(content="", additional_kwargs=message.additional_kwargs)
+            )
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None,
+                  **kwargs: Any) -> ChatResult:
+        content = ""
+        additional_kwargs = {}
+        for chunk in self._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            content += chunk.message.content
+            additional_kwargs.update(chunk.message.additional_kwargs)
+        message = AIMessage(content=content, additional_kwargs=additional_kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
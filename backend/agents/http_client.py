@@ -0,0 +1,84 @@
+from typing import Optional, Tuple
+import asyncio
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3"))
+READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "15"))
+MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = float(os.getenv("API_BACKOFF_FACTOR", "0.3"))
+POOL_SIZE = int(os.getenv("API_POOL_SIZE", "20"))
+
+# Transient gateway errors worth retrying on idempotent requests
+RETRY_STATUSES = (502, 503, 504)
+
+def default_timeout() -> Tuple[float, float]:
+    return (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+def create_session(max_retries: int = MAX_RETRIES, backoff_factor: float = BACKOFF_FACTOR,
+                   pool_size: int = POOL_SIZE) -> requests.Session:
+    """Keep-alive session with bounded retries.
+
+    Reads and 5xx responses are only retried for GET. POST is retried only
+    when the connection could not be established, so a complaint is never
+    registered twice.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class AsyncHttpClient:
+    """httpx.AsyncClient with the same timeout and retry policy as create_session"""
+
+    def __init__(self, max_retries: int = MAX_RETRIES, backoff_factor: float = BACKOFF_FACTOR,
+                 pool_size: int = POOL_SIZE, timeout: Optional[Tuple[float, float]] = None):
+        import httpx
+        self._httpx = httpx
+        connect, read = timeout or default_timeout()
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    async def request(self, method: str, url: str, **kwargs):
+        idempotent = method.upper() == "GET"
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except (self._httpx.ConnectError, self._httpx.ConnectTimeout):
+                # Nothing reached the server, so even a POST is safe to resend
+                if last_attempt:
+                    raise
+            except self._httpx.TransportError:
+                if last_attempt or not idempotent:
+                    raise
+            else:
+                if last_attempt or not idempotent or response.status_code not in RETRY_STATUSES:
+                    return response
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def get(self, url: str, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
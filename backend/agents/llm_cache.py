@@ -0,0 +1,260 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import math
+import os
+import re
+import threading
+import time
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_openai import ChatOpenAI
+from backend.database.cache import TTLCache
+from backend.observability.tracing import span
+
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1000"))
+# Cosine similarity needed for a semantic hit
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", "0.92"))
+
+_shared_cache = None
+_shared_cache_built = False
+_shared_cache_lock = threading.Lock()
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text.strip().lower()).strip(" .!?")
+
+def _identifiers(text: str) -> frozenset:
+    """Tokens containing digits (complaint IDs, mobile numbers) must match exactly"""
+    return frozenset(token for token in re.findall(r"[\w-]+", text.lower()) if any(c.isdigit() for c in token))
+
+class CacheCounters:
+    def __init__(self):
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        hits = self.exact_hits + self.semantic_hits
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "uncacheable": self.uncacheable,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+class HashingEmbedder:
+    """Dependency-free embedding stub: hashed word and character-trigram counts.
+
+    Good enough to match rephrasings like "hi there" / "hi there!" or
+    reordered words; plug in a real model via SentenceTransformerEmbedder.
+    """
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+
+    def __call__(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        words = re.findall(r"\w+", text.lower())
+        features = words + [f"#{w[i:i + 3]}" for w in words for i in range(max(1, len(w) - 2))]
+        for feature in features:
+            digest = int(hashlib.md5(feature.encode()).hexdigest()[:8], 16)
+            vector[digest % self.dimensions] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model (pip install sentence-transformers)"""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def __call__(self, text: str) -> List[float]:
+        return self.model.encode(text, normalize_embeddings=True).tolist()
+
+class ResponseCache:
+    """Two-tier cache of LLM replies for repeated prompts.
+
+    The exact tier is keyed on the model settings, a hash of the history
+    and the normalized latest user message. The optional semantic tier
+    compares embeddings of the latest user message among entries with the
+    same settings and history. Only plain text replies to prompts without
+    tool results are cached: a reply that calls a function (registering a
+    complaint, say) or that was written from live tool output is always
+    regenerated.
+    """
+
+    def __init__(self, max_size: int = LLM_CACHE_SIZE, ttl_seconds: float = LLM_CACHE_TTL,
+                 embedder: Optional[Callable[[str], List[float]]] = None,
+                 similarity: float = LLM_CACHE_SIMILARITY, clock: Callable[[], float] = time.monotonic):
+        self.exact = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds, clock=clock)
+        self.embedder = embedder
+        self.similarity = similarity
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.counters = CacheCounters()
+        # (context hash, identifiers) -> [(expires_at, vector, message)], oldest first
+        self._semantic: "OrderedDict[Tuple[str, frozenset], List[tuple]]" = OrderedDict()
+        self._semantic_size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_cacheable_prompt(messages: List[BaseMessage]) -> bool:
+        if not messages or not isinstance(messages[-1], HumanMessage):
+            return False
+        return not any(message.type in ("function", "tool") for message in messages)
+
+    @staticmethod
+    def is_cacheable_reply(message: BaseMessage) -> bool:
+        return (isinstance(message, AIMessage) and bool(message.content)
+                and "function_call" not in message.additional_kwargs
+                and "tool_calls" not in message.additional_kwargs)
+
+    @staticmethod
+    def _keys(messages: List[BaseMessage], llm_string: str) -> Tuple[str, str, str]:
+        context = hashlib.sha256(llm_string.encode())
+        for message in messages[:-1]:
+            context.update(f"\x00{message.type}\x01{normalize_text(str(message.content))}".encode())
+        context_hash = context.hexdigest()
+        query = normalize_text(str(messages[-1].content))
+        exact_key = hashlib.sha256(f"{context_hash}\x00{query}".encode()).hexdigest()
+        return context_hash, query, exact_key
+
+    def lookup(self, messages: List[BaseMessage], llm_string: str) -> Optional[AIMessage]:
+        if not self.is_cacheable_prompt(messages):
+            self.counters.uncacheable += 1
+            return None
+        context_hash, query, exact_key = self._keys(messages, llm_string)
+        cached = self.exact.get(exact_key)
+        if cached is not None:
+            self.counters.exact_hits += 1
+            return cached
+        if self.embedder is not None:
+            match = self._semantic_lookup(context_hash, query)
+            if match is not None:
+                self.counters.semantic_hits += 1
+                return match
+        self.counters.misses += 1
+        return None
+
+    def _semantic_lookup(self, context_hash: str, query: str) -> Optional[AIMessage]:
+        bucket_key = (context_hash, _identifiers(query))
+        vector = self.embedder(query)
+        now = self.clock()
+        with self._lock:
+            entries = self._semantic.get(bucket_key)
+            if not entries:
+                return None
+            live = [entry for entry in entries if entry[0] > now]
+            self._semantic_size -= len(entries) - len(live)
+            if not live:
+                del self._semantic[bucket_key]
+                return None
+            self._semantic[bucket_key] = live
+            self._semantic.move_to_end(bucket_key)
+            best, best_score = None, self.similarity
+            for _, candidate, message in live:
+                score = sum(a * b for a, b in zip(vector, candidate))
+                if score >= best_score:
+                    best, best_score = message, score
+            return best
+
+    def store(self, messages: List[BaseMessage], llm_string: str, reply: BaseMessage):
+        if not self.is_cacheable_prompt(messages) or not self.is_cacheable_reply(reply):
+            return
+        context_hash, query, exact_key = self._keys(messages, llm_string)
+        self.exact.set(exact_key, reply)
+        if self.embedder is None:
+            return
+        bucket_key = (context_hash, _identifiers(query))
+        entry = (self.clock() + self.ttl_seconds, self.embedder(query), reply)
+        with self._lock:
+            self._semantic.setdefault(bucket_key, []).append(entry)
+            self._semantic.move_to_end(bucket_key)
+            self._semantic_size += 1
+            while self._semantic_size > self.max_size:
+                oldest_key, oldest = next(iter(self._semantic.items()))
+                oldest.pop(0)
+                self._semantic_size -= 1
+                if not oldest:
+                    del self._semantic[oldest_key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters.as_dict(), "exact_evictions": self.exact.stats.evictions,
+                "semantic_tier": self.embedder is not None}
+
+class CachedChatOpenAI(ChatOpenAI):
+    """ChatOpenAI that answers repeated prompts from a ResponseCache.
+
+    Cache hits are still emitted through ``on_llm_new_token`` so streaming
+    UIs render them the same way as live replies.
+    """
+
+    response_cache: Any = None
+
+    def _cached_result(self, message: AIMessage, run_manager) -> ChatResult:
+        if run_manager:
+            for token in re.findall(r"\S+\s*|\s+", str(message.content)):
+                run_manager.on_llm_new_token(token)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        with span("llm.chat", model=self.model_name) as current:
+            if self.response_cache is None:
+                return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            llm_string = self._get_llm_string(stop=stop, **kwargs)
+            cached = self.response_cache.lookup(messages, llm_string)
+            current.set("cache_hit", cached is not None)
+            if cached is not None:
+                return self._cached_result(cached, run_manager)
+            result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            self.response_cache.store(messages, llm_string, result.generations[0].message)
+            return result
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        with span("llm.chat", model=self.model_name) as current:
+            if self.response_cache is None:
+                return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            llm_string = self._get_llm_string(stop=stop, **kwargs)
+            cached = self.response_cache.lookup(messages, llm_string)
+            current.set("cache_hit", cached is not None)
+            if cached is not None:
+                if run_manager:
+                    for token in re.findall(r"\S+\s*|\s+", str(cached.content)):
+                        await run_manager.on_llm_new_token(token)
+                return ChatResult(generations=[ChatGeneration(message=cached)])
+            result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            self.response_cache.store(messages, llm_string, result.generations[0].message)
+            return result
+
+def create_response_cache_from_env() -> Optional[ResponseCache]:
+    """LLM_CACHE=exact, semantic or none; LLM_CACHE_EMBEDDER=hashing or sentence-transformers"""
+    mode = os.getenv("LLM_CACHE", "exact").lower()
+    if mode == "none":
+        return None
+    if mode not in ("exact", "semantic"):
+        raise ValueError(f"Unknown LLM_CACHE: {mode}")
+    embedder = None
+    if mode == "semantic":
+        if os.getenv("LLM_CACHE_EMBEDDER", "hashing").lower() == "sentence-transformers":
+            embedder = SentenceTransformerEmbedder(os.getenv("LLM_CACHE_EMBEDDING_MODEL", "all-MiniLM-L6-v2"))
+        else:
+            embedder = HashingEmbedder()
+    return ResponseCache(embedder=embedder)
+
+def get_shared_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache used by the shared agent's LLM"""
+    global _shared_cache, _shared_cache_built
+    if not _shared_cache_built:
+        with _shared_cache_lock:
+            if not _shared_cache_built:
+                _shared_cache = create_response_cache_from_env()
+                _shared_cache_built = True
+    return _shared_cache
@@ -0,0 +1,112 @@
+from typing import Any, Dict, List, Optional
+import os
+from langchain.memory import ConversationSummaryBufferMemory
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from backend.agents.router import COMPLAINT_ID_PATTERN, MOBILE_PATTERN
+import re
+import threading
+
+# Token budget for the verbatim window; older turns are folded into the summary
+MEMORY_MAX_TOKENS = int(os.getenv("MEMORY_MAX_TOKENS", "1200"))
+# Complaint IDs kept pinned per conversation
+MAX_PINNED_IDS = 10
+
+NAME_PATTERN = re.compile(
+    r"\b(?:my name is|i am|i'm|this is|name\s*:)\s+([a-z][a-z.'-]*(?:\s+[a-z][a-z.'-]*){0,2})",
+    re.IGNORECASE
+)
+# Words that follow "I am" without being a name ("I am not happy", "I'm waiting")
+NOT_NAMES = {
+    "not", "very", "so", "still", "waiting", "facing", "having", "unable", "here", "a", "an",
+    "the", "from", "in", "at", "calling", "writing", "looking", "trying", "getting", "also",
+}
+
+_summary_llm = None
+_summary_llm_lock = threading.Lock()
+
+class GrievanceMemory(ConversationSummaryBufferMemory):
+    """Token-bounded chat memory with a rolling summary and pinned facts.
+
+    Recent turns are kept verbatim up to ``max_token_limit`` tokens; older
+    ones are summarised by the LLM (as in ConversationSummaryBufferMemory).
+    The caller's name, mobile number and complaint IDs are extracted with
+    regexes as they appear and always sent as a system message, so they
+    survive summarisation word for word.
+    """
+
+    memory_key: str = "chat_history"
+    return_messages: bool = True
+    pinned_facts: Dict[str, Any] = {}
+
+    def _extract_facts(self, user_input: str, output: str):
+        facts = dict(self.pinned_facts)
+
+        parts = [part.strip() for part in user_input.split(",")]
+        name_match = NAME_PATTERN.search(user_input)
+        if len(parts) >= 3 and MOBILE_PATTERN.fullmatch(parts[1]) and parts[0]:
+            # "Name, Mobile, Complaint Details", the registration format the agent asks for
+            facts["name"] = parts[0]
+        elif name_match and name_match.group(1).split()[0].lower() not in NOT_NAMES:
+            facts["name"] = name_match.group(1).title()
+
+        mobiles = MOBILE_PATTERN.findall(user_input)
+        if mobiles:
+            facts["mobile"] = mobiles[-1]
+
+        complaint_ids = facts.get("complaint_ids", [])
+        for complaint_id in COMPLAINT_ID_PATTERN.findall(f"{user_input}\n{output}"):
+            complaint_id = complaint_id.upper()
+            if complaint_id in complaint_ids:
+                complaint_ids.remove(complaint_id)
+            complaint_ids.append(complaint_id)
+        if complaint_ids:
+            facts["complaint_ids"] = complaint_ids[-MAX_PINNED_IDS:]
+
+        self.pinned_facts = facts
+
+    def pinned_message(self) -> Optional[SystemMessage]:
+        if not self.pinned_facts:
+            return None
+        lines = []
+        if "name" in self.pinned_facts:
+            lines.append(f"Name: {self.pinned_facts['name']}")
+        if "mobile" in self.pinned_facts:
+            lines.append(f"Mobile: {self.pinned_facts['mobile']}")
+        if self.pinned_facts.get("complaint_ids"):
+            lines.append(f"Complaint IDs: {', '.join(self.pinned_facts['complaint_ids'])}")
+        return SystemMessage(content="Details the user has already shared:\n" + "\n".join(lines))
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        messages = super().load_memory_variables(inputs)[self.memory_key]
+        pinned = self.pinned_message()
+        return {self.memory_key: ([pinned] if pinned else []) + messages}
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        self._extract_facts(str(inputs.get("input", "")), str(outputs.get("output", "")))
+        super().save_context(inputs, outputs)
+
+    def count_prompt_tokens(self, chat_history: List[BaseMessage], user_input: str) -> int:
+        """Tokens of history plus the new message, the part of the prompt that can grow"""
+        return self.llm.get_num_tokens_from_messages(chat_history + [HumanMessage(content=user_input)])
+
+    def clear(self) -> None:
+        super().clear()
+        self.pinned_facts = {}
+
+def get_summary_llm():
+    """Process-wide deterministic gpt-3.5-turbo client used to write summaries"""
+    global _summary_llm
+    if _summary_llm is None:
+        with _summary_llm_lock:
+            if _summary_llm is None:
+                from langchain_openai import ChatOpenAI
+                _summary_llm = ChatOpenAI(
+                    model="gpt-3.5-turbo",
+                    temperature=0,
+                    openai_api_key=os.getenv("OPENAI_API_KEY")
+                )
+    return _summary_llm
+
+def create_memory(llm=None, max_token_limit: int = MEMORY_MAX_TOKENS) -> GrievanceMemory:
+    """Per-session memory; all sessions share one summariser client unless ``llm`` is given"""
+    return GrievanceMemory(llm=llm or get_summary_llm(), max_token_limit=max_token_limit)
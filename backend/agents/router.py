@@ -0,0 +1,160 @@
+from typing import Dict, Any, List, Optional, NamedTuple
+import re
+import threading
+
+# Legacy random/sequence IDs have 8 characters after the prefix, time-ordered ones 16
+COMPLAINT_ID_PATTERN = re.compile(r"\bCMP-[0-9A-Z]{8,16}\b", re.IGNORECASE)
+# 10-digit mobile numbers, optionally with a +91 / 91 country code
+MOBILE_PATTERN = re.compile(r"(?<!\d)(?:\+?91[\s-]?)?(\d{10})(?!\d)")
+
+REGISTER_PROMPT = (
+    "I'd be happy to help you register a complaint. "
+    "Please share your name, mobile number, and complaint details."
+)
+STATUS_PROMPT = "Sure! Please share your complaint ID (it looks like CMP-01M56CBCZT9WSFF9)."
+LIST_PROMPT = "Sure! Please share the mobile number you used when registering your complaints."
+
+# The quick-action buttons in app.py send these exact phrases
+QUICK_ACTIONS = {
+    "i want to register a new complaint": ("register_prompt", REGISTER_PROMPT),
+    "i want to check my complaint status": ("status_prompt", STATUS_PROMPT),
+    "show all my complaints": ("list_prompt", LIST_PROMPT),
+}
+
+STATUS_WORDS = re.compile(r"\b(status|check|track|update|progress|where)\b")
+LIST_WORDS = re.compile(r"\b(complaints|show|list|history|view|all)\b")
+REGISTER_WORDS = re.compile(r"\b(register|file|lodge|new complaint|complaint about|my name|name is)\b")
+
+# Messages made of nothing but these words plus an ID/number are treated as bare lookups
+FILLER_WORDS = {
+    "my", "the", "of", "for", "is", "it", "its", "id", "complaint", "number", "mobile",
+    "phone", "please", "pls", "here", "this", "and", "me", "to", "no", "with", "registered",
+}
+
+# Tool calls made per routed status lookup, however many IDs were pasted
+MAX_IDS_PER_TURN = 3
+
+class Route(NamedTuple):
+    intent: str
+    arguments: List[str]
+    # Canned replies need no tool call
+    reply: Optional[str] = None
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text.strip().lower()).rstrip(".!?")
+
+def _is_bare(text: str) -> bool:
+    """True when nothing but filler words remain around the matched identifiers"""
+    words = re.findall(r"[a-z]+", text)
+    return all(word in FILLER_WORDS for word in words)
+
+def _registration_in_progress(chat_history: Optional[List[Any]]) -> bool:
+    """Whether the last bot turn asked for registration details"""
+    for message in reversed(chat_history or []):
+        if getattr(message, "type", None) == "ai":
+            content = str(message.content).lower()
+            return "name" in content and ("complaint details" in content or "register" in content)
+    return False
+
+class IntentRouter:
+    """Regex rules that answer lookup turns without calling the LLM.
+
+    Only unambiguous turns are routed: quick-action phrases, messages that
+    are essentially a complaint ID or a mobile number, and explicit
+    "status of <ID>" / "complaints for <mobile>" requests. Anything that
+    looks like part of a registration goes to the agent.
+    """
+
+    def __init__(self, tools):
+        self.tools = tools
+
+    def match(self, text: str, chat_history: Optional[List[Any]] = None) -> Optional[Route]:
+        normalized = _normalize(text)
+        if normalized in QUICK_ACTIONS:
+            intent, reply = QUICK_ACTIONS[normalized]
+            return Route(intent, [], reply)
+
+        if REGISTER_WORDS.search(normalized) or _registration_in_progress(chat_history):
+            return None
+
+        complaint_ids = COMPLAINT_ID_PATTERN.findall(text)
+        if complaint_ids:
+            remainder = COMPLAINT_ID_PATTERN.sub(" ", normalized)
+            if _is_bare(remainder) or STATUS_WORDS.search(remainder):
+                unique_ids = list(dict.fromkeys(cid.upper() for cid in complaint_ids))
+                return Route("check_complaint_status", unique_ids[:MAX_IDS_PER_TURN])
+            return None
+
+        mobiles = MOBILE_PATTERN.findall(text)
+        if len(mobiles) == 1:
+            remainder = MOBILE_PATTERN.sub(" ", normalized)
+            if _is_bare(remainder) or LIST_WORDS.search(remainder):
+                return Route("get_complaints_by_mobile", mobiles)
+        return None
+
+    def run(self, route: Route) -> str:
+        if route.reply is not None:
+            return route.reply
+        tool = getattr(self.tools, route.intent)
+        return "\n\n".join(tool(argument) for argument in route.arguments)
+
+    async def arun(self, route: Route) -> str:
+        if route.reply is not None:
+            return route.reply
+        tool = getattr(self.tools, f"a{route.intent}")
+        return "\n\n".join([await tool(argument) for argument in route.arguments])
+
+class RouterStats:
+    """Counts how many turns were answered without an LLM call"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total_turns = 0
+        self.fast_path_turns = 0
+        self.by_intent: Dict[str, int] = {}
+
+    def record(self, intent: Optional[str]):
+        with self._lock:
+            self.total_turns += 1
+            if intent is not None:
+                self.fast_path_turns += 1
+                self.by_intent[intent] = self.by_intent.get(intent, 0) + 1
+
+    @property
+    def fast_path_ratio(self) -> float:
+        return self.fast_path_turns / self.total_turns if self.total_turns else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_turns": self.total_turns,
+            "fast_path_turns": self.fast_path_turns,
+            "fast_path_percent": round(self.fast_path_ratio * 100, 1),
+            "by_intent": dict(self.by_intent),
+        }
+
+class FastPathAgent:
+    """Runs the IntentRouter first and falls back to the LLM agent.
+
+    Exposes the same invoke/ainvoke interface as AgentExecutor, so callers
+    don't need to know which path answered; routed turns carry
+    ``fast_path: True`` in the result.
+    """
+
+    def __init__(self, agent_executor, router: IntentRouter, stats: Optional[RouterStats] = None):
+        self.agent_executor = agent_executor
+        self.router = router
+        self.stats = stats or RouterStats()
+
+    def invoke(self, inputs: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        route = self.router.match(inputs["input"], inputs.get("chat_history"))
+        self.stats.record(route.intent if route else None)
+        if route:
+            return {"input": inputs["input"], "output": self.router.run(route), "fast_path": True}
+        return self.agent_executor.invoke(inputs, config)
+
+    async def ainvoke(self, inputs: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        route = self.router.match(inputs["input"], inputs.get("chat_history"))
+        self.stats.record(route.intent if route else None)
+        if route:
+            return {"input": inputs["input"], "output": await self.router.arun(route), "fast_path": True}
+        return await self.agent_executor.ainvoke(inputs, config)
@@ -0,0 +1,112 @@
+from typing import Any, Dict, Iterator, Optional
+import contextvars
+import queue
+import threading
+import time
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Marks the end of a turn on the token queue
+_DONE = object()
+
+class TokenQueueHandler(BaseCallbackHandler):
+    """Pushes every streamed LLM token onto a queue read by the UI thread"""
+
+    def __init__(self, tokens: "queue.Queue"):
+        self.tokens = tokens
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        # Function-call chunks arrive as empty tokens; only user-visible text matters
+        if token:
+            self.tokens.put(token)
+
+class TurnMetrics:
+    """Latency of one chat turn as seen by the user"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.tokens = 0
+        self.fast_path = False
+        self.prompt_tokens: Optional[int] = None
+
+    def token(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.tokens += 1
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+        if self.first_token_at is None:
+            self.first_token_at = self.finished_at
+
+    @property
+    def ttft_ms(self) -> float:
+        return ((self.first_token_at or time.perf_counter()) - self.started_at) * 1000
+
+    @property
+    def total_ms(self) -> float:
+        return ((self.finished_at or time.perf_counter()) - self.started_at) * 1000
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ttft_ms": round(self.ttft_ms, 1),
+            "total_ms": round(self.total_ms, 1),
+            "tokens": self.tokens,
+            "fast_path": self.fast_path,
+            "prompt_tokens": self.prompt_tokens,
+        }
+
+class AgentStream:
+    """Iterate over an agent turn's output tokens as they are generated.
+
+    The agent runs on a worker thread with a TokenQueueHandler attached, so
+    the caller (Streamlit's script thread) can render tokens while the LLM
+    is still producing them. Turns that produce no LLM tokens, such as
+    fast-path lookups, yield their whole output at once. After iteration,
+    ``output`` holds the final answer (render it in place of the streamed
+    text, which can include tokens from intermediate LLM calls) and
+    ``metrics`` the turn latencies.
+    """
+
+    def __init__(self, agent, inputs: Dict[str, Any]):
+        self.agent = agent
+        self.inputs = inputs
+        self.output = ""
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+        self.metrics = TurnMetrics()
+        self._tokens: "queue.Queue" = queue.Queue()
+
+    def _run(self):
+        try:
+            self.result = self.agent.invoke(
+                self.inputs,
+                {"callbacks": [TokenQueueHandler(self._tokens)]}
+            )
+        except BaseException as e:
+            self.error = e
+        finally:
+            self._tokens.put(_DONE)
+
+    def __iter__(self) -> Iterator[str]:
+        # Run in a copy of the caller's context so tool and LLM spans nest under its span
+        threading.Thread(target=contextvars.copy_context().run, args=(self._run,), daemon=True).start()
+        streamed = ""
+        while True:
+            token = self._tokens.get()
+            if token is _DONE:
+                break
+            self.metrics.token()
+            streamed += token
+            yield token
+
+        if self.error is not None:
+            self.metrics.finish()
+            raise self.error
+        self.output = self.result["output"]
+        self.metrics.fast_path = bool(self.result.get("fast_path"))
+        if not streamed:
+            self.metrics.token()
+            yield self.output
+        self.metrics.finish()
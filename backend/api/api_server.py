@@ -1,80 +1,314 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Optional
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
 import uvicorn
-from backend.database.database import Database , Complaint
-import random
-import string
+from backend.database.database import (
+    Database, AsyncDatabase, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, StatusTransitionError, VersionConflict
+)
+from backend.database.migrate import has_indexes
+from backend.api.ingest import ingest_complaints
+from backend.api.ratelimit import RateLimitMiddleware
+from backend.api.auth import require_operator
+from backend.api.payloads import (
+    new_complaint_document, status_payload, summary_payload, complaints_page_payload, search_page_payload
+)
+from backend.api.registration import register_new_complaint
+from backend.jobs.queue import JobQueue, create_job_store_from_env
+from backend.jobs.handlers import (
+    register_complaint_handlers, register_classification_handlers, register_stats_handlers,
+    CLASSIFY_BACKFILL_BATCH_SIZE
+)
+from backend.classification.classifier import (
+    aclassify_documents, get_shared_classifier, shared_classifier_loaded,
+)
+from backend.search.engines import create_search_engine, SearchUnavailable
+from backend.dedup.detector import create_duplicate_detector
+from backend.events.broker import StatusBroker, TooManySubscribers, status_event
+from backend.events.feeds import create_status_feed
+from backend.observability.metrics import REGISTRY
+from backend.observability.middleware import TracingMiddleware
+import asyncio
+from contextlib import asynccontextmanager
+import os
 from datetime import datetime
 
-app = FastAPI()
-db = Database()
+BULK_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "1000"))
+# Largest batch accepted by PATCH /api/complaint_status
+MAX_BULK_STATUS_UPDATES = int(os.getenv("MAX_BULK_STATUS_UPDATES", "10000"))
+# Complaint IDs one status stream may follow
+MAX_STREAM_COMPLAINTS = 50
+
+# Per-process services. The lifespan creates them, so every worker process
+# opens its own connection pool instead of inheriting one made at import time.
+# pymongo calls run in a thread pool so they never block the event loop
+db: Optional[AsyncDatabase] = None
+# Side effects of a registration (audit log, acknowledgement) run after the response
+jobs: Optional[JobQueue] = None
+# SEARCH_BACKEND=none leaves /api/search disabled
+search_engine = None
+# DUPLICATE_DETECTION=off stores every registration as a new complaint
+duplicate_detector = None
+# Status changes pushed to /api/status_events subscribers, from a change stream when available
+status_broker = StatusBroker()
+status_feed = None
+
+def create_services(database: Database):
+    global db, jobs, search_engine, duplicate_detector, status_feed
+    db = AsyncDatabase(database)
+    jobs = JobQueue(create_job_store_from_env(database.db))
+    register_complaint_handlers(jobs, db)
+    register_classification_handlers(jobs, db)
+    register_stats_handlers(jobs, database)
+    search_engine = create_search_engine(database)
+    duplicate_detector = create_duplicate_detector(database)
+    status_feed = create_status_feed(database, status_broker)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    loop = asyncio.get_running_loop()
+    # Benchmarks and tests hand in a ready Database through app.state
+    database = getattr(app.state, "database", None) or await loop.run_in_executor(None, Database)
+    if not await loop.run_in_executor(None, has_indexes, database):
+        print("Warning: complaint indexes are missing; run python -m backend.database.migrate")
+    create_services(database)
+    # Load or train the classifier in the background: training takes seconds, so the API
+    # serves at once and only a registration arriving before it is done waits for it
+    classifier_warmup = loop.run_in_executor(None, get_shared_classifier)
+    if search_engine is not None:
+        search_engine.start()
+    status_broker.bind(loop)
+    if status_feed is not None:
+        status_feed.start()
+    jobs.start()
+    yield
+    # uvicorn has already stopped accepting and drained in-flight requests
+    # A failed warm-up is retried by the next registration, so it must not stop the shutdown
+    await asyncio.wait([classifier_warmup])
+    await jobs.stop()
+    if status_feed is not None:
+        status_feed.stop()
+    status_broker.close()
+    db.close()
+    if getattr(app.state, "database", None) is None:
+        database.close()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+# Added last runs first: tracing also times the requests refused by the limiter
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(TracingMiddleware)
 
 class ComplaintRequest(BaseModel):
     name: str
     mobile: str
     complaint_details: str
+    # e.g. "sector 14"; taken from complaint_details when omitted
+    locality: Optional[str] = None
 
 class ComplaintResponse(BaseModel):
     complaint_id: str
     message: str
+    # True when the complaint repeats an open one, whose ID is returned instead
+    duplicate: bool = False
 
 class StatusResponse(BaseModel):
     complaint_id: str
     status: str
+    category: Optional[str] = None
+    priority: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    version: int = 0
 
-def generate_complaint_id():
-    return f"CMP-{''.join(random.choices(string.ascii_uppercase + string.digits, k=8))}"
+class StatusUpdateRequest(BaseModel):
+    status: str
+    # Version last read by the caller; the update is refused if it has moved on
+    expected_version: Optional[int] = None
+
+class BulkStatusUpdate(StatusUpdateRequest):
+    complaint_id: str
+
+class BulkStatusUpdateRequest(BaseModel):
+    updates: List[BulkStatusUpdate] = Field(..., min_length=1, max_length=MAX_BULK_STATUS_UPDATES)
 
 @app.post("/api/register_complaint", response_model=ComplaintResponse)
 async def register_complaint(complaint: ComplaintRequest):
     try:
-        complaint_id = generate_complaint_id()
-        
-        complaint_data = {
-            "complaint_id": complaint_id,
-            "name": complaint.name,
-            "mobile": complaint.mobile,
-            "complaint_details": complaint.complaint_details,
-            "status": "In Progress"
-        }
-        
-        db.create_complaint(complaint_data)
-        
-        return ComplaintResponse(
-            complaint_id=complaint_id,
-            message=f"Complaint registered successfully with ID: {complaint_id}"
+        complaint_data = new_complaint_document(
+            complaint.name, complaint.mobile, complaint.complaint_details, complaint.locality
         )
+        return ComplaintResponse(**await register_new_complaint(complaint_data, db, duplicate_detector, jobs))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def prepare_bulk_complaint(record: Any) -> Dict[str, Any]:
+    """Validate one bulk record; the data layer assigns its complaint_id"""
+    complaint = ComplaintRequest.model_validate(record)
+    return new_complaint_document(complaint.name, complaint.mobile, complaint.complaint_details,
+                                  complaint.locality)
+
+@app.post("/api/bulk_register_complaints")
+async def bulk_register_complaints(
+    request: Request,
+    batch_size: int = Query(BULK_BATCH_SIZE, ge=1, le=10000)
+):
+    """Register complaints from a streamed NDJSON or JSON array body"""
+    return await ingest_complaints(
+        request.stream(), db, prepare_bulk_complaint, batch_size, enrich=aclassify_documents,
+        dedupe=duplicate_detector.acheck_batch if duplicate_detector is not None else None
+    )
+
 @app.get("/api/complaint_status/{complaint_id}", response_model=StatusResponse)
 async def get_complaint_status(complaint_id: str):
-    complaint = db.get_complaint_by_id(complaint_id)
+    fields = await db.get_status_fields(complaint_id)
+    if not fields:
+        raise HTTPException(status_code=404, detail="Complaint not found")
+    
+    # Already shaped like StatusResponse; returning a Response skips FastAPI's re-validation
+    return ORJSONResponse(fields)
+
+@app.patch("/api/complaint_status/{complaint_id}", response_model=StatusResponse,
+           dependencies=[Depends(require_operator)])
+async def update_complaint_status(complaint_id: str, update: StatusUpdateRequest):
+    """Move a complaint along In Progress -> Assigned -> Resolved/Closed"""
+    try:
+        complaint = await db.update_complaint_status(complaint_id, update.status, update.expected_version)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except (StatusTransitionError, VersionConflict) as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
     
-    return StatusResponse(
-        complaint_id=complaint.complaint_id,
-        status=complaint.status,
-        created_at=complaint.created_at,
-        updated_at=complaint.updated_at
+    return StatusResponse(**status_payload(complaint))
+
+@app.patch("/api/complaint_status", dependencies=[Depends(require_operator)])
+async def bulk_update_complaint_status(request: BulkStatusUpdateRequest):
+    """Apply many status changes at once; each one succeeds or fails on its own"""
+    results = await db.bulk_update_status([update.model_dump() for update in request.updates])
+    updated = sum(result["ok"] for result in results)
+    return {"updated": updated, "failed": len(results) - updated, "results": results}
+
+@app.get("/api/status_events")
+async def status_events(
+    complaint_id: List[str] = Query([]),
+    mobile: Optional[str] = None
+):
+    """Server-Sent Events with the status of the given complaints, or of all of a mobile's
+    complaints, each time it changes. Replaces polling /api/complaint_status."""
+    if not complaint_id and not mobile:
+        raise HTTPException(status_code=422, detail="Pass complaint_id or mobile")
+    if len(complaint_id) > MAX_STREAM_COMPLAINTS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_STREAM_COMPLAINTS} complaint IDs per stream")
+    try:
+        subscription = status_broker.subscribe(complaint_id, [mobile] if mobile else [])
+    except TooManySubscribers as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    # Subscribed first, so a change landing during these reads is not missed
+    try:
+        current = await asyncio.gather(*(db.get_complaint_by_id(cid) for cid in subscription.complaint_ids))
+    except BaseException:
+        status_broker.unsubscribe(subscription)
+        raise
+    initial = [status_event(complaint.model_dump()) for complaint in current if complaint]
+    return StreamingResponse(
+        status_broker.stream(subscription, initial),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
+@app.get("/api/status_events/stats", dependencies=[Depends(require_operator)])
+async def get_status_event_stats():
+    return status_broker.stats()
+
 @app.get("/api/complaints_by_mobile/{mobile}")
-async def get_complaints_by_mobile(mobile: str):
-    complaints = db.get_complaints_by_mobile(mobile)
-    return [
-        {
-            "complaint_id": c.complaint_id,
-            "status": c.status,
-            "details": c.complaint_details,
-            "created_at": c.created_at
-        }
-        for c in complaints
-    ]
+async def get_complaints_by_mobile(
+    mobile: str,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
+):
+    """A page of complaints when limit or after is given, else every complaint as a bare list"""
+    if limit is None and after is None:
+        # Clients written before paging expect the whole list; it is read a page at a time
+        complaints, cursor = [], None
+        while True:
+            documents, cursor = await db.get_summary_documents_by_mobile(mobile, limit=MAX_PAGE_SIZE, after=cursor)
+            complaints.extend(summary_payload(document) for document in documents)
+            if cursor is None:
+                return ORJSONResponse(complaints)
+    try:
+        documents, next_cursor = await db.get_summary_documents_by_mobile(
+            mobile, limit=limit or DEFAULT_PAGE_SIZE, after=after
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return ORJSONResponse(complaints_page_payload(documents, next_cursor))
+
+@app.get("/api/search", dependencies=[Depends(require_operator)])
+async def search_complaints(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
+):
+    """Complaints whose details or name match q, best match first"""
+    if search_engine is None:
+        raise HTTPException(status_code=404, detail="Search is disabled")
+    try:
+        page = await search_engine.asearch(q, limit, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SearchUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return search_page_payload(page)
+
+@app.get("/api/stats")
+async def get_complaint_stats(days: int = Query(30, ge=1, le=366)):
+    """Counts by status, category and day plus resolution-time percentiles"""
+    stats = await db.get_stats(days)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Statistics are disabled")
+    return stats
+
+@app.get("/api/cache/stats", dependencies=[Depends(require_operator)])
+async def get_cache_stats():
+    return db.cache_stats()
+
+@app.post("/api/jobs/backfill_categories", dependencies=[Depends(require_operator)])
+async def backfill_categories(batch_size: int = Query(CLASSIFY_BACKFILL_BATCH_SIZE, ge=1, le=10000)):
+    """Classify complaints stored without a category, one batch per job"""
+    job = await jobs.enqueue("backfill_categories", {"after": None, "batch_size": batch_size})
+    return {"job_id": job.id}
+
+@app.post("/api/jobs/rebuild_stats", dependencies=[Depends(require_operator)])
+async def rebuild_stats():
+    """Recompute the statistics rollups from the complaints collection"""
+    if db.database.stats is None:
+        raise HTTPException(status_code=404, detail="Statistics are disabled")
+    running_since = await db.stats_rebuild_started()
+    if running_since is not None:
+        raise HTTPException(status_code=409, detail=f"A stats rebuild has been running since {running_since}")
+    job = await jobs.enqueue("rebuild_stats", {})
+    return {"job_id": job.id}
+
+@app.get("/api/jobs/stats", dependencies=[Depends(require_operator)])
+async def get_job_stats():
+    return await jobs.stats()
+
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Readiness probe: 200 once the lifespan has run and MongoDB answers, 503 otherwise"""
+    try:
+        await db.ping()
+    except Exception as e:
+        return ORJSONResponse({"status": "unavailable", "detail": str(e)}, status_code=503)
+    return {"status": "ok", "classifier_loaded": shared_classifier_loaded()}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus latency histograms for this worker process"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
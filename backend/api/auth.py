@@ -0,0 +1,12 @@
+from fastapi import HTTPException, Request
+import os
+from backend.api.ratelimit import INTERNAL_API_TOKEN, INTERNAL_TOKEN_HEADER, is_internal_request
+
+# Operator routes (status changes, jobs, cache stats, search) answer only internal callers: requests
+# carrying INTERNAL_API_TOKEN, and loopback connections without X-Forwarded-For unless this is off
+OPERATOR_ALLOW_LOOPBACK = os.getenv("OPERATOR_ALLOW_LOOPBACK", "on").lower() != "off"
+
+def require_operator(request: Request):
+    """FastAPI dependency refusing the public with 403"""
+    if not is_internal_request(request.scope, OPERATOR_ALLOW_LOOPBACK, INTERNAL_API_TOKEN):
+        raise HTTPException(status_code=403, detail=f"Operator access only; send {INTERNAL_TOKEN_HEADER}")
@@ -0,0 +1,195 @@
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, List, Optional, Tuple
+import asyncio
+import codecs
+import json
+
+# A single record larger than this is treated as malformed instead of buffered forever
+MAX_RECORD_CHARS = 1_000_000
+
+_decoder = json.JSONDecoder()
+# Insignificant whitespace in JSON (RFC 8259)
+WHITESPACE = " \t\r\n"
+
+async def iter_json_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[Any, Optional[str]]]:
+    """Yield (record, error) pairs from a streamed NDJSON or JSON array body.
+
+    The format is detected from the first non-whitespace character. A bad
+    NDJSON line only fails that record, and a line longer than
+    MAX_RECORD_CHARS is skipped up to its newline without being buffered. A
+    malformed JSON array (a bad element, a missing or trailing comma, or
+    anything but whitespace after the closing bracket) cannot be
+    resynchronised, so it fails the current record and ends the stream.
+    """
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    mode = None
+    done = False
+    # NDJSON: discarding the rest of an oversized line
+    skipping = False
+    # JSON array: what may come next. "first" (a value or ']') after '[', "element" after ',',
+    # "separator" (',' or ']') after a value, "done" (whitespace only) after ']'
+    expect = "first"
+
+    async def more() -> bool:
+        nonlocal buffer, position
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            buffer = buffer[position:] + text.decode(b"", final=True)
+            position = 0
+            return False
+        buffer = buffer[position:] + text.decode(chunk)
+        position = 0
+        return True
+
+    while not done:
+        if mode is None:
+            stripped = buffer.lstrip()
+            if not stripped:
+                if not await more():
+                    return
+                continue
+            mode = "array" if stripped[0] == "[" else "ndjson"
+            position = len(buffer) - len(stripped) + (1 if mode == "array" else 0)
+
+        if mode == "ndjson":
+            newline = buffer.find("\n", position)
+            if newline == -1:
+                if len(buffer) - position > MAX_RECORD_CHARS:
+                    if not skipping:
+                        skipping = True
+                        yield None, f"Record longer than {MAX_RECORD_CHARS} characters"
+                    position = len(buffer)
+                if await more():
+                    continue
+                line, done = buffer[position:], True
+            else:
+                line, position = buffer[position:newline], newline + 1
+            if skipping:
+                skipping = False
+                continue
+            line = line.strip()
+            if not line:
+                continue
+            if len(line) > MAX_RECORD_CHARS:
+                yield None, f"Record longer than {MAX_RECORD_CHARS} characters"
+                continue
+            try:
+                yield json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield None, f"Invalid JSON: {e.msg}"
+            continue
+
+        while position < len(buffer) and buffer[position] in WHITESPACE:
+            position += 1
+        if position >= len(buffer):
+            if not await more():
+                if expect != "done":
+                    yield None, "Unterminated JSON array"
+                return
+            continue
+        char = buffer[position]
+        if expect == "done":
+            yield None, "Unexpected data after the JSON array"
+            return
+        if expect != "element" and char == "]":
+            position += 1
+            expect = "done"
+            continue
+        if expect == "separator":
+            if char != ",":
+                yield None, "Invalid JSON: expected ',' or ']' between array elements"
+                return
+            position += 1
+            expect = "element"
+            continue
+        try:
+            record, end = _decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            if len(buffer) - position > MAX_RECORD_CHARS or not await more():
+                yield None, f"Invalid JSON: {e.msg}"
+                return
+            continue
+        # A bare number can be cut mid-way by a chunk boundary
+        if end == len(buffer) and not isinstance(record, (dict, list)) and await more():
+            continue
+        position = end
+        expect = "separator"
+        yield record, None
+
+async def ingest_complaints(chunks: AsyncIterator[bytes], db, prepare: Callable[[Any], Dict[str, Any]],
+                            batch_size: int = 1000,
+                            enrich: Optional[Callable[[List[Dict[str, Any]]], Awaitable[Any]]] = None,
+                            dedupe: Optional[Callable[[List[Dict[str, Any]]], Awaitable[List[Optional[str]]]]] = None
+                            ) -> Dict[str, Any]:
+    """Validate streamed records and insert them in unordered batches.
+
+    ``prepare`` turns a raw record into a complaint document (raising on
+    invalid input), and ``enrich`` may add fields to a whole batch before it
+    is written. ``dedupe`` returns, per document, the complaint_id of an
+    existing complaint it repeats; those are reported instead of inserted.
+    One batch is enriched and written while the next is parsed.
+    """
+    inserted: List[Dict[str, Any]] = []
+    duplicates: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    received = 0
+    batch: List[Dict[str, Any]] = []
+    indices: List[int] = []
+    pending = None
+
+    async def write(documents, positions):
+        if enrich is not None:
+            await enrich(documents)
+        if dedupe is not None:
+            fresh, fresh_positions = [], []
+            for document, index, duplicate_of in zip(documents, positions, await dedupe(documents)):
+                if duplicate_of is None:
+                    fresh.append(document)
+                    fresh_positions.append(index)
+                else:
+                    duplicates.append({"index": index, "complaint_id": duplicate_of})
+            documents, positions = fresh, fresh_positions
+        failures = await db.create_complaints_bulk(documents)
+        for document, index, error in zip(documents, positions, failures):
+            if error is None:
+                inserted.append({"index": index, "complaint_id": document["complaint_id"]})
+            else:
+                errors.append({"index": index, "error": error})
+
+    async for record, error in iter_json_records(chunks):
+        index = received
+        received += 1
+        if error is None:
+            try:
+                batch.append(prepare(record))
+                indices.append(index)
+            except Exception as e:
+                error = str(e)
+        if error is not None:
+            errors.append({"index": index, "error": error})
+
+        if len(batch) >= batch_size:
+            if pending is not None:
+                await pending
+            pending = asyncio.ensure_future(write(batch, indices))
+            batch, indices = [], []
+
+    if pending is not None:
+        await pending
+    if batch:
+        await write(batch, indices)
+
+    inserted.sort(key=lambda item: item["index"])
+    duplicates.sort(key=lambda item: item["index"])
+    errors.sort(key=lambda item: item["index"])
+    return {
+        "received": received,
+        "inserted": len(inserted),
+        "duplicate": len(duplicates),
+        "failed": len(errors),
+        "complaint_ids": inserted,
+        "duplicates": duplicates,
+        "errors": errors
+    }
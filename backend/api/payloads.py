@@ -0,0 +1,78 @@
+from typing import Dict, Any, List, Optional
+from backend.database.database import Complaint
+
+# Response bodies shared by the FastAPI routes and the in-process tool backend,
+# so both paths hand the agent exactly the same data.
+
+def new_complaint_document(name: str, mobile: str, complaint_details: str,
+                           locality: Optional[str] = None) -> Dict[str, Any]:
+    document = {
+        "name": name,
+        "mobile": mobile,
+        "complaint_details": complaint_details,
+        "status": "In Progress"
+    }
+    if locality:
+        document["locality"] = locality.strip().lower()
+    return document
+
+def registration_payload(complaint: Complaint) -> Dict[str, Any]:
+    return {
+        "complaint_id": complaint.complaint_id,
+        "message": f"Complaint registered successfully with ID: {complaint.complaint_id}",
+        "duplicate": False
+    }
+
+def duplicate_payload(complaint_id: str) -> Dict[str, Any]:
+    return {
+        "complaint_id": complaint_id,
+        "message": (f"This looks like your open complaint {complaint_id}, so no new complaint was "
+                    f"created. Your follow-up has been added to it."),
+        "duplicate": True
+    }
+
+def status_payload(complaint: Complaint) -> Dict[str, Any]:
+    return {
+        "complaint_id": complaint.complaint_id,
+        "status": complaint.status,
+        "category": complaint.category,
+        "priority": complaint.priority,
+        "created_at": complaint.created_at,
+        "updated_at": complaint.updated_at,
+        "version": complaint.version
+    }
+
+def summary_payload(document: Dict[str, Any]) -> Dict[str, Any]:
+    """One listing entry from a SUMMARY_PROJECTION document"""
+    return {
+        "complaint_id": document["complaint_id"],
+        "status": document["status"],
+        "details": document["complaint_details"],
+        "category": document.get("category"),
+        "priority": document.get("priority"),
+        "created_at": document["created_at"]
+    }
+
+def complaints_page_payload(documents: List[Dict[str, Any]], next_cursor: Optional[str]) -> Dict[str, Any]:
+    return {
+        "complaints": [summary_payload(document) for document in documents],
+        "next_cursor": next_cursor
+    }
+
+
+def search_page_payload(page) -> Dict[str, Any]:
+    return {
+        "results": [
+            {
+                "complaint_id": hit.complaint_id,
+                "status": hit.status,
+                "details": hit.complaint_details,
+                "category": hit.category,
+                "priority": hit.priority,
+                "created_at": hit.created_at,
+                "score": hit.score
+            }
+            for hit in page.results
+        ],
+        "next_cursor": page.next_cursor
+    }
@@ -0,0 +1,234 @@
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+import asyncio
+import hmac
+import json
+import math
+import os
+import time
+from backend.observability.metrics import REGISTRY
+
+# Token buckets on the public lookups (off disables them; admission control stays on)
+RATE_LIMIT = os.getenv("RATE_LIMIT", "on").lower() != "off"
+# Sustained requests/second and burst size per client IP, and per mobile number listed (a rate of 0
+# turns that bucket off)
+RATE_LIMIT_PER_IP = float(os.getenv("RATE_LIMIT_PER_IP", "10"))
+RATE_LIMIT_IP_BURST = int(os.getenv("RATE_LIMIT_IP_BURST", "30"))
+RATE_LIMIT_PER_MOBILE = float(os.getenv("RATE_LIMIT_PER_MOBILE", "1"))
+RATE_LIMIT_MOBILE_BURST = int(os.getenv("RATE_LIMIT_MOBILE_BURST", "10"))
+# GET paths under these prefixes are limited; the mobile limit applies to the listing
+RATE_LIMITED_PATHS = tuple(filter(None, os.getenv(
+    "RATE_LIMITED_PATHS", "/api/complaint_status/,/api/complaints_by_mobile/,/api/search"
+).split(",")))
+MOBILE_LISTING_PREFIX = "/api/complaints_by_mobile/"
+# Buckets kept by the memory store; the least recently used client starts over with a full bucket
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# Internal callers skip the token buckets: the chat agent's HTTP tools make calls for every
+# chat user from one address. Trusted are loopback connections without X-Forwarded-For (a
+# proxy on the same host must set it), and requests carrying INTERNAL_API_TOKEN if it is set
+RATE_LIMIT_EXEMPT_LOOPBACK = os.getenv("RATE_LIMIT_EXEMPT_LOOPBACK", "on").lower() != "off"
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN", "")
+INTERNAL_TOKEN_HEADER = "X-Internal-Token"
+LOOPBACK_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+# API requests handled at once per process; more wait briefly in a bounded queue, then get 503
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "64"))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "128"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "0.5"))
+# Long-lived streams have their own cap (MAX_STATUS_SUBSCRIBERS)
+ADMISSION_EXEMPT_PATHS = ("/api/status_events",)
+
+rejections = REGISTRY.counter("rejected_requests_total", "Requests refused by rate limits or load shedding",
+                              ["reason"])
+
+class MemoryBucketStore:
+    """Token buckets in process memory; each API worker counts on its own"""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Spend one token; returns 0 if allowed, otherwise seconds until a token is available"""
+        now = self.clock()
+        tokens, updated = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+# Same arithmetic as MemoryBucketStore.take, atomic on the Redis server
+TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= 1 then tokens = tokens - 1 else retry_after = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(retry_after)
+"""
+
+class RedisBucketStore:
+    """Token buckets shared by every API worker, via a redis.asyncio client"""
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.prefix = prefix
+        self._take = client.register_script(TAKE_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        return float(await self._take(keys=[self.prefix + key], args=[rate, burst, time.time()]))
+
+def create_bucket_store_from_env():
+    """Build the store selected by RATE_LIMIT_STORE (memory or redis)"""
+    backend = os.getenv("RATE_LIMIT_STORE", "memory").lower()
+    if backend == "redis":
+        import redis.asyncio
+        return RedisBucketStore(redis.asyncio.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0")))
+    if backend == "memory":
+        return MemoryBucketStore()
+    raise ValueError(f"Unknown RATE_LIMIT_STORE: {backend}")
+
+class AdmissionControl:
+    """Caps in-flight requests; a short bounded queue absorbs bursts and the rest are shed"""
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_REQUESTS, queue_size: int = ADMISSION_QUEUE_SIZE,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(max_concurrent)
+
+    async def acquire(self) -> bool:
+        if not self._slots.locked():
+            await self._slots.acquire()
+            return True
+        if self.waiting >= self.queue_size:
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+
+    def release(self):
+        self._slots.release()
+
+def bucket_limit(name: str, limit: Tuple[float, int]) -> Optional[Tuple[float, int]]:
+    """Check a (rate, burst) setting; None when the rate is 0, meaning that bucket is off"""
+    rate, burst = limit
+    if rate == 0:
+        return None
+    if rate < 0 or burst < 1:
+        raise ValueError(f"{name} needs a rate >= 0 and a burst >= 1, got {rate}/s with burst {burst}")
+    return rate, burst
+
+def is_internal_request(scope, exempt_loopback: bool = RATE_LIMIT_EXEMPT_LOOPBACK,
+                        token: str = INTERNAL_API_TOKEN) -> bool:
+    """Whether the request comes from a trusted internal client rather than the public"""
+    headers = dict(scope.get("headers") or ())
+    if token:
+        presented = headers.get(INTERNAL_TOKEN_HEADER.lower().encode(), b"")
+        if hmac.compare_digest(presented, token.encode()):
+            return True
+    client = scope.get("client")
+    # uvicorn rewrites the client from X-Forwarded-For, but the header itself is kept
+    return exempt_loopback and client is not None and client[0] in LOOPBACK_HOSTS \
+        and b"x-forwarded-for" not in headers
+
+async def _reject(send, status: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode()
+    await send({"type": "http.response.start", "status": status, "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+        (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+    ]})
+    await send({"type": "http.response.body", "body": body})
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware: token buckets on public lookups, then admission control.
+
+    Lookups over their per-IP or per-mobile budget get 429 with Retry-After;
+    internal clients (is_internal_request) are not counted.
+    Any /api request arriving while MAX_CONCURRENT_REQUESTS are in flight
+    waits up to ADMISSION_QUEUE_TIMEOUT for a slot and is shed with 503 if
+    none frees up (or the queue is full), so overload shows up as quick
+    refusals instead of every request slowing down. The client IP is the
+    connection's, or X-Forwarded-For when uvicorn trusts the proxy.
+    """
+
+    def __init__(self, app, store=None, enabled: bool = RATE_LIMIT,
+                 limited_paths: Sequence[str] = RATE_LIMITED_PATHS,
+                 per_ip: Tuple[float, int] = (RATE_LIMIT_PER_IP, RATE_LIMIT_IP_BURST),
+                 per_mobile: Tuple[float, int] = (RATE_LIMIT_PER_MOBILE, RATE_LIMIT_MOBILE_BURST),
+                 max_concurrent: int = MAX_CONCURRENT_REQUESTS, queue_size: int = ADMISSION_QUEUE_SIZE,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+                 exempt_loopback: bool = RATE_LIMIT_EXEMPT_LOOPBACK, internal_token: str = INTERNAL_API_TOKEN):
+        self.app = app
+        self.enabled = enabled
+        self.store = store or (create_bucket_store_from_env() if enabled else None)
+        self.limited_paths = tuple(limited_paths)
+        self.per_ip = bucket_limit("RATE_LIMIT_PER_IP", per_ip)
+        self.per_mobile = bucket_limit("RATE_LIMIT_PER_MOBILE", per_mobile)
+        self.admission_limits = (max_concurrent, queue_size, queue_timeout)
+        self.exempt_loopback = exempt_loopback
+        self.internal_token = internal_token
+        self.admission: Optional[AdmissionControl] = None
+
+    async def _retry_after(self, scope) -> Tuple[float, str]:
+        path = scope["path"]
+        if scope["method"] != "GET" or not path.startswith(self.limited_paths):
+            return 0.0, ""
+        if self.per_ip is not None:
+            client = scope.get("client")
+            retry_after = await self.store.take(f"ip:{client[0] if client else 'unknown'}", *self.per_ip)
+            if retry_after:
+                return retry_after, "ip"
+        if self.per_mobile is not None and path.startswith(MOBILE_LISTING_PREFIX):
+            mobile = path[len(MOBILE_LISTING_PREFIX):].split("/", 1)[0]
+            retry_after = await self.store.take(f"mobile:{mobile}", *self.per_mobile)
+            if retry_after:
+                return retry_after, "mobile"
+        return 0.0, ""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            # The semaphore belongs to the loop serving this run of the app
+            self.admission = AdmissionControl(*self.admission_limits)
+        if scope["type"] != "http" or not scope["path"].startswith("/api/") \
+                or scope["path"].startswith(ADMISSION_EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        if self.enabled and not is_internal_request(scope, self.exempt_loopback, self.internal_token):
+            retry_after, limit = await self._retry_after(scope)
+            if retry_after:
+                rejections.inc(f"rate_limit_{limit}")
+                await _reject(send, 429, "Too many requests", retry_after)
+                return
+
+        if self.admission is None:
+            self.admission = AdmissionControl(*self.admission_limits)
+        if not await self.admission.acquire():
+            rejections.inc("overloaded")
+            await _reject(send, 503, "Server is busy, retry shortly", 1)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.admission.release()
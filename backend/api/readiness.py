@@ -0,0 +1,27 @@
+import time
+from urllib.request import urlopen
+
+# urllib rather than requests: app.py imports this before its first render
+
+def is_ready(base_url: str, timeout: float = 1.0) -> bool:
+    """One GET /healthz; False on any connection error or non-200 answer"""
+    try:
+        with urlopen(f"{base_url}/healthz", timeout=timeout) as response:
+            return response.status == 200
+    except OSError:
+        # URLError and HTTPError (e.g. 503 while MongoDB is unreachable) are both OSErrors
+        return False
+
+def wait_until_ready(base_url: str, timeout: float = 30.0, initial_delay: float = 0.05,
+                     max_delay: float = 1.0) -> bool:
+    """Poll /healthz with exponential backoff until it answers 200 or ``timeout`` seconds pass"""
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        if is_ready(base_url):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
@@ -0,0 +1,29 @@
+from typing import Any, Dict, Optional
+from backend.api.payloads import duplicate_payload, registration_payload
+from backend.classification.classifier import aclassify_documents
+from backend.jobs.handlers import enqueue_registration_jobs
+from backend.jobs.queue import JobQueue
+
+async def register_new_complaint(document: Dict[str, Any], db, duplicate_detector,
+                                 jobs: Optional[JobQueue]) -> Dict[str, Any]:
+    """Register one complaint the way POST /api/register_complaint does.
+
+    Shared with the in-process tool backend so that both paths run the same
+    repeat check, classification and follow-up jobs. ``db`` is an
+    AsyncDatabase. Returns the response body.
+    """
+    if duplicate_detector is not None:
+        duplicate_of = await duplicate_detector.acheck(document)
+        if duplicate_of is not None:
+            return duplicate_payload(duplicate_of)
+    await aclassify_documents([document])
+
+    # The data layer generates the ID and retries if it collides
+    created = await db.create_complaint(document)
+    if jobs is not None:
+        try:
+            await enqueue_registration_jobs(jobs, created)
+        except Exception as e:
+            # The complaint is saved; a lost follow-up must not fail the registration
+            print(f"Warning: Could not enqueue follow-up jobs for {created.complaint_id}: {e}")
+    return registration_payload(created)
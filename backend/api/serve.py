@@ -0,0 +1,58 @@
+"""Production entry point: several uvicorn worker processes behind one port.
+
+Each worker runs the FastAPI lifespan, so it opens its own pooled Mongo
+client (MONGO_MAX_POOL_SIZE connections at most), job queue workers and
+status feed. On SIGTERM uvicorn stops accepting connections, waits up to
+GRACEFUL_SHUTDOWN_TIMEOUT seconds for in-flight requests, and then runs the
+lifespan shutdown, which drains the job queue and closes the client.
+
+    python -m backend.database.migrate
+    python -m backend.api.serve --workers 4
+"""
+import argparse
+import os
+import uvicorn
+
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("API_PORT", "8001"))
+API_WORKERS = int(os.getenv("API_WORKERS", str(os.cpu_count() or 1)))
+# Open status streams never finish on their own; they are cut after this and clients reconnect
+GRACEFUL_SHUTDOWN_TIMEOUT = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
+
+def per_worker_warnings(workers: int):
+    """Settings that behave differently once requests are spread over several processes"""
+    if workers <= 1:
+        return []
+    warnings = []
+    if os.getenv("COMPLAINT_CACHE_BACKEND", "memory").lower() == "memory":
+        warnings.append("COMPLAINT_CACHE_BACKEND=memory: a status change made through one worker is "
+                        "only seen by the others once their cached copy expires; use redis")
+    if os.getenv("STATUS_EVENTS_SOURCE", "auto").lower() == "local":
+        warnings.append("STATUS_EVENTS_SOURCE=local: subscribers only hear about changes made "
+                        "through the worker they are connected to")
+    if os.getenv("SEARCH_BACKEND", "text").lower() == "local":
+        warnings.append(f"SEARCH_BACKEND=local: every worker holds its own index ({workers} copies in RAM)")
+    return warnings
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the complaint API with several worker processes")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS)
+    parser.add_argument("--graceful-timeout", type=int, default=GRACEFUL_SHUTDOWN_TIMEOUT)
+    args = parser.parse_args()
+
+    for warning in per_worker_warnings(args.workers):
+        print(f"Warning: {warning}")
+    uvicorn.run(
+        "backend.api.api_server:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        # Behind a load balancer, take client addresses from X-Forwarded-For
+        proxy_headers=True,
+    )
+
+if __name__ == "__main__":
+    main()
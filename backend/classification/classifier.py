@@ -0,0 +1,93 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import os
+import pickle
+import threading
+from backend.classification.seed_data import SEED_COMPLAINTS
+
+# Pickled ComplaintClassifier from `python -m backend.classification.train`
+CLASSIFIER_MODEL_PATH = os.getenv("CLASSIFIER_MODEL_PATH", "")
+
+_shared_classifier = None
+_shared_classifier_lock = threading.Lock()
+
+class ComplaintClassifier:
+    """TF-IDF features with one linear model for category and one for priority.
+
+    Both models share the vectorizer, so a batch of complaints is tokenized
+    once and scored with two sparse matrix products. Everything runs on the
+    CPU in a few microseconds per complaint.
+    """
+
+    def __init__(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        self.vectorizer = TfidfVectorizer(
+            lowercase=True, ngram_range=(1, 2), sublinear_tf=True, strip_accents="unicode"
+        )
+        self.category_model = LogisticRegression(max_iter=1000, C=10.0, class_weight="balanced")
+        self.priority_model = LogisticRegression(max_iter=1000, C=10.0, class_weight="balanced")
+
+    def fit(self, texts: List[str], categories: List[str], priorities: List[str]) -> "ComplaintClassifier":
+        features = self.vectorizer.fit_transform(texts)
+        self.category_model.fit(features, categories)
+        self.priority_model.fit(features, priorities)
+        return self
+
+    def predict(self, texts: List[str]) -> List[Tuple[str, str]]:
+        if not texts:
+            return []
+        features = self.vectorizer.transform(texts)
+        return list(zip(self.category_model.predict(features).tolist(),
+                        self.priority_model.predict(features).tolist()))
+
+    def classify_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Set category and priority on complaint documents in place"""
+        predictions = self.predict([document.get("complaint_details", "") for document in documents])
+        for document, (category, priority) in zip(documents, predictions):
+            document["category"] = category
+            document["priority"] = priority
+        return documents
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path: str) -> "ComplaintClassifier":
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+def train_classifier(examples: Iterable[Tuple[str, str, str]] = ()) -> ComplaintClassifier:
+    """Fit on the seed examples plus any (details, category, priority) triples given"""
+    rows = list(SEED_COMPLAINTS) + list(examples)
+    texts, categories, priorities = zip(*rows)
+    return ComplaintClassifier().fit(list(texts), list(categories), list(priorities))
+
+def load_or_train_classifier(path: Optional[str] = None) -> ComplaintClassifier:
+    path = path or CLASSIFIER_MODEL_PATH
+    if path and os.path.exists(path):
+        return ComplaintClassifier.load(path)
+    return train_classifier()
+
+def get_shared_classifier() -> ComplaintClassifier:
+    """Process-wide classifier, loaded or trained on first use"""
+    global _shared_classifier
+    if _shared_classifier is None:
+        with _shared_classifier_lock:
+            if _shared_classifier is None:
+                _shared_classifier = load_or_train_classifier()
+    return _shared_classifier
+
+def shared_classifier_loaded() -> bool:
+    """Whether the process-wide classifier has finished loading or training"""
+    return _shared_classifier is not None
+
+async def aclassify_documents(documents: List[Dict[str, Any]],
+                              classifier: Optional[ComplaintClassifier] = None) -> List[Dict[str, Any]]:
+    """classify_documents on a worker thread, keeping the event loop free"""
+    def classify():
+        # The shared model may still need training, which is slow too
+        return (classifier or get_shared_classifier()).classify_documents(documents)
+
+    return await asyncio.get_running_loop().run_in_executor(None, classify)
@@ -0,0 +1,110 @@
+# Hand-labelled examples the classifier starts from when no trained model is
+# configured. Each entry is (complaint_details, category, priority).
+
+CATEGORIES = (
+    "water_supply", "electricity", "roads", "sanitation", "drainage",
+    "street_lights", "public_transport", "health", "other",
+)
+PRIORITIES = ("high", "medium", "low")
+
+SEED_COMPLAINTS = [
+    # water_supply
+    ("No water supply in our colony for the last three days", "water_supply", "high"),
+    ("Drinking water is muddy and smells bad, children are falling sick", "water_supply", "high"),
+    ("Water pipeline burst near the main road, water wasted since morning", "water_supply", "high"),
+    ("Water comes only for 20 minutes in the morning with very low pressure", "water_supply", "medium"),
+    ("Water tanker did not come to our street this week", "water_supply", "medium"),
+    ("Tap water connection request pending for two months", "water_supply", "low"),
+    ("Water leakage from the municipal pipe near block 4", "water_supply", "medium"),
+    ("Water meter is not working and the bill is wrong", "water_supply", "low"),
+    ("Contaminated water supply with worms in the tap water", "water_supply", "high"),
+    ("Irregular water timings in ward 12, please fix the schedule", "water_supply", "low"),
+    # electricity
+    ("Live electric wire fallen on the road after the storm", "electricity", "high"),
+    ("Transformer sparking and caught fire near the market", "electricity", "high"),
+    ("Power cut for more than 12 hours in our area", "electricity", "high"),
+    ("Frequent power cuts every evening for the past week", "electricity", "medium"),
+    ("Voltage fluctuation damaged my fridge and fan", "electricity", "medium"),
+    ("Electricity bill is too high compared to last month", "electricity", "low"),
+    ("New electricity connection application not processed", "electricity", "low"),
+    ("Electric pole is leaning dangerously towards houses", "electricity", "high"),
+    ("Meter reading not taken, estimated bill issued", "electricity", "low"),
+    ("Low voltage at night, lights flicker and motor will not start", "electricity", "medium"),
+    # roads
+    ("Huge pothole on the main road caused a bike accident", "roads", "high"),
+    ("Road caved in near the bridge, vehicles at risk", "roads", "high"),
+    ("Potholes all over the street, very difficult to drive", "roads", "medium"),
+    ("Road construction left half done for months", "roads", "medium"),
+    ("Speed breaker needed near the school gate", "roads", "medium"),
+    ("Footpath tiles broken and uneven", "roads", "low"),
+    ("Road markings faded at the junction", "roads", "low"),
+    ("Debris dumped on the road by builders blocking traffic", "roads", "medium"),
+    ("Tar road washed away in the rain, gravel everywhere", "roads", "medium"),
+    ("Request to widen the narrow lane near the temple", "roads", "low"),
+    # sanitation
+    ("Garbage not collected for a week, terrible smell and flies", "sanitation", "high"),
+    ("Dead animal lying on the street since yesterday", "sanitation", "high"),
+    ("Garbage bin overflowing near the bus stop", "sanitation", "medium"),
+    ("Sweepers do not clean our lane regularly", "sanitation", "low"),
+    ("People burning garbage in the open ground, smoke everywhere", "sanitation", "medium"),
+    ("Public toilet is dirty and without water", "sanitation", "medium"),
+    ("Need more dustbins in the park", "sanitation", "low"),
+    ("Waste collection vehicle comes at irregular times", "sanitation", "low"),
+    ("Medical waste dumped near the residential area", "sanitation", "high"),
+    ("Stray dogs tearing garbage bags all over the road", "sanitation", "medium"),
+    # drainage
+    ("Sewage overflowing into houses after the rain", "drainage", "high"),
+    ("Open manhole on the main road, someone may fall in", "drainage", "high"),
+    ("Drain blocked and dirty water stagnant in front of houses", "drainage", "medium"),
+    ("Water logging on the street for days after rain, mosquitoes breeding", "drainage", "medium"),
+    ("Sewer line choked, bad smell in the whole lane", "drainage", "medium"),
+    ("Drain cover broken near the school", "drainage", "medium"),
+    ("Storm water drain not cleaned before monsoon", "drainage", "low"),
+    ("Sewage mixing with drinking water line", "drainage", "high"),
+    ("Request for a new drainage connection for our house", "drainage", "low"),
+    ("Gutter water flowing on the road near the market", "drainage", "medium"),
+    # street_lights
+    ("Street lights not working, the road is completely dark and unsafe for women", "street_lights", "high"),
+    ("Street light pole has exposed wires at the bottom", "street_lights", "high"),
+    ("Street lamp near my house has been off for two weeks", "street_lights", "medium"),
+    ("Street lights stay on during the day wasting power", "street_lights", "low"),
+    ("Several street lights flickering on the highway stretch", "street_lights", "medium"),
+    ("Need a new street light at the dark corner of the park", "street_lights", "low"),
+    ("Bulb of the street light is fused in lane 3", "street_lights", "low"),
+    ("All lights on the bridge are off at night", "street_lights", "medium"),
+    ("Street light timer is wrong, lights switch off at 9 pm", "street_lights", "low"),
+    ("No lighting in the underpass, thefts happening at night", "street_lights", "high"),
+    # public_transport
+    ("Bus driver was rash and almost hit pedestrians", "public_transport", "high"),
+    ("Bus route 45 cancelled without notice", "public_transport", "medium"),
+    ("Buses are always late and overcrowded in the morning", "public_transport", "medium"),
+    ("Conductor refused to give a ticket and misbehaved", "public_transport", "medium"),
+    ("Bus stop shelter is broken and has no seating", "public_transport", "low"),
+    ("Need a bus stop near the new housing colony", "public_transport", "low"),
+    ("Auto drivers charging extra fare at the station", "public_transport", "low"),
+    ("Bus door does not close while moving, dangerous for passengers", "public_transport", "high"),
+    ("Bus pass renewal counter always closed", "public_transport", "low"),
+    ("Metro feeder bus timings not displayed", "public_transport", "low"),
+    # health
+    ("Dengue cases increasing in our area, no fogging done", "health", "high"),
+    ("Government hospital has no doctor in the emergency ward at night", "health", "high"),
+    ("Ambulance did not arrive for an hour after calling", "health", "high"),
+    ("Primary health centre has no medicines", "health", "medium"),
+    ("Long queues at the hospital registration counter", "health", "low"),
+    ("Mosquito menace, request anti larva spraying", "health", "medium"),
+    ("Food sold at roadside stalls is unhygienic", "health", "medium"),
+    ("Vaccination camp dates not announced", "health", "low"),
+    ("Hospital toilets are unclean", "health", "low"),
+    ("Stray dog bite cases rising, need vaccination for dogs", "health", "high"),
+    # other
+    ("Noise from loudspeakers late at night every day", "other", "low"),
+    ("Illegal encroachment on the public park", "other", "medium"),
+    ("Tree branch about to fall on parked cars", "other", "high"),
+    ("Ration card application pending for months", "other", "low"),
+    ("Park gym equipment is broken", "other", "low"),
+    ("Illegal parking blocking the gate of our building", "other", "low"),
+    ("Pension not credited for three months", "other", "medium"),
+    ("Fallen tree blocking the entire road after the storm", "other", "high"),
+    ("Birth certificate correction taking too long", "other", "low"),
+    ("Shop owners occupying the footpath with goods", "other", "low"),
+]
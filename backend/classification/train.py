@@ -0,0 +1,51 @@
+"""Train the complaint classifier on labelled complaints and pickle it.
+
+The input is JSON lines with complaint_details, category and priority (for
+example, complaints re-labelled by triage staff). The seed examples are
+always included. Point CLASSIFIER_MODEL_PATH at the output to use it.
+
+    python -m backend.classification.train labelled.jsonl --out classifier.pkl
+"""
+import argparse
+import json
+import random
+
+from backend.classification.classifier import train_classifier
+
+
+def read_examples(path):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["complaint_details"], record["category"], record["priority"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("data", nargs="?", help="JSON lines of labelled complaints")
+    parser.add_argument("--out", default="classifier.pkl")
+    parser.add_argument("--holdout", type=float, default=0.2,
+                        help="Fraction of the labelled data held out for the accuracy report")
+    args = parser.parse_args()
+
+    examples = list(read_examples(args.data)) if args.data else []
+    random.Random(0).shuffle(examples)
+    split = int(len(examples) * (1 - args.holdout)) if len(examples) >= 10 else len(examples)
+    train, test = examples[:split], examples[split:]
+
+    classifier = train_classifier(train)
+    if test:
+        predictions = classifier.predict([details for details, _, _ in test])
+        category_hits = sum(p[0] == t[1] for p, t in zip(predictions, test))
+        priority_hits = sum(p[1] == t[2] for p, t in zip(predictions, test))
+        print(f"Held-out accuracy on {len(test)} complaints: "
+              f"category {category_hits / len(test):.1%}, priority {priority_hits / len(test):.1%}")
+        # Ship a model that has seen everything
+        classifier = train_classifier(examples)
+    classifier.save(args.out)
+    print(f"Saved classifier trained on {len(examples)} labelled + seed complaints to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
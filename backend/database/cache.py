@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from typing import Optional, Any, Callable, Dict
+import os
+import threading
+import time
+
+class CacheStats:
+    """Hit/miss/eviction counters shared by every cache backend"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+class TTLCache:
+    """In-process LRU cache whose entries also expire after a fixed TTL"""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class RedisCache:
+    """Cache backed by any redis-py compatible client (get/setex/delete).
+
+    Values are stored as strings, so callers pass an encode/decode pair.
+    Expiry and eviction happen server-side; ``evictions`` only counts
+    entries this process found expired or malformed.
+    """
+
+    def __init__(self, client, ttl_seconds: float = 30.0, prefix: str = "cache:",
+                 encode: Callable[[Any], str] = str,
+                 decode: Callable[[Any], Any] = lambda raw: raw):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.encode = encode
+        self.decode = decode
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        try:
+            value = self.decode(raw)
+        except Exception:
+            self.client.delete(self.prefix + key)
+            self.stats.evictions += 1
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        self.client.setex(self.prefix + key, max(1, int(self.ttl_seconds)), self.encode(value))
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+        self.stats.invalidations += 1
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+def create_cache_from_env(prefix: str, encode: Callable[[Any], str],
+                          decode: Callable[[Any], Any]):
+    """Build the cache selected by COMPLAINT_CACHE_BACKEND (memory, redis or none)"""
+    backend = os.getenv("COMPLAINT_CACHE_BACKEND", "memory").lower()
+    ttl_seconds = float(os.getenv("COMPLAINT_CACHE_TTL", "30"))
+
+    if backend == "none":
+        return None
+    if backend == "redis":
+        import redis
+        client = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        return RedisCache(client, ttl_seconds=ttl_seconds, prefix=prefix,
+                          encode=encode, decode=decode)
+    if backend == "memory":
+        return TTLCache(
+            max_size=int(os.getenv("COMPLAINT_CACHE_SIZE", "10000")),
+            ttl_seconds=ttl_seconds
+        )
+    raise ValueError(f"Unknown COMPLAINT_CACHE_BACKEND: {backend}")
@@ -1,14 +1,63 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import base64
+import contextvars
+import functools
 import os
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field, ConfigDict
 from bson import ObjectId
 import certifi
+from backend.database.cache import create_cache_from_env
+from backend.database.ids import create_id_generator
+from backend.stats.rollups import StatsRollups
+from backend.observability.tracing import traced
 
 load_dotenv()
 
+# Attempts at a fresh complaint_id before an insert gives up
+MAX_ID_ATTEMPTS = 5
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Connection pool of each process; every API worker opens its own
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+# How long a query waits for a free pooled connection before failing
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "10000"))
+
+# Allowed status changes: Resolved can be reopened, Closed is final
+STATUS_TRANSITIONS = {
+    "In Progress": ("Assigned", "Closed"),
+    "Assigned": ("In Progress", "Resolved", "Closed"),
+    "Resolved": ("Closed", "In Progress"),
+    "Closed": (),
+}
+# Statuses that end a complaint; moving into one stamps resolved_at
+CLOSED_STATUSES = ("Resolved", "Closed")
+
+# Fields returned by the complaints-by-mobile listing (plus _id for the cursor)
+SUMMARY_PROJECTION = {
+    "complaint_id": 1,
+    "status": 1,
+    "complaint_details": 1,
+    "category": 1,
+    "priority": 1,
+    "created_at": 1
+}
+
+# Fields of the complaint status response, read without building a Complaint
+STATUS_FIELDS = ("complaint_id", "status", "category", "priority", "created_at", "updated_at", "version")
+STATUS_PROJECTION = {**dict.fromkeys(STATUS_FIELDS, 1), "_id": 0}
+# Values for fields older documents may not have
+STATUS_DEFAULTS = {"category": None, "priority": None, "version": 0}
+
 class PyObjectId(str):
     @classmethod
     def __get_validators__(cls):
@@ -38,25 +87,105 @@ class Complaint(BaseModel):
     mobile: str
     complaint_details: str
     status: str = "In Progress"
+    locality: Optional[str] = None
+    # Filled in by the classifier at ingest or by the backfill job
+    category: Optional[str] = None
+    priority: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
+    resolved_at: Optional[datetime] = None
+    # Bumped by every status change, for compare-and-swap updates
+    version: int = 0
+
+class ComplaintSummary(BaseModel):
+    complaint_id: str
+    status: str
+    complaint_details: str
+    category: Optional[str] = None
+    priority: Optional[str] = None
+    created_at: datetime
+
+class ComplaintPage(BaseModel):
+    complaints: List[ComplaintSummary]
+    next_cursor: Optional[str] = None
+
+def mongo_now() -> datetime:
+    """The current time at the millisecond precision Mongo stores.
+
+    Cached copies and returned models hold the same value a later read from
+    Mongo would, so a response never depends on whether it came from cache.
+    """
+    now = datetime.now()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+def encode_cursor(created_at: datetime, object_id: ObjectId) -> str:
+    """Opaque keyset cursor pointing just after the given document"""
+    raw = f"{created_at.isoformat()}|{object_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, object_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), ObjectId(object_id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+# Marker meaning "build the complaint cache from environment variables"
+CACHE_FROM_ENV = object()
+
+class StatusTransitionError(Exception):
+    """The complaint's current status cannot move to the requested one"""
+
+class VersionConflict(Exception):
+    """The complaint changed since the caller read it"""
+
+    def __init__(self, current: "Complaint", expected_version: Optional[int]):
+        super().__init__(f"Complaint {current.complaint_id} is at version {current.version} "
+                         f"with status {current.status}")
+        self.current = current
+        self.expected_version = expected_version
+
+def source_statuses(status: str) -> List[str]:
+    """Statuses a complaint may be in to move to ``status``"""
+    if status not in STATUS_TRANSITIONS:
+        raise ValueError(f"Unknown status: {status}")
+    return [source for source, targets in STATUS_TRANSITIONS.items() if status in targets]
+
+def version_filter(version: int) -> Dict[str, Any]:
+    # Complaints stored before versioning have no field and count as version 0
+    return {"version": {"$in": [0, None]}} if version == 0 else {"version": version}
+
+def is_complaint_id_conflict(details: Optional[Dict[str, Any]]) -> bool:
+    """Whether a duplicate-key error came from the complaint_id index"""
+    key_pattern = (details or {}).get("keyPattern")
+    # Servers that don't report the key only have the complaint_id unique index to hit
+    return key_pattern is None or "complaint_id" in key_pattern
 
 class Database:
-    def __init__(self):
-        mongodb_uri = os.getenv("MONGODB_URI")
-        if not mongodb_uri:
-            raise ValueError("MONGODB_URI not found in environment variables")
-        
-        # Connect to MongoDB Atlas with SSL certificate
-        self.client = MongoClient(
-            mongodb_uri,
-            tlsCAFile=certifi.where(),
-            serverSelectionTimeoutMS=5000
-        )
+    def __init__(self, client: Optional[MongoClient] = None, cache: Any = CACHE_FROM_ENV,
+                 id_generator: Any = None):
+        if client is not None:
+            # Pre-built client (e.g. a local mongod or mongomock for benchmarks)
+            self.client = client
+        else:
+            mongodb_uri = os.getenv("MONGODB_URI")
+            if not mongodb_uri:
+                raise ValueError("MONGODB_URI not found in environment variables")
+            
+            # Connect to MongoDB Atlas with SSL certificate
+            self.client = MongoClient(
+                mongodb_uri,
+                tlsCAFile=certifi.where(),
+                serverSelectionTimeoutMS=5000,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS
+            )
         
         # Test connection
         try:
-            self.client.admin.command('ping')
+            self.ping()
             print("Connected to MongoDB Atlas")
         except Exception as e:
             print(f"Failed to connect to MongoDB Atlas: {e}")
@@ -64,47 +193,484 @@ class Database:
         
         self.db = self.client[os.getenv("DATABASE_NAME", "grievance_db")]
         self.complaints = self.db.complaints
+        self.audit_log = self.db.audit_log
         
-        # Create indexes for better performance
-        self._create_indexes()
-    
-    def _create_indexes(self):
-        """Create indexes for better query performance"""
-        try:
-            self.complaints.create_index("complaint_id", unique=True)
-            self.complaints.create_index("mobile")
-            self.complaints.create_index("created_at")
-        except Exception as e:
-            print(f"Warning: Could not create indexes: {e}")
+        # Read-through cache for get_complaint_by_id (None disables it)
+        if cache is CACHE_FROM_ENV:
+            cache = create_cache_from_env(
+                prefix="complaint:",
+                encode=lambda c: c.model_dump_json(by_alias=True),
+                decode=Complaint.model_validate_json
+            )
+        self.cache = cache
+        
+        self.id_generator = id_generator or create_id_generator(db=self.db)
         
+        # In-process views (search index, rollups) told about every write
+        self.listeners: List[Any] = []
+        
+        # Counters behind /api/stats, shared by every process writing complaints
+        self.stats: Optional[StatsRollups] = None
+        if os.getenv("STATS_ROLLUPS", "on").lower() not in ("off", "false", "0"):
+            self.stats = StatsRollups(self.db)
+            self.add_listener(self.stats)
+    
+    def ensure_indexes(self):
+        """Create the complaint indexes; run by backend.database.migrate, not at startup"""
+        self.complaints.create_index("complaint_id", unique=True)
+        # Serves the keyset-paginated listing by mobile without an in-memory sort
+        self.complaints.create_index([("mobile", 1), ("created_at", -1), ("_id", -1)])
+        self.complaints.create_index("created_at")
+        # Triage queues: newest complaints per category/priority
+        self.complaints.create_index([("category", 1), ("priority", 1), ("created_at", -1)])
+        self.complaints.create_index([("priority", 1), ("created_at", -1)])
+        self.audit_log.create_index([("complaint_id", 1), ("at", -1)])
+    
+    def add_listener(self, listener: Any):
+        """Register an object with any of on_complaints_created(documents),
+        on_complaints_classified(documents) and on_status_changed(changes), where
+        changes is a list of (before, after) document pairs"""
+        self.listeners.append(listener)
+    
+    def _notify(self, event: str, *args):
+        for listener in self.listeners:
+            handler = getattr(listener, event, None)
+            if handler is None:
+                continue
+            try:
+                handler(*args)
+            except Exception as e:
+                # The write already succeeded; a stale view is better than a failed request
+                print(f"Warning: {type(listener).__name__}.{event} failed: {e}")
+    
+    @traced("db.create_complaint")
     def create_complaint(self, complaint_data: Dict[str, Any]) -> Complaint:
-        complaint_data["created_at"] = datetime.now()
-        complaint_data["updated_at"] = datetime.now()
-        result = self.complaints.insert_one(complaint_data)
+        """Insert a complaint, generating its complaint_id if none is given.
+
+        Generated IDs are retried on a duplicate-key error; a caller-supplied
+        ID that already exists is reported as is.
+        """
+        generate_id = "complaint_id" not in complaint_data
+        now = mongo_now()
+        complaint_data["created_at"] = now
+        complaint_data["updated_at"] = now
+        for attempt in range(MAX_ID_ATTEMPTS):
+            if generate_id:
+                complaint_data["complaint_id"] = self.id_generator.generate()
+            try:
+                result = self.complaints.insert_one(complaint_data)
+                break
+            except DuplicateKeyError as e:
+                if not generate_id or not is_complaint_id_conflict(e.details) \
+                        or attempt == MAX_ID_ATTEMPTS - 1:
+                    raise
         complaint_data["_id"] = result.inserted_id
-        return Complaint(**complaint_data)
+        complaint = Complaint(**complaint_data)
+        if self.cache is not None:
+            self.cache.set(complaint.complaint_id, complaint)
+        self._notify("on_complaints_created", [complaint_data])
+        return complaint
     
+    @traced("db.create_complaints_bulk")
+    def create_complaints_bulk(self, complaints_data: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Insert a batch with unordered insert_many.
+
+        Documents without a complaint_id get a generated one, and those that
+        collide on it are retried with fresh IDs. Returns one entry per input
+        document: None if it was inserted, otherwise the server's error.
+        """
+        if not complaints_data:
+            return []
+        now = mongo_now()
+        generated = set()
+        for position, complaint_data in enumerate(complaints_data):
+            complaint_data["created_at"] = now
+            complaint_data["updated_at"] = now
+            if "complaint_id" not in complaint_data:
+                complaint_data["complaint_id"] = self.id_generator.generate()
+                generated.add(position)
+        
+        errors: List[Optional[str]] = [None] * len(complaints_data)
+        pending = list(range(len(complaints_data)))
+        for attempt in range(MAX_ID_ATTEMPTS):
+            try:
+                self.complaints.insert_many([complaints_data[i] for i in pending], ordered=False)
+                break
+            except BulkWriteError as e:
+                retry = []
+                for write_error in e.details.get("writeErrors", []):
+                    position = pending[write_error["index"]]
+                    if (write_error.get("code") == 11000 and position in generated
+                            and is_complaint_id_conflict(write_error)
+                            and attempt < MAX_ID_ATTEMPTS - 1):
+                        complaints_data[position]["complaint_id"] = self.id_generator.generate()
+                        complaints_data[position].pop("_id", None)
+                        retry.append(position)
+                    else:
+                        errors[position] = write_error.get("errmsg", "Write failed")
+                if not retry:
+                    break
+                pending = retry
+        self._notify("on_complaints_created",
+                     [document for document, error in zip(complaints_data, errors) if error is None])
+        return errors
+    
+    @traced("db.get_complaint_by_id")
     def get_complaint_by_id(self, complaint_id: str) -> Optional[Complaint]:
+        if self.cache is not None:
+            cached = self.cache.get(complaint_id)
+            if cached is not None:
+                return cached
+        
         complaint = self.complaints.find_one({"complaint_id": complaint_id})
         if complaint:
-            return Complaint(**complaint)
+            complaint = Complaint(**complaint)
+            if self.cache is not None:
+                self.cache.set(complaint_id, complaint)
+            return complaint
         return None
     
-    def get_complaints_by_mobile(self, mobile: str) -> List[Complaint]:
-        complaints = self.complaints.find({"mobile": mobile}).sort("created_at", -1)
-        return [Complaint(**complaint) for complaint in complaints]
+    @traced("db.get_status_fields")
+    def get_status_fields(self, complaint_id: str) -> Optional[Dict[str, Any]]:
+        """STATUS_FIELDS of a complaint as a plain dict, for the hottest read.
+
+        With the cache on this reads through get_complaint_by_id, so hits
+        stay in memory; without it only STATUS_FIELDS are fetched and no
+        model is built.
+        """
+        if self.cache is not None:
+            complaint = self.get_complaint_by_id(complaint_id)
+            return {field: getattr(complaint, field) for field in STATUS_FIELDS} if complaint else None
+        document = self.complaints.find_one({"complaint_id": complaint_id}, STATUS_PROJECTION)
+        return {field: document.get(field, STATUS_DEFAULTS.get(field)) for field in STATUS_FIELDS} if document else None
+
+    @traced("db.get_summary_documents_by_mobile")
+    def get_summary_documents_by_mobile(self, mobile: str, limit: int = DEFAULT_PAGE_SIZE,
+                                        after: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Newest-first page of complaints for a mobile number, as SUMMARY_PROJECTION documents.
+
+        Pages are keyed on (created_at, _id) so each one is a single index
+        range scan, however deep the caller has paged. Returns the documents
+        and the cursor of the next page.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        query: Dict[str, Any] = {"mobile": mobile}
+        if after:
+            created_at, object_id = decode_cursor(after)
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": object_id}}
+            ]
+        
+        cursor = (
+            self.complaints.find(query, SUMMARY_PROJECTION)
+            .sort([("created_at", -1), ("_id", -1)])
+            .limit(limit + 1)
+        )
+        documents = list(cursor)
+        
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            last = documents[-1]
+            next_cursor = encode_cursor(last["created_at"], last["_id"])
+        return documents, next_cursor
+    
+    def get_complaints_by_mobile(self, mobile: str, limit: int = DEFAULT_PAGE_SIZE,
+                                 after: Optional[str] = None) -> ComplaintPage:
+        """get_summary_documents_by_mobile as ComplaintSummary models"""
+        documents, next_cursor = self.get_summary_documents_by_mobile(mobile, limit, after)
+        return ComplaintPage(
+            complaints=[ComplaintSummary(**doc) for doc in documents],
+            next_cursor=next_cursor
+        )
+
+    def _status_update(self, status: str, now: datetime) -> Dict[str, Any]:
+        update: Dict[str, Any] = {"$set": {"status": status, "updated_at": now}, "$inc": {"version": 1}}
+        if status in CLOSED_STATUSES:
+            # Resolved -> Closed keeps the original resolution time
+            update["$min"] = {"resolved_at": now}
+        else:
+            update["$unset"] = {"resolved_at": ""}
+        return update
+    
+    def _after_status_change(self, before: Dict[str, Any], status: str, now: datetime) -> Dict[str, Any]:
+        after = {**before, "status": status, "updated_at": now, "version": before.get("version", 0) + 1}
+        if status in CLOSED_STATUSES:
+            after["resolved_at"] = min(before.get("resolved_at") or now, now)
+        else:
+            after.pop("resolved_at", None)
+        return after
     
-    def update_complaint_status(self, complaint_id: str, status: str) -> Optional[Complaint]:
-        result = self.complaints.find_one_and_update(
-            {"complaint_id": complaint_id},
-            {"$set": {"status": status, "updated_at": datetime.now()}},
-            return_document=True
+    @traced("db.update_complaint_status")
+    def update_complaint_status(self, complaint_id: str, status: str,
+                                expected_version: Optional[int] = None) -> Optional[Complaint]:
+        """Move a complaint to ``status`` if STATUS_TRANSITIONS allows it.
+
+        With ``expected_version`` the update only applies if nobody changed the
+        complaint since it was read at that version. Returns None for an
+        unknown ID; raises StatusTransitionError or VersionConflict otherwise.
+        """
+        query: Dict[str, Any] = {"complaint_id": complaint_id, "status": {"$in": source_statuses(status)}}
+        if expected_version is not None:
+            query.update(version_filter(expected_version))
+        now = mongo_now()
+        # The previous document tells listeners which status the complaint left
+        before = self.complaints.find_one_and_update(
+            query, self._status_update(status, now), return_document=False
         )
-        if result:
-            return Complaint(**result)
-        return None
+        if before is None:
+            current = self.complaints.find_one({"complaint_id": complaint_id})
+            if current is None:
+                if self.cache is not None:
+                    self.cache.delete(complaint_id)
+                return None
+            raise self._rejection(Complaint(**current), status, expected_version)
+        after = self._after_status_change(before, status, now)
+        complaint = Complaint(**after)
+        if self.cache is not None:
+            self.cache.set(complaint_id, complaint)
+        self._notify("on_status_changed", [(before, after)])
+        return complaint
+    
+    def _rejection(self, current: Complaint, status: str, expected_version: Optional[int]) -> Exception:
+        if expected_version is not None and current.version != expected_version:
+            return VersionConflict(current, expected_version)
+        if status not in STATUS_TRANSITIONS.get(current.status, ()):
+            return StatusTransitionError(
+                f"Complaint {current.complaint_id} cannot move from {current.status} to {status}"
+            )
+        # Another update landed between ours and this read
+        return VersionConflict(current, expected_version)
+    
+    @traced("db.bulk_update_status")
+    def bulk_update_status(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply many {complaint_id, status, expected_version} changes with one bulk_write.
+
+        The current documents are read in one query and every change is
+        checked against them; each write is then conditional on the status
+        and version that were read, so a concurrent update makes that item
+        fail with version_conflict instead of being overwritten. Returns one
+        result per update, in order.
+        """
+        complaint_ids = [update["complaint_id"] for update in updates]
+        current = {
+            document["complaint_id"]: document
+            for document in self.complaints.find({"complaint_id": {"$in": complaint_ids}})
+        }
+        now = mongo_now()
+        results: List[Dict[str, Any]] = []
+        operations, pending, seen = [], [], set()
+        for index, update in enumerate(updates):
+            complaint_id, status = update["complaint_id"], update["status"]
+            expected_version = update.get("expected_version")
+            before = current.get(complaint_id)
+            result: Dict[str, Any] = {"complaint_id": complaint_id, "ok": False}
+            results.append(result)
+            if before is None:
+                result["error"] = "not_found"
+                continue
+            version = before.get("version", 0)
+            result.update(status=before["status"], version=version)
+            if complaint_id in seen:
+                result["error"] = "duplicate_in_batch"
+            elif status not in STATUS_TRANSITIONS:
+                result["error"] = "unknown_status"
+            elif expected_version is not None and expected_version != version:
+                result["error"] = "version_conflict"
+            elif status not in STATUS_TRANSITIONS[before["status"]]:
+                result["error"] = "invalid_transition"
+            else:
+                operations.append(UpdateOne(
+                    {"complaint_id": complaint_id, "status": before["status"], **version_filter(version)},
+                    self._status_update(status, now)
+                ))
+                pending.append((index, before, status))
+            seen.add(complaint_id)
+        if not operations:
+            return results
+        
+        written = self.complaints.bulk_write(operations, ordered=False)
+        targets = {before["complaint_id"]: (status, before.get("version", 0) + 1) for _, before, status in pending}
+        applied = set(targets)
+        if written.matched_count < len(operations):
+            # Lost races: keep only the documents that now carry this batch's write
+            applied = {
+                document["complaint_id"]
+                for document in self.complaints.find(
+                    {"complaint_id": {"$in": list(targets)}, "updated_at": now},
+                    {"complaint_id": 1, "status": 1, "version": 1}
+                )
+                if (document["status"], document.get("version")) == targets[document["complaint_id"]]
+            }
+        changes = []
+        for index, before, status in pending:
+            result = results[index]
+            if before["complaint_id"] not in applied:
+                result["error"] = "version_conflict"
+                continue
+            after = self._after_status_change(before, status, now)
+            result.update(ok=True, status=status, version=after["version"])
+            changes.append((before, after))
+            if self.cache is not None:
+                self.cache.delete(before["complaint_id"])
+        self._notify("on_status_changed", changes)
+        return results
+    
+    @traced("db.get_complaint_summaries")
+    def get_complaint_summaries(self, complaint_ids: List[str]) -> List[ComplaintSummary]:
+        """Summaries for the given IDs, in the order given; unknown IDs are skipped"""
+        documents = {
+            document["complaint_id"]: document
+            for document in self.complaints.find({"complaint_id": {"$in": complaint_ids}}, SUMMARY_PROJECTION)
+        }
+        return [ComplaintSummary(**documents[cid]) for cid in complaint_ids if cid in documents]
+    
+    @traced("db.find_unclassified")
+    def find_unclassified(self, after: Optional[ObjectId] = None,
+                          limit: int = 1000) -> List[Dict[str, Any]]:
+        """Next batch of complaints without a category, in _id order"""
+        query: Dict[str, Any] = {"category": None}
+        if after is not None:
+            query["_id"] = {"$gt": after}
+        cursor = (
+            self.complaints.find(query, {"complaint_id": 1, "complaint_details": 1})
+            .sort("_id", 1)
+            .limit(limit)
+        )
+        return list(cursor)
+    
+    @traced("db.set_classifications")
+    def set_classifications(self, documents: List[Dict[str, Any]]) -> int:
+        """Write category/priority for documents from find_unclassified"""
+        if not documents:
+            return 0
+        now = mongo_now()
+        result = self.complaints.bulk_write([
+            UpdateOne(
+                {"_id": document["_id"], "category": None},
+                {"$set": {"category": document["category"], "priority": document["priority"],
+                          "updated_at": now}}
+            )
+            for document in documents
+        ], ordered=False)
+        if self.cache is not None:
+            for document in documents:
+                self.cache.delete(document["complaint_id"])
+        self._notify("on_complaints_classified", documents)
+        return result.modified_count
+    
+    @traced("db.record_audit_event")
+    def record_audit_event(self, complaint_id: str, event: str,
+                           details: Optional[Dict[str, Any]] = None):
+        self.audit_log.insert_one({
+            "complaint_id": complaint_id,
+            "event": event,
+            "details": details or {},
+            "at": datetime.now()
+        })
+    
+    @traced("db.get_stats")
+    def get_stats(self, days: int = 30) -> Optional[Dict[str, Any]]:
+        """Complaint counts and resolution times from the rollups (None when disabled)"""
+        if self.stats is None:
+            return None
+        return self.stats.read(days)
+    
+    def stats_rebuild_started(self) -> Optional[datetime]:
+        """Start of the rollup rebuild now in progress, or None (also when rollups are disabled)"""
+        if self.stats is None:
+            return None
+        return self.stats.rebuild_started()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, "backend": type(self.cache).__name__, **self.cache.stats.as_dict()}
+    
+    def ping(self):
+        """One round trip to the server; raises if it cannot be reached"""
+        self.client.admin.command('ping')
+
+    def close(self):
+        self.client.close()
+
+class AsyncDatabase:
+    """Async wrapper around Database.
+
+    pymongo is synchronous, so each call runs on a dedicated thread pool and
+    concurrent requests overlap their round trips instead of stalling the
+    event loop one query at a time.
+    """
+
+    def __init__(self, database: Database, max_workers: Optional[int] = None):
+        self.database = database
+        if max_workers is None:
+            max_workers = int(os.getenv("DB_THREADPOOL_SIZE", "32"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="mongo"
+        )
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        # run_in_executor does not carry contextvars over; copy them so spans nest under the request
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(context.run, func, *args, **kwargs)
+        )
+
+    async def ping(self):
+        await self._run(self.database.ping)
+
+    async def create_complaint(self, complaint_data: Dict[str, Any]) -> Complaint:
+        return await self._run(self.database.create_complaint, complaint_data)
+
+    async def create_complaints_bulk(self, complaints_data: List[Dict[str, Any]]) -> List[Optional[str]]:
+        return await self._run(self.database.create_complaints_bulk, complaints_data)
+
+    async def get_complaint_by_id(self, complaint_id: str) -> Optional[Complaint]:
+        return await self._run(self.database.get_complaint_by_id, complaint_id)
+
+    async def get_complaints_by_mobile(self, mobile: str, limit: int = DEFAULT_PAGE_SIZE,
+                                       after: Optional[str] = None) -> ComplaintPage:
+        return await self._run(self.database.get_complaints_by_mobile, mobile, limit, after)
+
+    async def get_status_fields(self, complaint_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run(self.database.get_status_fields, complaint_id)
+
+    async def get_summary_documents_by_mobile(self, mobile: str, limit: int = DEFAULT_PAGE_SIZE,
+                                              after: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return await self._run(self.database.get_summary_documents_by_mobile, mobile, limit, after)
+
+    async def update_complaint_status(self, complaint_id: str, status: str,
+                                      expected_version: Optional[int] = None) -> Optional[Complaint]:
+        return await self._run(self.database.update_complaint_status, complaint_id, status, expected_version)
+    
+    async def bulk_update_status(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self._run(self.database.bulk_update_status, updates)
+
+    async def find_unclassified(self, after: Optional[ObjectId] = None,
+                                limit: int = 1000) -> List[Dict[str, Any]]:
+        return await self._run(self.database.find_unclassified, after, limit)
+
+    async def set_classifications(self, documents: List[Dict[str, Any]]) -> int:
+        return await self._run(self.database.set_classifications, documents)
+
+    async def record_audit_event(self, complaint_id: str, event: str,
+                                 details: Optional[Dict[str, Any]] = None):
+        return await self._run(self.database.record_audit_event, complaint_id, event, details)
+
+    async def get_stats(self, days: int = 30) -> Optional[Dict[str, Any]]:
+        return await self._run(self.database.get_stats, days)
     
-    def __del__(self):
-        """Close MongoDB connection when object is destroyed"""
-        if hasattr(self, 'client'):
-            self.client.close()
\ No newline at end of file
+    async def stats_rebuild_started(self) -> Optional[datetime]:
+        return await self._run(self.database.stats_rebuild_started)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        # Counters live in process memory, no need for the thread pool
+        return self.database.cache_stats()
+
+    def close(self):
+        """Stop the worker threads; the underlying client is closed by Database.close"""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,109 @@
+from typing import Optional
+import os
+import random
+import secrets
+import string
+import threading
+import time
+
+ID_PREFIX = "CMP-"
+
+# Crockford base32: no I, L, O or U, so IDs survive being read out over the phone
+CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+def encode_base32(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        value, digit = divmod(value, 32)
+        chars.append(CROCKFORD_ALPHABET[digit])
+    return "".join(reversed(chars))
+
+class RandomIdGenerator:
+    """Legacy generator: 8 random characters, scattered across the index"""
+
+    def generate(self) -> str:
+        return f"{ID_PREFIX}{''.join(random.choices(string.ascii_uppercase + string.digits, k=8))}"
+
+class TimeOrderedIdGenerator:
+    """ULID-style IDs: a millisecond timestamp followed by random bits.
+
+    IDs sort by creation time, so new complaints land at the right-hand edge
+    of the complaint_id index instead of splitting pages all over it. Within
+    one millisecond the random part is incremented, keeping IDs from this
+    process strictly increasing.
+    """
+
+    TIME_CHARS = 10
+    RANDOM_CHARS = 6
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def generate(self) -> str:
+        random_limit = 32 ** self.RANDOM_CHARS
+        with self._lock:
+            now_ms = max(int(time.time() * 1000), self._last_ms)
+            if now_ms == self._last_ms and self._last_random + 1 < random_limit:
+                self._last_random += 1
+            else:
+                if now_ms == self._last_ms:
+                    # Random space for this millisecond is exhausted, borrow the next one
+                    now_ms += 1
+                # Leave headroom so the increment above rarely overflows
+                self._last_random = secrets.randbelow(random_limit // 2)
+            self._last_ms = now_ms
+            return (f"{ID_PREFIX}{encode_base32(now_ms, self.TIME_CHARS)}"
+                    f"{encode_base32(self._last_random, self.RANDOM_CHARS)}")
+
+class SequenceIdGenerator:
+    """Sequential IDs handed out from blocks reserved in a counters collection.
+
+    Each process reserves ``block_size`` numbers with a single atomic $inc,
+    so only one round trip in every block_size IDs touches the counter.
+    """
+
+    COUNTER_ID = "complaint_id"
+    ID_CHARS = 8
+
+    def __init__(self, counters, block_size: int = 1000):
+        self.counters = counters
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def _reserve_block(self):
+        counter = self.counters.find_one_and_update(
+            {"_id": self.COUNTER_ID},
+            {"$inc": {"value": self.block_size}},
+            upsert=True,
+            return_document=True
+        )
+        self._end = counter["value"] + 1
+        self._next = self._end - self.block_size
+
+    def generate(self) -> str:
+        with self._lock:
+            if self._next >= self._end:
+                self._reserve_block()
+            value = self._next
+            self._next += 1
+        return f"{ID_PREFIX}{encode_base32(value, self.ID_CHARS)}"
+
+def create_id_generator(strategy: Optional[str] = None, db=None):
+    """Build the generator selected by COMPLAINT_ID_STRATEGY (time, sequence or random)"""
+    strategy = (strategy or os.getenv("COMPLAINT_ID_STRATEGY", "time")).lower()
+    if strategy == "time":
+        return TimeOrderedIdGenerator()
+    if strategy == "sequence":
+        if db is None:
+            raise ValueError("The sequence ID strategy needs a database for its counters")
+        return SequenceIdGenerator(
+            db.counters,
+            block_size=int(os.getenv("COMPLAINT_ID_BLOCK_SIZE", "1000"))
+        )
+    if strategy == "random":
+        return RandomIdGenerator()
+    raise ValueError(f"Unknown COMPLAINT_ID_STRATEGY: {strategy}")
@@ -0,0 +1,49 @@
+"""Create the MongoDB indexes the API relies on.
+
+Run once per deploy, before starting the API workers, so that worker
+startup only connects instead of issuing index builds:
+
+    python -m backend.database.migrate
+    python -m backend.database.migrate --check   # exit 1 if indexes are missing
+"""
+import argparse
+import os
+import sys
+from backend.database.database import Database
+from backend.dedup.detector import DuplicateDetector
+from backend.jobs.queue import MongoJobStore
+from backend.search.engines import MongoTextSearch
+
+def ensure_indexes(database: Database):
+    database.ensure_indexes()
+    DuplicateDetector(database).ensure_indexes()
+    MongoJobStore(database.db.jobs).ensure_indexes()
+    # Only one text index is allowed per collection, and it is costly to maintain
+    if os.getenv("SEARCH_BACKEND", "text").lower() == "text":
+        MongoTextSearch(database).ensure_indexes()
+
+def has_indexes(database: Database) -> bool:
+    """Cheap startup check for the unique complaint_id index that complaint creation depends on"""
+    return "complaint_id_1" in database.complaints.index_information()
+
+def main():
+    parser = argparse.ArgumentParser(description="Create the MongoDB indexes the API relies on")
+    parser.add_argument("--check", action="store_true", help="Only report whether the indexes exist")
+    args = parser.parse_args()
+
+    database = Database()
+    try:
+        if args.check:
+            if not has_indexes(database):
+                print("Indexes are missing; run python -m backend.database.migrate")
+                sys.exit(1)
+            print("Indexes are in place")
+            return
+        ensure_indexes(database)
+        for name in sorted(database.complaints.index_information()):
+            print(f"complaints.{name}")
+    finally:
+        database.close()
+
+if __name__ == "__main__":
+    main()
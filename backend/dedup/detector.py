@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import asyncio
+import os
+from bson import Binary
+from backend.database.database import CLOSED_STATUSES, mongo_now
+from backend.dedup.minhash import MinHasher, extract_locality
+
+# Estimated Jaccard similarity above which two complaints count as the same grievance
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.5"))
+# Only complaints filed this recently are matched
+DUPLICATE_WINDOW_DAYS = float(os.getenv("DUPLICATE_WINDOW_DAYS", "30"))
+# Follow-ups kept on a complaint; older ones are dropped, repeat_reports still counts them
+MAX_FOLLOWUPS = int(os.getenv("MAX_FOLLOWUPS", "20"))
+
+CANDIDATE_PROJECTION = {"complaint_id": 1, "mobile": 1, "locality": 1, "minhash": 1, "lsh_bands": 1}
+
+class DuplicateDetector:
+    """Finds open complaints from the same mobile that say the same thing.
+
+    ``fingerprint`` stores a MinHash signature, its LSH band keys and the
+    locality on each new document. A lookup is then one index range on
+    (mobile, lsh_bands, created_at) followed by comparing a handful of
+    signatures; complaints naming different localities never match.
+    """
+
+    def __init__(self, database, hasher: Optional[MinHasher] = None,
+                 threshold: float = DUPLICATE_THRESHOLD, window_days: float = DUPLICATE_WINDOW_DAYS):
+        self.database = database
+        self.hasher = hasher or MinHasher()
+        self.threshold = threshold
+        self.window = timedelta(days=window_days)
+
+    def ensure_indexes(self):
+        self.database.complaints.create_index([("mobile", 1), ("lsh_bands", 1), ("created_at", -1)])
+
+    def fingerprint(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Add minhash, lsh_bands and locality to a complaint document in place"""
+        signature = self.hasher.signature(document["complaint_details"])
+        document["minhash"] = Binary(MinHasher.to_bytes(signature))
+        document["lsh_bands"] = self.hasher.bands(signature)
+        if not document.get("locality"):
+            document["locality"] = extract_locality(document["complaint_details"])
+        return document
+
+    def _is_match(self, document: Dict[str, Any], candidate: Dict[str, Any]) -> bool:
+        if document.get("locality") and candidate.get("locality") \
+                and document["locality"] != candidate["locality"]:
+            return False
+        similarity = MinHasher.similarity(
+            MinHasher.from_bytes(document["minhash"]), MinHasher.from_bytes(candidate["minhash"])
+        )
+        return similarity >= self.threshold
+
+    def _candidates(self, mobiles: List[str], bands: List[int]) -> List[Dict[str, Any]]:
+        return list(self.database.complaints.find({
+            "mobile": {"$in": mobiles},
+            "lsh_bands": {"$in": bands},
+            "created_at": {"$gte": datetime.now() - self.window},
+            # A repeat of a closed complaint is a new grievance
+            "status": {"$nin": list(CLOSED_STATUSES)},
+        }, CANDIDATE_PROJECTION).sort("created_at", -1))
+
+    def find_duplicate(self, document: Dict[str, Any]) -> Optional[str]:
+        """complaint_id of a recent open complaint this fingerprinted document repeats"""
+        for candidate in self._candidates([document["mobile"]], document["lsh_bands"]):
+            if self._is_match(document, candidate):
+                return candidate["complaint_id"]
+        return None
+
+    def find_duplicates(self, documents: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """find_duplicate for a fingerprinted batch, with one query for all of it.
+
+        Only stored complaints are matched; repeats within the batch itself
+        are left alone.
+        """
+        if not documents:
+            return []
+        bands = sorted({band for document in documents for band in document["lsh_bands"]})
+        mobiles = sorted({document["mobile"] for document in documents})
+        by_mobile: Dict[str, List[Dict[str, Any]]] = {}
+        for candidate in self._candidates(mobiles, bands):
+            by_mobile.setdefault(candidate["mobile"], []).append(candidate)
+
+        results: List[Optional[str]] = []
+        for document in documents:
+            shared = set(document["lsh_bands"])
+            results.append(next((
+                candidate["complaint_id"] for candidate in by_mobile.get(document["mobile"], [])
+                if shared.intersection(candidate["lsh_bands"]) and self._is_match(document, candidate)
+            ), None))
+        return results
+
+    def record_repeat(self, complaint_id: str, document: Dict[str, Any]):
+        """Add a repeat filing to the original's followups instead of storing it as a complaint"""
+        now = mongo_now()
+        followup = {"details": document["complaint_details"], "reported_at": now}
+        self.database.complaints.update_one(
+            {"complaint_id": complaint_id},
+            {
+                "$inc": {"repeat_reports": 1},
+                "$set": {"last_reported_at": now},
+                "$push": {"followups": {"$each": [followup], "$slice": -MAX_FOLLOWUPS}},
+            }
+        )
+
+    def check(self, document: Dict[str, Any]) -> Optional[str]:
+        """Fingerprint a new complaint; if it repeats an open one, count the repeat and return that ID"""
+        self.fingerprint(document)
+        duplicate_of = self.find_duplicate(document)
+        if duplicate_of is not None:
+            self.record_repeat(duplicate_of, document)
+        return duplicate_of
+
+    def check_batch(self, documents: List[Dict[str, Any]]) -> List[Optional[str]]:
+        for document in documents:
+            self.fingerprint(document)
+        duplicates = self.find_duplicates(documents)
+        for document, duplicate_of in zip(documents, duplicates):
+            if duplicate_of is not None:
+                self.record_repeat(duplicate_of, document)
+        return duplicates
+
+    async def acheck(self, document: Dict[str, Any]) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.check, document)
+
+    async def acheck_batch(self, documents: List[Dict[str, Any]]) -> List[Optional[str]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.check_batch, documents)
+
+def create_duplicate_detector(database) -> Optional[DuplicateDetector]:
+    """DUPLICATE_DETECTION=on (default) or off"""
+    if os.getenv("DUPLICATE_DETECTION", "on").lower() in ("off", "false", "0"):
+        return None
+    return DuplicateDetector(database)
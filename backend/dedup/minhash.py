@@ -0,0 +1,85 @@
+from typing import List, Optional
+import hashlib
+import re
+import zlib
+import numpy as np
+
+NUM_PERMUTATIONS = 64
+# 16 bands of 4 rows: pairs above ~0.5 Jaccard usually share a band
+NUM_BANDS = 16
+SHINGLE_SIZE = 4
+
+# Prime just above 2**32, so (a * x + b) stays inside uint64 for 32-bit x
+_PRIME = np.uint64(4294967311)
+
+NUMBER_WORDS = {
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6",
+    "seven": "7", "eight": "8", "nine": "9", "ten": "10",
+}
+
+LOCALITY_PATTERN = re.compile(
+    r"\b(sector|ward|block|phase|lane|street|colony|village|gali)\s*(?:no\.?\s*)?(\d+[a-z]?)\b"
+)
+PINCODE_PATTERN = re.compile(r"(?<!\d)(\d{6})(?!\d)")
+
+def normalize(text: str) -> str:
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return " ".join(NUMBER_WORDS.get(word, word) for word in words)
+
+def extract_locality(text: str) -> Optional[str]:
+    """A 'sector 14' / 'ward 3' style locality or a pincode mentioned in the text"""
+    lowered = text.lower()
+    match = LOCALITY_PATTERN.search(lowered)
+    if match:
+        return f"{match.group(1)} {match.group(2)}"
+    match = PINCODE_PATTERN.search(lowered)
+    return match.group(1) if match else None
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[int]:
+    """32-bit hashes of the character shingles of the normalized text"""
+    normalized = normalize(text)
+    if len(normalized) <= size:
+        return [zlib.crc32(normalized.encode())]
+    return list({zlib.crc32(normalized[i:i + size].encode()) for i in range(len(normalized) - size + 1)})
+
+class MinHasher:
+    """MinHash signatures and LSH band keys for short texts.
+
+    The fraction of equal positions in two signatures estimates the Jaccard
+    similarity of the texts' shingle sets. Band keys hash NUM_BANDS slices
+    of the signature, so similar texts very likely share at least one key
+    and candidates can be found with an index lookup instead of a scan.
+    """
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, num_bands: int = NUM_BANDS, seed: int = 1):
+        if num_permutations % num_bands:
+            raise ValueError("num_permutations must be a multiple of num_bands")
+        rng = np.random.RandomState(seed)
+        self.num_bands = num_bands
+        self.rows = num_permutations // num_bands
+        self._a = rng.randint(1, 2 ** 32, size=num_permutations, dtype=np.uint64)[:, None]
+        self._b = rng.randint(0, 2 ** 32, size=num_permutations, dtype=np.uint64)[:, None]
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.array(shingles(text), dtype=np.uint64)[None, :]
+        return ((self._a * hashes + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def bands(self, signature: np.ndarray) -> List[int]:
+        keys = []
+        for band in range(self.num_bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8, person=band.to_bytes(16, "little")).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        return float(np.count_nonzero(first == second)) / len(first)
+
+    @staticmethod
+    def to_bytes(signature: np.ndarray) -> bytes:
+        return signature.astype("<u4").tobytes()
+
+    @staticmethod
+    def from_bytes(data: bytes) -> np.ndarray:
+        return np.frombuffer(data, dtype="<u4")
@@ -0,0 +1,158 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+import asyncio
+import json
+import os
+
+# Open subscriptions per API process; more are refused with 503
+MAX_STATUS_SUBSCRIBERS = int(os.getenv("MAX_STATUS_SUBSCRIBERS", "10000"))
+# Undelivered events kept per subscriber; a slow client loses the oldest first
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("SUBSCRIBER_QUEUE_SIZE", "16"))
+# Comment lines sent to idle streams so proxies keep them open and dead clients are noticed
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+# Queued to idle streams to make them send a keepalive comment
+HEARTBEAT = None
+
+class TooManySubscribers(Exception):
+    """MAX_STATUS_SUBSCRIBERS streams are already open in this process"""
+
+# Fields of a complaint pushed to subscribers, the same ones /api/complaint_status returns
+STATUS_EVENT_FIELDS = ("complaint_id", "status", "category", "priority", "created_at", "updated_at", "version")
+# Used by the broker to route events to per-mobile subscribers, never sent: anyone who knows a
+# complaint ID can subscribe to it, and must not learn the complainant's phone number
+ROUTING_FIELDS = ("mobile",)
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def status_event(document: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of a complaint document pushed to subscribers, plus its routing fields"""
+    event = {field: _json_value(document.get(field)) for field in STATUS_EVENT_FIELDS}
+    event["version"] = event["version"] or 0
+    for field in ROUTING_FIELDS:
+        event[field] = document.get(field)
+    return event
+
+def format_sse(event: Dict[str, Any]) -> str:
+    public = {key: value for key, value in event.items() if key not in ROUTING_FIELDS}
+    # Clients compare (complaint_id, version) to drop the odd repeat
+    return (f"id: {event['complaint_id']}:{event['version']}\n"
+            f"event: status\ndata: {json.dumps(public)}\n\n")
+
+class Subscription:
+    __slots__ = ("complaint_ids", "mobiles", "queue", "dropped")
+
+    def __init__(self, complaint_ids: List[str], mobiles: List[str], queue_size: int):
+        self.complaint_ids = complaint_ids
+        self.mobiles = mobiles
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, event: Dict[str, Any]):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+class StatusBroker:
+    """Fans status changes out to the subscribers of each complaint ID or mobile.
+
+    Everything but ``publish`` runs on the event loop. ``publish`` may be
+    called from any thread (pymongo writes run in an executor, change streams
+    on their own thread) and hands the events to the loop. Each subscriber
+    holds at most SUBSCRIBER_QUEUE_SIZE events, so an idle or stalled client
+    costs a fixed amount of memory however many updates arrive.
+    """
+
+    def __init__(self, max_subscribers: int = MAX_STATUS_SUBSCRIBERS,
+                 queue_size: int = SUBSCRIBER_QUEUE_SIZE, heartbeat: float = SSE_HEARTBEAT_SECONDS):
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.by_complaint: Dict[str, Set[Subscription]] = {}
+        self.by_mobile: Dict[str, Set[Subscription]] = {}
+        self.subscribers = 0
+        self.published = 0
+        self.delivered = 0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heartbeats: Optional[asyncio.Task] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Attach to the running loop and start the heartbeat task"""
+        self.loop = loop
+        self._heartbeats = loop.create_task(self._send_heartbeats())
+
+    def close(self):
+        if self._heartbeats is not None:
+            self._heartbeats.cancel()
+
+    async def _send_heartbeats(self):
+        # One timer for all streams; a per-stream wait_for would allocate a task and a timer per event
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            for subscribers in list(self.by_complaint.values()) + list(self.by_mobile.values()):
+                for subscription in subscribers:
+                    if subscription.queue.empty():
+                        subscription.queue.put_nowait(HEARTBEAT)
+
+    def subscribe(self, complaint_ids: Iterable[str] = (), mobiles: Iterable[str] = ()) -> Subscription:
+        if self.subscribers >= self.max_subscribers:
+            raise TooManySubscribers(f"{self.subscribers} status streams already open")
+        subscription = Subscription(sorted(set(complaint_ids)), sorted(set(mobiles)), self.queue_size)
+        for complaint_id in subscription.complaint_ids:
+            self.by_complaint.setdefault(complaint_id, set()).add(subscription)
+        for mobile in subscription.mobiles:
+            self.by_mobile.setdefault(mobile, set()).add(subscription)
+        self.subscribers += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for index, keys in ((self.by_complaint, subscription.complaint_ids), (self.by_mobile, subscription.mobiles)):
+            for key in keys:
+                subscribers = index.get(key)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del index[key]
+        self.subscribers -= 1
+
+    def publish(self, events: List[Dict[str, Any]]):
+        if self.loop is None or not events:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._dispatch(events)
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._dispatch, events)
+
+    def _dispatch(self, events: List[Dict[str, Any]]):
+        for event in events:
+            self.published += 1
+            targets = self.by_complaint.get(event["complaint_id"], set()) | self.by_mobile.get(event["mobile"], set())
+            for subscription in targets:
+                subscription.offer(event)
+                self.delivered += 1
+
+    def on_status_changed(self, changes):
+        """Database listener, for the in-process feed"""
+        self.publish([status_event(after) for _, after in changes])
+
+    def stats(self) -> Dict[str, Any]:
+        return {"subscribers": self.subscribers, "published": self.published, "delivered": self.delivered}
+
+    async def stream(self, subscription: Subscription,
+                     initial: List[Dict[str, Any]] = ()) -> AsyncIterator[str]:
+        """Server-Sent Events for a subscription; unsubscribes when the client goes away"""
+        try:
+            yield f"retry: {int(self.heartbeat * 1000)}\n\n"
+            for event in initial:
+                yield format_sse(event)
+            while True:
+                event = await subscription.queue.get()
+                yield ": keepalive\n\n" if event is HEARTBEAT else format_sse(event)
+        finally:
+            self.unsubscribe(subscription)
@@ -0,0 +1,80 @@
+from typing import Optional
+import os
+import threading
+from pymongo.errors import PyMongoError
+from backend.events.broker import ROUTING_FIELDS, STATUS_EVENT_FIELDS, StatusBroker, status_event
+
+# Only status changes, trimmed to the fields subscribers get
+CHANGE_STREAM_PIPELINE = [
+    {"$match": {"operationType": "update", "updateDescription.updatedFields.status": {"$exists": True}}},
+    {"$project": {f"fullDocument.{field}": 1 for field in STATUS_EVENT_FIELDS + ROUTING_FIELDS}},
+]
+
+def supports_change_streams(client) -> bool:
+    """Change streams need a replica set or a sharded cluster (Atlas always is one)"""
+    try:
+        hello = client.admin.command("hello")
+    except Exception:
+        return False
+    return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+class ChangeStreamFeed:
+    """Publishes status changes made by any process, read from a change stream on complaints.
+
+    Runs on its own thread and resumes from the last seen event after an
+    error, backing off up to a minute between attempts.
+    """
+
+    def __init__(self, collection, broker: StatusBroker):
+        self.collection = collection
+        self.broker = broker
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="status-change-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        resume_token = None
+        delay = 1.0
+        while not self._stop.is_set():
+            try:
+                with self.collection.watch(CHANGE_STREAM_PIPELINE, full_document="updateLookup",
+                                           resume_after=resume_token, max_await_time_ms=1000) as stream:
+                    delay = 1.0
+                    while not self._stop.is_set() and stream.alive:
+                        change = stream.try_next()
+                        if change is None:
+                            continue
+                        resume_token = stream.resume_token
+                        document = change.get("fullDocument")
+                        # None if the complaint was deleted before the lookup
+                        if document and "status" in document:
+                            self.broker.publish([status_event(document)])
+            except PyMongoError as e:
+                print(f"Warning: Status change stream failed, retrying in {delay:.0f}s: {e}")
+                self._stop.wait(delay)
+                delay = min(delay * 2, 60.0)
+
+def create_status_feed(database, broker: StatusBroker) -> Optional[ChangeStreamFeed]:
+    """STATUS_EVENTS_SOURCE=auto (default), change_stream, local or none.
+
+    ``auto`` uses a change stream when the deployment supports one and
+    otherwise publishes the status changes made through this process's
+    Database. Returns the feed to start, or None.
+    """
+    source = os.getenv("STATUS_EVENTS_SOURCE", "auto").lower()
+    if source == "none":
+        return None
+    if source in ("auto", "change_stream"):
+        if supports_change_streams(database.client):
+            return ChangeStreamFeed(database.complaints, broker)
+        if source == "change_stream":
+            print("Warning: MongoDB deployment has no change streams; publishing local status changes only")
+    database.add_listener(broker)
+    return None
@@ -0,0 +1,81 @@
+from typing import Any, Dict
+import asyncio
+import os
+from bson import ObjectId
+from backend.classification.classifier import aclassify_documents
+from backend.jobs.queue import JobQueue
+
+# Complaints classified per backfill job; each job enqueues the next batch
+CLASSIFY_BACKFILL_BATCH_SIZE = int(os.getenv("CLASSIFY_BACKFILL_BATCH_SIZE", "1000"))
+
+# A full rollup rebuild scans every complaint, so it gets longer than JOB_TIMEOUT
+# (MongoJobStore renews the job's lease while it runs)
+STATS_REBUILD_TIMEOUT = float(os.getenv("STATS_REBUILD_TIMEOUT", "600"))
+
+# Follow-up work for a newly registered complaint, run after the API has replied
+REGISTRATION_JOBS = ("audit_complaint", "acknowledge_complaint")
+
+class LogNotifier:
+    """Prints acknowledgements; swap in an SMS or email gateway with the same send()"""
+
+    async def send(self, mobile: str, message: str):
+        print(f"Acknowledgement to {mobile}: {message}")
+
+def acknowledgement_message(payload: Dict[str, Any]) -> str:
+    return (f"Dear {payload['name']}, your complaint {payload['complaint_id']} has been "
+            f"registered. We will keep you updated on its progress.")
+
+def register_complaint_handlers(queue: JobQueue, db, notifier=None):
+    """Attach the registration follow-up handlers; ``db`` is an AsyncDatabase"""
+    notifier = notifier or LogNotifier()
+
+    async def audit_complaint(payload: Dict[str, Any]):
+        await db.record_audit_event(payload["complaint_id"], "registered", {"mobile": payload["mobile"]})
+
+    async def acknowledge_complaint(payload: Dict[str, Any]):
+        await notifier.send(payload["mobile"], acknowledgement_message(payload))
+
+    queue.register("audit_complaint", audit_complaint)
+    queue.register("acknowledge_complaint", acknowledge_complaint)
+
+async def enqueue_registration_jobs(queue: JobQueue, complaint):
+    payload = {"complaint_id": complaint.complaint_id, "name": complaint.name, "mobile": complaint.mobile}
+    for kind in REGISTRATION_JOBS:
+        await queue.enqueue(kind, payload)
+
+def register_classification_handlers(queue: JobQueue, db, classifier=None):
+    """Attach the category/priority backfill for complaints stored before classification"""
+
+    async def backfill_categories(payload: Dict[str, Any]):
+        after = ObjectId(payload["after"]) if payload.get("after") else None
+        batch_size = payload.get("batch_size", CLASSIFY_BACKFILL_BATCH_SIZE)
+        documents = await db.find_unclassified(after, batch_size)
+        if not documents:
+            return
+        await aclassify_documents(documents, classifier)
+        await db.set_classifications(documents)
+        if len(documents) == batch_size:
+            # Short jobs keep each one well inside JOB_TIMEOUT and make retries cheap
+            await queue.enqueue("backfill_categories",
+                                {"after": str(documents[-1]["_id"]), "batch_size": batch_size})
+
+    queue.register("backfill_categories", backfill_categories)
+
+def register_stats_handlers(queue: JobQueue, database):
+    """Attach the rollup rebuild; ``database`` is the synchronous Database"""
+
+    async def rebuild_stats(payload: Dict[str, Any]):
+        if database.stats is None:
+            return
+        loop = asyncio.get_running_loop()
+        # A retry of a timed-out attempt, or a second request, while a rebuild still runs has
+        # nothing to add: the running rebuild also counts the writes made meanwhile
+        running_since = await loop.run_in_executor(None, database.stats.rebuild_started)
+        if running_since is not None:
+            print(f"Skipping stats rebuild: one has been running since {running_since}")
+            return
+        result = await loop.run_in_executor(None, database.stats.rebuild)
+        print(f"Rebuilt stats rollups from {result['complaints']} complaints over {result['days']} days, "
+              f"{result['journaled']} writes journaled meanwhile")
+
+    queue.register("rebuild_stats", rebuild_stats, timeout=STATS_REBUILD_TIMEOUT)
@@ -0,0 +1,345 @@
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+import asyncio
+import concurrent.futures
+import functools
+import heapq
+import itertools
+import os
+import threading
+import time
+import uuid
+from pydantic import BaseModel, Field
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+# Seconds before the first retry; doubled on every further attempt
+JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", "2"))
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "30"))
+# How often idle workers look for jobs enqueued by other processes
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+
+# Latency samples kept for the percentile metrics
+METRICS_WINDOW = 1000
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+class Job(BaseModel):
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    kind: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    status: str = "queued"  # queued, running, done or dead
+    attempts: int = 0
+    max_attempts: int = JOB_MAX_ATTEMPTS
+    enqueued_at: datetime = Field(default_factory=datetime.now)
+    run_at: datetime = Field(default_factory=datetime.now)
+    last_error: Optional[str] = None
+
+class InMemoryJobStore:
+    """Process-local store; jobs still queued at shutdown are lost"""
+
+    # Nothing else can claim a running job, so there is no lease to renew
+    heartbeat_interval: Optional[float] = None
+
+    def __init__(self):
+        self._ready: List[tuple] = []
+        self._order = itertools.count()
+        self.dead: Deque[Job] = deque(maxlen=METRICS_WINDOW)
+
+    async def push(self, job: Job):
+        heapq.heappush(self._ready, (job.run_at, next(self._order), job))
+
+    async def claim(self) -> Optional[Job]:
+        if not self._ready or self._ready[0][0] > datetime.now():
+            return None
+        job = heapq.heappop(self._ready)[2]
+        job.status = "running"
+        job.attempts += 1
+        return job
+
+    async def renew(self, job: Job) -> bool:
+        return True
+
+    async def complete(self, job: Job):
+        job.status = "done"
+
+    async def retry(self, job: Job, run_at: datetime, error: str):
+        job.status, job.run_at, job.last_error = "queued", run_at, error
+        await self.push(job)
+
+    async def dead_letter(self, job: Job, error: str):
+        job.status, job.last_error = "dead", error
+        self.dead.append(job)
+
+    async def depth(self) -> Dict[str, int]:
+        return {"queued": len(self._ready), "dead": len(self.dead)}
+
+class MongoJobStore:
+    """Jobs persisted in a Mongo collection, shared by every API process.
+
+    A claimed job holds a lease, which the worker renews every
+    ``heartbeat_interval`` while the handler runs; if the worker dies the
+    lease expires and another worker picks the job up again. The lease is
+    therefore independent of how long a handler may take. Dead-lettered
+    jobs stay in the collection with status "dead" for inspection.
+    """
+
+    def __init__(self, collection, lease_seconds: float = JOB_TIMEOUT * 2, executor=None):
+        self.collection = collection
+        self.lease = timedelta(seconds=lease_seconds)
+        # A third of the lease, so one slow or failed renewal does not lose it
+        self.heartbeat_interval = lease_seconds / 3
+        self._executor = executor
+
+    def ensure_indexes(self):
+        self.collection.create_index([("status", 1), ("run_at", 1)])
+
+    async def _run(self, func, *args, **kwargs):
+        # pymongo is blocking, keep it off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def push(self, job: Job):
+        document = job.model_dump()
+        document["_id"] = document.pop("id")
+        await self._run(self.collection.insert_one, document)
+
+    async def claim(self) -> Optional[Job]:
+        now = datetime.now()
+        document = await self._run(
+            self.collection.find_one_and_update,
+            {"$or": [
+                {"status": "queued", "run_at": {"$lte": now}},
+                {"status": "running", "lease_until": {"$lt": now}},
+            ]},
+            {"$set": {"status": "running", "lease_until": now + self.lease}, "$inc": {"attempts": 1}},
+            sort=[("run_at", 1)],
+            return_document=True
+        )
+        if document is None:
+            return None
+        document["id"] = document.pop("_id")
+        return Job(**document)
+
+    async def renew(self, job: Job) -> bool:
+        """Extend the lease on a job this worker runs; False if it expired and was claimed again"""
+        result = await self._run(
+            self.collection.update_one,
+            {"_id": job.id, "status": "running", "attempts": job.attempts},
+            {"$set": {"lease_until": datetime.now() + self.lease}}
+        )
+        return result.matched_count == 1
+
+    async def complete(self, job: Job):
+        await self._run(self.collection.update_one, {"_id": job.id},
+                        {"$set": {"status": "done", "finished_at": datetime.now()}})
+
+    async def retry(self, job: Job, run_at: datetime, error: str):
+        await self._run(self.collection.update_one, {"_id": job.id},
+                        {"$set": {"status": "queued", "run_at": run_at, "last_error": error}})
+
+    async def dead_letter(self, job: Job, error: str):
+        await self._run(self.collection.update_one, {"_id": job.id},
+                        {"$set": {"status": "dead", "last_error": error, "finished_at": datetime.now()}})
+
+    async def depth(self) -> Dict[str, int]:
+        queued = await self._run(self.collection.count_documents, {"status": {"$in": ["queued", "running"]}})
+        dead = await self._run(self.collection.count_documents, {"status": "dead"})
+        return {"queued": queued, "dead": dead}
+
+def _percentile(samples: Deque[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))], 2)
+
+class QueueMetrics:
+    def __init__(self):
+        self.enqueued = 0
+        self.completed = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        # Time from run_at until a worker picked the job up, and handler run time
+        self.wait_ms: Deque[float] = deque(maxlen=METRICS_WINDOW)
+        self.run_ms: Deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "wait_ms_p50": _percentile(self.wait_ms, 50),
+            "wait_ms_p95": _percentile(self.wait_ms, 95),
+            "run_ms_p50": _percentile(self.run_ms, 50),
+            "run_ms_p95": _percentile(self.run_ms, 95),
+        }
+
+class JobQueue:
+    """Asyncio worker pool that runs registered handlers for queued jobs.
+
+    Handlers are coroutines taking the job payload. A handler that raises
+    or times out is retried with exponential backoff, and after
+    ``max_attempts`` failures the job is dead-lettered.
+    """
+
+    def __init__(self, store=None, workers: int = JOB_WORKERS, max_attempts: int = JOB_MAX_ATTEMPTS,
+                 retry_backoff: float = JOB_RETRY_BACKOFF, timeout: float = JOB_TIMEOUT,
+                 poll_interval: float = JOB_POLL_INTERVAL):
+        self.store = store or InMemoryJobStore()
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.handlers: Dict[str, Handler] = {}
+        self.timeouts: Dict[str, float] = {}
+        self.metrics = QueueMetrics()
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._in_flight = 0
+
+    def register(self, kind: str, handler: Handler, timeout: Optional[float] = None):
+        """``timeout`` overrides the queue-wide timeout for this kind"""
+        self.handlers[kind] = handler
+        if timeout is not None:
+            self.timeouts[kind] = timeout
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any], delay: float = 0.0) -> Job:
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        job = Job(kind=kind, payload=payload, max_attempts=self.max_attempts,
+                  run_at=datetime.now() + timedelta(seconds=delay))
+        await self.store.push(job)
+        self.metrics.enqueued += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """Let in-flight jobs finish (up to drain_timeout), then cancel the workers"""
+        deadline = time.monotonic() + drain_timeout
+        while self._in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def join(self, timeout: float = 30.0):
+        """Wait until nothing is queued or running (for scripts and benchmarks)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self._in_flight and (await self.store.depth())["queued"] == 0:
+                return
+            await asyncio.sleep(0.01)
+
+    async def _worker(self):
+        while True:
+            # Cleared before claiming so an enqueue during the claim still wakes us
+            self._wakeup.clear()
+            job = await self.store.claim()
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._in_flight += 1
+            try:
+                await self._execute(job)
+            finally:
+                self._in_flight -= 1
+
+    async def _execute(self, job: Job):
+        self.metrics.wait_ms.append(max(0.0, (datetime.now() - job.run_at).total_seconds() * 1000))
+        started = time.perf_counter()
+        heartbeat = asyncio.create_task(self._keep_lease(job)) if self.store.heartbeat_interval else None
+        try:
+            handler = self.handlers.get(job.kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind: {job.kind}")
+            await asyncio.wait_for(handler(job.payload), self.timeouts.get(job.kind, self.timeout))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            if job.attempts >= job.max_attempts or isinstance(e, LookupError):
+                await self.store.dead_letter(job, error)
+                self.metrics.dead_lettered += 1
+                print(f"Job {job.kind} {job.id} dead-lettered after {job.attempts} attempts: {error}")
+            else:
+                delay = self.retry_backoff * (2 ** (job.attempts - 1))
+                await self.store.retry(job, datetime.now() + timedelta(seconds=delay), error)
+                self.metrics.retried += 1
+            return
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            self.metrics.run_ms.append((time.perf_counter() - started) * 1000)
+        await self.store.complete(job)
+        self.metrics.completed += 1
+
+    async def _keep_lease(self, job: Job):
+        """Renew the store's lease on ``job`` until _execute cancels this task"""
+        while True:
+            await asyncio.sleep(self.store.heartbeat_interval)
+            try:
+                if not await self.store.renew(job):
+                    print(f"Warning: Job {job.kind} {job.id} lost its lease and may run again elsewhere")
+                    return
+            except Exception as e:
+                print(f"Warning: Could not renew the lease on job {job.kind} {job.id}: {e}")
+
+    async def stats(self) -> Dict[str, Any]:
+        return {
+            **(await self.store.depth()),
+            "in_flight": self._in_flight,
+            "workers": len(self._tasks),
+            **self.metrics.as_dict(),
+        }
+
+class JobQueueThread:
+    """A JobQueue whose workers run on an event loop of their own, on a daemon thread.
+
+    For processes with no event loop to host the workers, like the chat app
+    using the in-process tool backend. Coroutines that use the queue are
+    handed to that loop with ``submit``.
+    """
+
+    def __init__(self, queue: JobQueue):
+        self.queue = queue
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="job-queue", daemon=True)
+        self._thread.start()
+        self.submit(self._start()).result()
+
+    async def _start(self):
+        self.queue.start()
+
+    def submit(self, coroutine) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self, drain_timeout: float = 5.0):
+        """Run what is already queued (up to drain_timeout), then stop the workers and the loop"""
+        self.submit(self.queue.join(drain_timeout)).result()
+        self.submit(self.queue.stop(drain_timeout)).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+def create_job_store_from_env(db=None):
+    """JOB_QUEUE_BACKEND=memory (default) or mongo (needs the pymongo database)"""
+    backend = os.getenv("JOB_QUEUE_BACKEND", "memory").lower()
+    if backend == "memory":
+        return InMemoryJobStore()
+    if backend == "mongo":
+        if db is None:
+            raise ValueError("The mongo job queue needs a database")
+        return MongoJobStore(db.jobs)
+    raise ValueError(f"Unknown JOB_QUEUE_BACKEND: {backend}")
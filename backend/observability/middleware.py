@@ -0,0 +1,51 @@
+import time
+from backend.observability.metrics import REGISTRY
+from backend.observability.tracing import REQUEST_ID_HEADER, SERVER, extract, span
+
+request_durations = REGISTRY.histogram(
+    "http_request_duration_seconds", "API request latency by route template", ["method", "route", "status"]
+)
+
+class TracingMiddleware:
+    """Pure ASGI middleware: one server span and one histogram sample per request.
+
+    The trace continues from the caller's traceparent header, and the
+    request ID (taken from X-Request-ID or generated) is echoed on the
+    response. Requests are labelled by route template (/api/complaint_status/{complaint_id})
+    rather than path, so the histogram stays small. Streaming responses are
+    timed until the stream ends.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        trace_id, parent_id, request_id = extract(headers)
+        status = 500
+        started = time.perf_counter()
+
+        with span(f"{scope['method']} request", kind=SERVER, trace_id=trace_id, parent_id=parent_id,
+                  request_id=request_id, **{"http.method": scope["method"]}) as current:
+            async def send_with_request_id(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (REQUEST_ID_HEADER.lower().encode(), current.request_id.encode("latin-1"))
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_request_id)
+            finally:
+                # The router records the matched route on the scope
+                route = getattr(scope.get("route"), "path", None) or "unmatched"
+                current.name = f"{scope['method']} {route}"
+                current.set("http.route", route)
+                current.set("http.status_code", status)
+                request_durations.observe(time.perf_counter() - started, scope["method"], route, str(status))
@@ -0,0 +1,192 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+import functools
+import inspect
+import json
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+from backend.observability.metrics import REGISTRY
+
+# Where finished spans go: none, console (stderr) or file (TRACING_FILE)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").lower()
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "grievance-bot")
+
+REQUEST_ID_HEADER = "X-Request-ID"
+TRACEPARENT_HEADER = "traceparent"
+# Incoming request IDs longer than this are replaced rather than echoed
+MAX_REQUEST_ID_LENGTH = 128
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+span_durations = REGISTRY.histogram(
+    "span_duration_seconds", "Duration of traced operations", ["span"]
+)
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "request_id", "kind",
+                 "attributes", "start_ns", "end_ns", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], request_id: str,
+                 kind: int = INTERNAL, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.request_id = request_id
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def current_request_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.request_id if span else None
+
+def new_request_id() -> str:
+    return secrets.token_hex(16)
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def _otlp_attributes(attributes: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+def to_otlp(spans: List[Span]) -> Dict[str, Any]:
+    """OTLP/JSON ExportTraceServiceRequest, readable by the OpenTelemetry collector's file receivers"""
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attributes({"service.name": TRACING_SERVICE_NAME,
+                                                     "process.pid": os.getpid()})},
+        "scopeSpans": [{
+            "scope": {"name": "backend.observability"},
+            "spans": [{
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                "name": span.name,
+                "kind": span.kind,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": _otlp_attributes({"request.id": span.request_id, **span.attributes}),
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            } for span in spans],
+        }],
+    }]}
+
+class LineExporter:
+    """Writes each finished span as one OTLP/JSON line"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(to_otlp([span]), separators=(",", ":"))
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+def create_exporter_from_env() -> Optional[LineExporter]:
+    if TRACING_EXPORTER == "console":
+        return LineExporter(sys.stderr)
+    if TRACING_EXPORTER == "file":
+        return LineExporter(open(TRACING_FILE, "a", buffering=1, encoding="utf-8"))
+    if TRACING_EXPORTER != "none":
+        print(f"Warning: unknown TRACING_EXPORTER {TRACING_EXPORTER!r}, spans will not be exported")
+    return None
+
+exporter = create_exporter_from_env()
+
+@contextmanager
+def span(name: str, kind: int = INTERNAL, trace_id: Optional[str] = None, parent_id: Optional[str] = None,
+         request_id: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+    """Time a block as a child of the current span, or as a new trace.
+
+    ``trace_id``, ``parent_id`` and ``request_id`` continue a trace started
+    in another process (see ``extract``). Every span feeds the
+    span_duration_seconds histogram; it is only written out when an
+    exporter is configured.
+    """
+    parent = _current_span.get()
+    if trace_id is None and parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    if request_id is None:
+        request_id = parent.request_id if parent is not None else new_request_id()
+    current = Span(name, trace_id or secrets.token_hex(16), parent_id, request_id, kind, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end_ns = time.time_ns()
+        span_durations.observe(current.duration, current.name)
+        if exporter is not None:
+            exporter.export(current)
+
+def traced(name: Optional[str] = None, **attributes: Any):
+    """Decorator running each call of a sync or async function inside a span"""
+    def decorate(func):
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def inject_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Add traceparent and X-Request-ID for the current span to outgoing request headers"""
+    headers = dict(headers or {})
+    current = _current_span.get()
+    if current is not None:
+        headers[TRACEPARENT_HEADER] = f"00-{current.trace_id}-{current.span_id}-01"
+        headers[REQUEST_ID_HEADER] = current.request_id
+    return headers
+
+def extract(headers: Mapping[str, str]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """(trace_id, parent_id, request_id) from lower-cased incoming headers; any may be None"""
+    trace_id = parent_id = None
+    match = _TRACEPARENT.match(headers.get(TRACEPARENT_HEADER, "").strip().lower())
+    if match and match.group(1) != "0" * 32:
+        trace_id, parent_id = match.groups()
+    request_id = headers.get(REQUEST_ID_HEADER.lower()) or None
+    if request_id is not None and (len(request_id) > MAX_REQUEST_ID_LENGTH or not request_id.isprintable()):
+        request_id = None
+    return trace_id, parent_id, request_id
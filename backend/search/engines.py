@@ -0,0 +1,201 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+import asyncio
+import base64
+import contextvars
+import os
+import threading
+import time
+from bson import ObjectId
+from pydantic import BaseModel
+from pymongo.errors import OperationFailure
+from backend.database.database import ComplaintSummary, SUMMARY_PROJECTION
+from backend.search.index import LocalSearchIndex
+
+# Ranked results can be paged this deep; narrow the query beyond that
+MAX_SEARCH_RESULTS = 1000
+# Seconds between catch-up reads of complaints inserted by other processes
+SEARCH_REFRESH_INTERVAL = float(os.getenv("SEARCH_REFRESH_INTERVAL", "5"))
+# Atlas Search index over complaint_details and name (see README)
+ATLAS_SEARCH_INDEX = os.getenv("ATLAS_SEARCH_INDEX", "complaints_search")
+INDEX_LOAD_BATCH = 10000
+# Server error code for a $text query on a collection without a text index
+TEXT_INDEX_MISSING = 27
+
+class SearchUnavailable(Exception):
+    """The search engine cannot answer yet (e.g. the local index is still loading)"""
+
+class SearchHit(ComplaintSummary):
+    score: float
+
+class SearchPage(BaseModel):
+    results: List[SearchHit]
+    next_cursor: Optional[str] = None
+
+def encode_offset_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"offset|{offset}".encode()).decode()
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        label, offset = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        offset = int(offset)
+    except Exception:
+        raise ValueError("Invalid search cursor")
+    if label != "offset" or not 0 <= offset < MAX_SEARCH_RESULTS:
+        raise ValueError("Invalid search cursor")
+    return offset
+
+def _page(hits: List[SearchHit], offset: int, limit: int, has_more: bool) -> SearchPage:
+    next_offset = offset + limit
+    more = has_more and next_offset < MAX_SEARCH_RESULTS
+    return SearchPage(results=hits, next_cursor=encode_offset_cursor(next_offset) if more else None)
+
+class SearchEngine:
+    def search(self, query: str, limit: int, after: Optional[str] = None) -> SearchPage:
+        raise NotImplementedError
+
+    async def asearch(self, query: str, limit: int, after: Optional[str] = None) -> SearchPage:
+        # Engines block on Mongo or numpy; keep them off the event loop
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(None, context.run, self.search, query, limit, after)
+
+    def start(self):
+        pass
+
+class MongoTextSearch(SearchEngine):
+    """Plain MongoDB $text index: stemmed word matches, no typo tolerance"""
+
+    def __init__(self, database):
+        self.database = database
+
+    def ensure_indexes(self):
+        self.database.complaints.create_index(
+            [("complaint_details", "text"), ("name", "text")],
+            weights={"name": 2, "complaint_details": 1},
+            name="complaint_text"
+        )
+
+    def search(self, query: str, limit: int, after: Optional[str] = None) -> SearchPage:
+        offset = decode_offset_cursor(after) if after else 0
+        score = {"$meta": "textScore"}
+        try:
+            documents = list(
+                self.database.complaints.find({"$text": {"$search": query}}, {**SUMMARY_PROJECTION, "score": score})
+                .sort([("score", score), ("created_at", -1)])
+                .skip(offset)
+                .limit(limit + 1)
+            )
+        except OperationFailure as e:
+            if e.code == TEXT_INDEX_MISSING:
+                raise SearchUnavailable("The text index is missing; run python -m backend.database.migrate")
+            raise
+        hits = [SearchHit(**document) for document in documents[:limit]]
+        return _page(hits, offset, limit, len(documents) > limit)
+
+class AtlasSearch(SearchEngine):
+    """Atlas Search $search stage with fuzzy matching on names"""
+
+    def __init__(self, database, index_name: str = ATLAS_SEARCH_INDEX):
+        self.database = database
+        self.index_name = index_name
+
+    def search(self, query: str, limit: int, after: Optional[str] = None) -> SearchPage:
+        offset = decode_offset_cursor(after) if after else 0
+        pipeline = [
+            {"$search": {
+                "index": self.index_name,
+                "compound": {"should": [
+                    {"text": {"query": query, "path": "complaint_details"}},
+                    {"text": {"query": query, "path": "name",
+                              "fuzzy": {"maxEdits": 2, "prefixLength": 1},
+                              "score": {"boost": {"value": 2}}}},
+                ]}
+            }},
+            {"$skip": offset},
+            {"$limit": limit + 1},
+            {"$project": {**SUMMARY_PROJECTION, "score": {"$meta": "searchScore"}}},
+        ]
+        documents = list(self.database.complaints.aggregate(pipeline))
+        hits = [SearchHit(**document) for document in documents[:limit]]
+        return _page(hits, offset, limit, len(documents) > limit)
+
+class LocalSearch(SearchEngine):
+    """LocalSearchIndex kept up to date from Database writes.
+
+    The index is loaded from the collection on a background thread at
+    startup. Complaints inserted through this process are added as they are
+    written; complaints inserted by other processes are picked up by a
+    catch-up read at most every SEARCH_REFRESH_INTERVAL seconds.
+    """
+
+    def __init__(self, database, index: Optional[LocalSearchIndex] = None,
+                 refresh_interval: float = SEARCH_REFRESH_INTERVAL):
+        self.database = database
+        self.index = index or LocalSearchIndex()
+        self.refresh_interval = refresh_interval
+        self.ready = threading.Event()
+        self._last_refresh = 0.0
+        self._high_water: Optional[ObjectId] = None
+        self._refresh_lock = threading.Lock()
+        database.add_listener(self.index)
+
+    def start(self):
+        threading.Thread(target=self.load, name="search-index-load", daemon=True).start()
+
+    def load(self):
+        started = time.perf_counter()
+        self._read_new()
+        self._last_refresh = time.monotonic()
+        self.ready.set()
+        print(f"Search index loaded {len(self.index)} complaints in {time.perf_counter() - started:.1f}s")
+
+    def _read_new(self):
+        query: Dict[str, Any] = {}
+        if self._high_water is not None:
+            # ObjectIds from other machines are only ordered to the second; overlap a little
+            since = self._high_water.generation_time - timedelta(seconds=self.refresh_interval + 5)
+            query["_id"] = {"$gte": ObjectId.from_datetime(since)}
+        cursor = self.database.complaints.find(
+            query, {"complaint_id": 1, "name": 1, "complaint_details": 1, "created_at": 1}
+        ).sort("_id", 1).batch_size(INDEX_LOAD_BATCH)
+        for document in cursor:
+            self._high_water = document["_id"]
+            if document["complaint_id"] not in self.index:
+                self.index.add_documents([document])
+
+    def _refresh(self):
+        if time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._read_new()
+            self._last_refresh = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+    def search(self, query: str, limit: int, after: Optional[str] = None) -> SearchPage:
+        offset = decode_offset_cursor(after) if after else 0
+        if not self.ready.is_set():
+            raise SearchUnavailable("Search index is still loading")
+        self._refresh()
+        ranked, has_more = self.index.search(query, limit, offset)
+        scores = dict(ranked)
+        summaries = self.database.get_complaint_summaries([complaint_id for complaint_id, _ in ranked])
+        hits = [SearchHit(**summary.model_dump(), score=scores[summary.complaint_id]) for summary in summaries]
+        return _page(hits, offset, limit, has_more)
+
+def create_search_engine(database, kind: Optional[str] = None) -> Optional[SearchEngine]:
+    """Build the engine selected by SEARCH_BACKEND (text, local, atlas or none)"""
+    # local keeps the whole collection in each worker's memory, so it is opt-in
+    kind = (kind or os.getenv("SEARCH_BACKEND", "text")).lower()
+    if kind == "local":
+        return LocalSearch(database)
+    if kind == "text":
+        return MongoTextSearch(database)
+    if kind == "atlas":
+        return AtlasSearch(database)
+    if kind == "none":
+        return None
+    raise ValueError(f"Unknown SEARCH_BACKEND: {kind}")
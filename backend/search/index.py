@@ -0,0 +1,193 @@
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import math
+import re
+import threading
+import numpy as np
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# A name match counts this much more than the same word in the details
+NAME_BOOST = 2.0
+# Score multiplier per edit for fuzzy name matches
+FUZZY_PENALTY = 0.25
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "i", "in",
+    "is", "it", "its", "me", "my", "near", "of", "on", "or", "our", "the", "there", "this",
+    "to", "was", "we", "with",
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words minus stopwords, with a plain plural 's' stripped"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def _trigrams(term: str) -> Set[str]:
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, or limit + 1 once it is known to exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+def max_edits(term: str) -> int:
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) <= 5 else 2
+
+class _Postings:
+    """Document numbers (ascending, since documents are only appended) and term counts"""
+
+    __slots__ = ("doc_ids", "counts")
+
+    def __init__(self):
+        self.doc_ids = array("I")
+        self.counts = array("H")
+
+    def add(self, doc_id: int, count: int):
+        self.doc_ids.append(doc_id)
+        self.counts.append(min(count, 65535))
+
+class _Field:
+    def __init__(self):
+        self.postings: Dict[str, _Postings] = {}
+        self.lengths = array("H")
+        self.total_length = 0
+
+    def add(self, doc_id: int, tokens: List[str]):
+        for term, count in Counter(tokens).items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = _Postings()
+            postings.add(doc_id, count)
+        self.lengths.append(min(len(tokens), 65535))
+        self.total_length += len(tokens)
+
+    def score(self, scores: np.ndarray, term: str, weight: float, doc_count: int):
+        postings = self.postings.get(term)
+        if postings is None:
+            return
+        doc_ids = np.frombuffer(postings.doc_ids, dtype=np.uint32)
+        counts = np.frombuffer(postings.counts, dtype=np.uint16).astype(np.float32)
+        lengths = np.frombuffer(self.lengths, dtype=np.uint16)[doc_ids].astype(np.float32)
+        average = self.total_length / doc_count or 1.0
+        idf = math.log(1 + (doc_count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+        scores[doc_ids] += weight * idf * counts * (K1 + 1) / (counts + K1 * (1 - B + B * lengths / average))
+
+class LocalSearchIndex:
+    """In-memory inverted index over complaint details and names.
+
+    Documents are ranked with BM25 over both fields, with name matches
+    boosted. Query words that are not an exact name match are also matched
+    against names within one or two edits (found through a trigram index of
+    the name vocabulary), so misspelled names still hit. The index is append
+    only: complaint text never changes once registered.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.complaint_ids: List[str] = []
+        self._doc_numbers: Dict[str, int] = {}
+        self.created_at = array("d")
+        self.details = _Field()
+        self.names = _Field()
+        self._name_trigrams: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.complaint_ids)
+
+    def __contains__(self, complaint_id: str) -> bool:
+        return complaint_id in self._doc_numbers
+
+    def add(self, complaint_id: str, name: str, complaint_details: str,
+            created_at: Optional[datetime] = None):
+        created_at = created_at or datetime.now()
+        with self._lock:
+            if complaint_id in self._doc_numbers:
+                return
+            doc_id = len(self.complaint_ids)
+            self.complaint_ids.append(complaint_id)
+            self._doc_numbers[complaint_id] = doc_id
+            self.created_at.append(created_at.timestamp())
+            self.details.add(doc_id, tokenize(complaint_details))
+            name_tokens = tokenize(name)
+            for term in name_tokens:
+                if term not in self.names.postings:
+                    for trigram in _trigrams(term):
+                        self._name_trigrams.setdefault(trigram, set()).add(term)
+            self.names.add(doc_id, name_tokens)
+
+    def add_documents(self, documents: Iterable[Dict[str, Any]]):
+        for document in documents:
+            self.add(document["complaint_id"], document.get("name", ""),
+                     document.get("complaint_details", ""), document.get("created_at"))
+
+    def on_complaints_created(self, documents: List[Dict[str, Any]]):
+        self.add_documents(documents)
+
+    def _fuzzy_names(self, term: str) -> List[Tuple[str, int]]:
+        """Name terms within max_edits(term) of term, with their distance"""
+        limit = max_edits(term)
+        if limit == 0:
+            return []
+        trigrams = _trigrams(term)
+        shared = Counter()
+        for trigram in trigrams:
+            shared.update(self._name_trigrams.get(trigram, ()))
+        # Each edit destroys at most three trigrams
+        needed = max(1, len(trigrams) - 3 * limit)
+        matches = []
+        for candidate, count in shared.items():
+            if count >= needed and candidate != term:
+                distance = edit_distance(term, candidate, limit)
+                if distance <= limit:
+                    matches.append((candidate, distance))
+        return matches
+
+    def search(self, query: str, limit: int, offset: int = 0) -> Tuple[List[Tuple[str, float]], bool]:
+        """Ranked (complaint_id, score) pairs for one page, and whether more follow"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], False
+        with self._lock:
+            doc_count = len(self.complaint_ids)
+            if doc_count == 0:
+                return [], False
+            scores = np.zeros(doc_count, dtype=np.float32)
+            for term in terms:
+                self.details.score(scores, term, 1.0, doc_count)
+                self.names.score(scores, term, NAME_BOOST, doc_count)
+                for candidate, distance in self._fuzzy_names(term):
+                    self.names.score(scores, candidate, NAME_BOOST * (1 - FUZZY_PENALTY * distance), doc_count)
+            created_at = np.frombuffer(self.created_at, dtype=np.float64)
+            wanted = offset + limit + 1
+            matched = np.flatnonzero(scores)
+            if len(matched) > wanted:
+                matched = matched[np.argpartition(-scores[matched], wanted - 1)[:wanted]]
+            # Best score first, newest first among equal scores
+            order = np.lexsort((-created_at[matched], -scores[matched]))
+            ranked = matched[order][offset:]
+            page = [(self.complaint_ids[i], round(float(scores[i]), 4)) for i in ranked[:limit]]
+        return page, len(ranked) > limit
@@ -0,0 +1,301 @@
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import time
+from pymongo import UpdateOne
+
+UNCATEGORIZED = "uncategorized"
+TOTALS_ID = "totals"
+REBUILD_MARKER_ID = "rebuild"
+# How long a writer trusts its last look at the rebuild marker (seconds)
+REBUILD_MARKER_TTL = 1.0
+# A marker not refreshed for this long was left by a rebuild that died
+REBUILD_MARKER_EXPIRY = timedelta(minutes=5)
+# How far writers' clocks may lag the rebuilding process's clock
+REBUILD_CLOCK_SKEW = timedelta(minutes=1)
+# Complaints scanned between refreshes of the rebuild marker
+REBUILD_BATCH_SIZE = 10000
+# Upper edges (hours) of the resolution-time histogram buckets; the last bucket is open-ended
+RESOLUTION_BUCKET_EDGES = [1, 2, 4, 8, 12, 24, 48, 72, 120, 168, 240, 336, 504, 720, 1440]
+
+def day_key(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d")
+
+def resolution_bucket(hours: float) -> int:
+    return bisect_right(RESOLUTION_BUCKET_EDGES, hours)
+
+def histogram_percentile(buckets: Dict[str, int], pct: float) -> Optional[float]:
+    """Approximate percentile, interpolating linearly inside the bucket it falls in"""
+    counts = [int(buckets.get(str(i), 0)) for i in range(len(RESOLUTION_BUCKET_EDGES) + 1)]
+    total = sum(counts)
+    if not total:
+        return None
+    target = pct / 100.0 * total
+    seen = 0
+    for index, count in enumerate(counts):
+        if count and seen + count >= target:
+            low = RESOLUTION_BUCKET_EDGES[index - 1] if index else 0
+            if index == len(RESOLUTION_BUCKET_EDGES):
+                return float(low)
+            high = RESOLUTION_BUCKET_EDGES[index]
+            return round(low + (high - low) * (target - seen) / count, 1)
+        seen += count
+    return float(RESOLUTION_BUCKET_EDGES[-1])
+
+class StatsRollups:
+    """Counters behind /api/stats, kept in the stats_rollups collection.
+
+    One ``totals`` document holds counts by status and category and a
+    resolution-time histogram; one ``day:YYYY-MM-DD`` document per day holds
+    complaints created and resolved that day. Writes apply $inc deltas, so
+    every API process can update them concurrently, and a dashboard read is
+    at most one document per day shown instead of a collection scan.
+    ``rebuild`` recomputes everything from the complaints collection.
+
+    While a rebuild runs, a ``rebuild`` marker document sits in the
+    collection and writers append their deltas, one entry per complaint, to
+    stats_rollups_journal instead of applying them.
+    """
+
+    def __init__(self, db, marker_ttl: float = REBUILD_MARKER_TTL):
+        self.collection = db.stats_rollups
+        self.staging = db.stats_rollups_staging
+        self.journal = db.stats_rollups_journal
+        self.complaints = db.complaints
+        self.marker_ttl = marker_ttl
+        self._marker_checked_at = float("-inf")
+        self._rebuilding = False
+
+    def _apply(self, totals: Counter, days: Dict[str, Counter]):
+        operations = []
+        if totals:
+            operations.append(UpdateOne({"_id": TOTALS_ID}, {"$inc": dict(totals)}, upsert=True))
+        for day, counts in days.items():
+            operations.append(UpdateOne(
+                {"_id": f"day:{day}"}, {"$inc": dict(counts), "$setOnInsert": {"date": day}}, upsert=True
+            ))
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+
+    def _count_resolution(self, totals: Counter, days: Dict[str, Counter],
+                          created_at: datetime, resolved_at: datetime, sign: int = 1):
+        hours = max(0.0, (resolved_at - created_at).total_seconds() / 3600)
+        totals["resolved"] += sign
+        totals["resolution_hours_sum"] += sign * hours
+        totals[f"resolution_buckets.{resolution_bucket(hours)}"] += sign
+        days[day_key(resolved_at)]["resolved"] += sign
+
+    def _created(self, document: Dict[str, Any]) -> Tuple[Counter, Dict[str, Counter]]:
+        totals: Counter = Counter()
+        days: Dict[str, Counter] = defaultdict(Counter)
+        totals["total"] += 1
+        totals[f"by_status.{document.get('status', 'In Progress')}"] += 1
+        totals[f"by_category.{document.get('category') or UNCATEGORIZED}"] += 1
+        days[day_key(document["created_at"])]["created"] += 1
+        return totals, days
+
+    def _rebuild_running(self) -> bool:
+        """Whether a rebuild marker is live, looked up at most once per ``marker_ttl``"""
+        now = time.monotonic()
+        if now - self._marker_checked_at >= self.marker_ttl:
+            marker = self.collection.find_one({"_id": REBUILD_MARKER_ID}, {"expires_at": 1})
+            self._rebuilding = marker is not None and marker["expires_at"] > datetime.now()
+            self._marker_checked_at = now
+        return self._rebuilding
+
+    def _record(self, changes: List[Tuple[Dict[str, Any], Counter, Dict[str, Counter]]]):
+        """Apply (journal key, totals, days) deltas, or journal them while a rebuild runs.
+
+        The key names the complaint and the change, so that the rebuild can
+        tell whether its scan already counted it.
+        """
+        changes = [change for change in changes if change[1]]
+        if not changes:
+            return
+        if self._rebuild_running():
+            # Dotted counter names are not valid field names, so counters are stored as pairs
+            self.journal.insert_many([
+                {**key, "totals": list(totals.items()),
+                 "days": [[day, list(counts.items())] for day, counts in days.items()]}
+                for key, totals, days in changes
+            ])
+            return
+        totals: Counter = Counter()
+        days: Dict[str, Counter] = defaultdict(Counter)
+        for _, change_totals, change_days in changes:
+            totals.update(change_totals)
+            for day, counts in change_days.items():
+                days[day].update(counts)
+        self._apply(totals, days)
+
+    def on_complaints_created(self, documents: List[Dict[str, Any]]):
+        self._record([
+            ({"complaint_id": document["complaint_id"], "event": "created"}, *self._created(document))
+            for document in documents
+        ])
+
+    def on_complaints_classified(self, documents: List[Dict[str, Any]]):
+        """Documents that had no category before (the classification backfill)"""
+        changes = []
+        for document in documents:
+            totals: Counter = Counter()
+            totals[f"by_category.{UNCATEGORIZED}"] -= 1
+            totals[f"by_category.{document['category']}"] += 1
+            changes.append(({"complaint_id": document["complaint_id"], "event": "classified"}, totals, {}))
+        self._record(changes)
+
+    def on_status_changed(self, changes: List[Tuple[Dict[str, Any], Dict[str, Any]]]):
+        """(before, after) document pairs from status updates"""
+        deltas = []
+        for before, after in changes:
+            if before["status"] == after["status"]:
+                continue
+            totals: Counter = Counter()
+            days: Dict[str, Counter] = defaultdict(Counter)
+            totals[f"by_status.{before['status']}"] -= 1
+            totals[f"by_status.{after['status']}"] += 1
+            if after.get("resolved_at") and not before.get("resolved_at"):
+                self._count_resolution(totals, days, after["created_at"], after["resolved_at"])
+            elif before.get("resolved_at") and not after.get("resolved_at"):
+                # Reopened: the resolution no longer stands
+                self._count_resolution(totals, days, before["created_at"], before["resolved_at"], sign=-1)
+            key = {"complaint_id": after["complaint_id"], "event": "status", "version": after.get("version", 0)}
+            deltas.append((key, totals, days))
+        self._record(deltas)
+
+    def read(self, days: int = 30, today: Optional[datetime] = None) -> Dict[str, Any]:
+        today = today or datetime.now()
+        first = day_key(today - timedelta(days=days - 1))
+        totals = self.collection.find_one({"_id": TOTALS_ID}) or {}
+        stored = {
+            document["date"]: document
+            for document in self.collection.find({"_id": {"$gte": f"day:{first}", "$lte": f"day:{day_key(today)}"}})
+        }
+        by_day = []
+        for offset in range(days - 1, -1, -1):
+            day = day_key(today - timedelta(days=offset))
+            document = stored.get(day, {})
+            by_day.append({"date": day, "created": document.get("created", 0),
+                           "resolved": document.get("resolved", 0)})
+        buckets = totals.get("resolution_buckets", {})
+        resolved = totals.get("resolved", 0)
+        return {
+            "total": totals.get("total", 0),
+            "by_status": {status: count for status, count in totals.get("by_status", {}).items() if count},
+            "by_category": {category: count for category, count in totals.get("by_category", {}).items() if count},
+            "by_day": by_day,
+            "resolution_hours": {
+                "resolved": resolved,
+                "mean": round(totals.get("resolution_hours_sum", 0) / resolved, 1) if resolved else None,
+                "p50": histogram_percentile(buckets, 50),
+                "p90": histogram_percentile(buckets, 90),
+                "p95": histogram_percentile(buckets, 95),
+            },
+        }
+
+    def _set_marker(self, started: datetime):
+        self.collection.replace_one(
+            {"_id": REBUILD_MARKER_ID},
+            {"_id": REBUILD_MARKER_ID, "started_at": started, "expires_at": datetime.now() + REBUILD_MARKER_EXPIRY},
+            upsert=True
+        )
+
+    def rebuild_started(self) -> Optional[datetime]:
+        """When the rebuild now in progress started, or None if there is none"""
+        marker = self.collection.find_one({"_id": REBUILD_MARKER_ID})
+        if marker is None or marker["expires_at"] <= datetime.now():
+            return None
+        return marker["started_at"]
+
+    @staticmethod
+    def _counted_by_scan(entry: Dict[str, Any], seen: Dict[str, Tuple[int, bool]]) -> bool:
+        """Whether the scan read the complaint after the journaled change was made"""
+        state = seen.get(entry["complaint_id"])
+        if state is None:
+            # Not in the scan, or read before it changed since the rebuild started
+            return False
+        version, categorized = state
+        if entry["event"] == "created":
+            return True
+        if entry["event"] == "classified":
+            return categorized
+        return version >= entry["version"]
+
+    def _drain_journal(self, seen: Dict[str, Tuple[int, bool]],
+                       totals: Counter, days: Dict[str, Counter]) -> int:
+        """Add journaled deltas the scan did not count to totals/days and delete them"""
+        entries = list(self.journal.find())
+        for entry in entries:
+            if self._counted_by_scan(entry, seen):
+                continue
+            totals.update(dict(entry["totals"]))
+            for day, counts in entry["days"]:
+                days[day].update(dict(counts))
+        if entries:
+            self.journal.delete_many({"_id": {"$in": [entry["_id"] for entry in entries]}})
+        return len(entries)
+
+    def rebuild(self) -> Dict[str, int]:
+        """Recompute every rollup document with one pass over the complaints.
+
+        Writes carry on meanwhile. The scan is not a snapshot, so each
+        journaled change is kept only if the scan read its complaint before
+        the change: ``seen`` holds the version and categorization the scan
+        read for every complaint touched since the rebuild started. The
+        result is built in stats_rollups_staging and renamed over
+        stats_rollups, which drops the marker with it; /api/stats shows the
+        old counts until then.
+        """
+        running_since = self.rebuild_started()
+        if running_since is not None:
+            raise RuntimeError(f"A stats rebuild has been running since {running_since}")
+        started = datetime.now()
+        # Entries left by a rebuild that died are already in the complaints we are about to scan
+        self.journal.delete_many({})
+        self.staging.drop()
+        self._set_marker(started)
+        # Writers may have looked for the marker just before it was set
+        time.sleep(2 * self.marker_ttl)
+
+        totals: Counter = Counter()
+        days: Dict[str, Counter] = defaultdict(Counter)
+        seen: Dict[str, Tuple[int, bool]] = {}
+        recent = started - REBUILD_CLOCK_SKEW
+        cursor = self.complaints.find(
+            {}, {"complaint_id": 1, "status": 1, "category": 1, "version": 1, "created_at": 1,
+                 "updated_at": 1, "resolved_at": 1, "_id": 0}
+        ).batch_size(REBUILD_BATCH_SIZE)
+        for scanned, document in enumerate(cursor, 1):
+            document_totals, document_days = self._created(document)
+            totals.update(document_totals)
+            for day, counts in document_days.items():
+                days[day].update(counts)
+            if document.get("resolved_at"):
+                self._count_resolution(totals, days, document["created_at"], document["resolved_at"])
+            if (document.get("updated_at") or document["created_at"]) >= recent:
+                seen[document["complaint_id"]] = (document.get("version") or 0, bool(document.get("category")))
+            if scanned % REBUILD_BATCH_SIZE == 0:
+                self._set_marker(started)
+        complaints = totals["total"]
+        journaled = self._drain_journal(seen, totals, days)
+
+        nested: Dict[str, Any] = {"_id": TOTALS_ID}
+        for key, value in totals.items():
+            target = nested
+            *parents, leaf = key.split(".", 1)
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[leaf] = value
+        self.staging.insert_many(
+            [nested] + [{"_id": f"day:{day}", "date": day, **counts} for day, counts in days.items()]
+        )
+        self.staging.rename(self.collection.name, dropTarget=True)
+
+        # Writers that saw the marker just before the swap journal for up to marker_ttl more
+        time.sleep(2 * self.marker_ttl)
+        late_totals: Counter = Counter()
+        late_days: Dict[str, Counter] = defaultdict(Counter)
+        journaled += self._drain_journal(seen, late_totals, late_days)
+        self._apply(late_totals, late_days)
+        return {"complaints": complaints, "days": len(days), "journaled": journaled}
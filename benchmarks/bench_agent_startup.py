@@ -0,0 +1,67 @@
+"""Setup cost and first-response time for a new chat session, cold vs warm.
+
+"cold" rebuilds the ChatOpenAI client, tools, prompt and AgentExecutor for
+every session, as app.py used to. "warm" reuses the process-wide agent from
+get_shared_agent(). No request reaches OpenAI: clients are built with a
+dummy key and turns are answered by FakeStreamingChatModel.
+
+    python -m benchmarks.bench_agent_startup --sessions 20
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from langchain_openai import ChatOpenAI
+
+import backend.agents.agents as agents
+from backend.agents.fake_llm import FakeStreamingChatModel
+from benchmarks.common import percentile, print_table
+
+REPLY = "Hello! I can help you register a complaint or check its status."
+
+
+def first_turn(agent):
+    agent.invoke({"input": "hello there", "chat_history": []})
+
+
+def run(label, get_agent, sessions):
+    setup, first = [], []
+    for _ in range(sessions):
+        start = time.perf_counter()
+        agent = get_agent()
+        ready = time.perf_counter()
+        first_turn(agent)
+        done = time.perf_counter()
+        setup.append((ready - start) * 1000)
+        first.append((done - start) * 1000)
+    return {
+        "sessions": label,
+        "setup_ms": sum(setup) / len(setup),
+        "first_reply_p50_ms": percentile(first, 50),
+        "first_reply_p95_ms": percentile(first, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    def build():
+        # The OpenAI client a real session would construct, then an offline model for the turn
+        ChatOpenAI(model="gpt-3.5-turbo", temperature=0.6, streaming=True)
+        agent = agents.create_agent(llm=FakeStreamingChatModel(responses=[REPLY]))
+        agent.agent_executor.verbose = False
+        return agent
+
+    rows = [run("cold", build, args.sessions)]
+
+    shared = build()
+    rows.append(run("warm", lambda: shared, args.sessions))
+    print_table(f"{args.sessions} new sessions", rows)
+
+
+if __name__ == "__main__":
+    main()
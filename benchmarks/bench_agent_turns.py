@@ -0,0 +1,121 @@
+"""End-to-end chat turn latency for create_agent() with a fake LLM.
+
+Drives the agent the way app.py does (AgentStream, streamed tokens) against a
+real API server, with FakeStreamingChatModel standing in for OpenAI. Its
+first-token and per-token delays (--llm-first-token-ms, --llm-token-ms)
+model the LLM, so ``overhead_p50_ms`` is the time spent outside it: the
+agent framework, tool calls, HTTP and Mongo. Three kinds of turn:
+
+  fast_path  "status of CMP-..." answered by the IntentRouter, no LLM call
+  chat       one LLM call, no tools
+  tool       LLM function call -> check_complaint_status -> LLM answer
+
+    python -m benchmarks.bench_agent_turns --turns 20 --json agent.json
+"""
+import argparse
+import json
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from langchain_core.messages import AIMessage
+
+from backend.agents.agents import ComplaintTools, create_agent
+from backend.agents.backends import HttpComplaintBackend
+from backend.agents.direct_backend import DirectComplaintBackend
+from backend.agents.fake_llm import FakeStreamingChatModel
+from backend.agents.streaming import AgentStream
+from benchmarks.common import (
+    load_api_app, make_database, percentile, print_table, sample_complaint, serve_in_thread, write_results,
+)
+
+CHAT_REPLY = ("I can register a new complaint for you, check the status of an existing one, "
+              "or list the complaints filed from your mobile number. What would you like to do?")
+TOOL_REPLY = "Your complaint is currently In Progress. We will notify you when the status changes."
+
+
+def build_agents(args, complaint_tools, complaint_id):
+    def llm(responses):
+        return FakeStreamingChatModel(responses=responses, first_token_delay=args.llm_first_token_ms / 1000,
+                                      token_delay=args.llm_token_ms / 1000)
+
+    function_call = AIMessage(content="", additional_kwargs={"function_call": {
+        "name": "check_complaint_status", "arguments": json.dumps({"__arg1": complaint_id}),
+    }})
+    turns = {
+        # (agent, user message, LLM replies per turn)
+        "fast_path": (create_agent(llm=llm([CHAT_REPLY]), complaint_tools=complaint_tools),
+                      f"status of {complaint_id}", []),
+        "chat": (create_agent(llm=llm([CHAT_REPLY]), complaint_tools=complaint_tools),
+                 "What can you help me with?", [CHAT_REPLY]),
+        "tool": (create_agent(llm=llm([function_call, TOOL_REPLY]), complaint_tools=complaint_tools),
+                 "Can you check on the complaint I filed yesterday?", [function_call.content, TOOL_REPLY]),
+    }
+    for agent, _, _ in turns.values():
+        agent.agent_executor.verbose = False
+    return turns
+
+
+def simulated_llm_ms(args, replies) -> float:
+    tokens = sum(len(FakeStreamingChatModel._tokens(reply)) for reply in replies)
+    return len(replies) * args.llm_first_token_ms + tokens * args.llm_token_ms
+
+
+def run_turns(agent, message: str, turns: int):
+    ttft, total = [], []
+    for _ in range(turns):
+        stream = AgentStream(agent, {"input": message, "chat_history": []})
+        for _ in stream:
+            pass
+        ttft.append(stream.metrics.ttft_ms)
+        total.append(stream.metrics.total_ms)
+    return ttft, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20, help="Turns per kind")
+    parser.add_argument("--llm-first-token-ms", type=float, default=200)
+    parser.add_argument("--llm-token-ms", type=float, default=5)
+    parser.add_argument("--tools-backend", choices=["http", "direct"], default="http")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated Mongo round trip")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    db = make_database(args.latency_ms)
+    complaint = db.create_complaint(sample_complaint(1))
+    server = None
+    if args.tools_backend == "http":
+        server, base_url = serve_in_thread(load_api_app(db))
+        backend = HttpComplaintBackend(base_url)
+    else:
+        backend = DirectComplaintBackend(database=db)
+    complaint_tools = ComplaintTools(backend=backend)
+
+    rows = []
+    try:
+        for kind, (agent, message, replies) in build_agents(args, complaint_tools, complaint.complaint_id).items():
+            run_turns(agent, message, 1)  # warm up connections and prompt templates
+            ttft, total = run_turns(agent, message, args.turns)
+            rows.append({
+                "kind": kind,
+                "turns": args.turns,
+                "llm_calls": len(replies),
+                "ttft_p50_ms": percentile(ttft, 50),
+                "total_p50_ms": percentile(total, 50),
+                "total_p95_ms": percentile(total, 95),
+                "total_p99_ms": percentile(total, 99),
+                "overhead_p50_ms": percentile(total, 50) - simulated_llm_ms(args, replies),
+            })
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    print_table(f"Agent turns, {args.tools_backend} tools, fake LLM "
+                f"{args.llm_first_token_ms:.0f} ms to first token + {args.llm_token_ms:.0f} ms/token", rows)
+    if args.json:
+        write_results(args.json, "agent_turns", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
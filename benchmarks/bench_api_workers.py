@@ -0,0 +1,120 @@
+"""API throughput with 1 vs several worker processes (backend.api.serve).
+
+Starts the production server as a subprocess for each --workers value and
+drives it with --concurrency async clients for --seconds. The mix is mostly
+status lookups, plus --register-share registrations, which spend CPU on
+classification and duplicate detection. Worker processes cannot share
+mongomock, so this needs a real mongod: BENCH_MONGODB_URI=mongodb://localhost:27017.
+
+    python -m benchmarks.bench_api_workers --workers 1 2 4 --concurrency 64
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import make_database, percentile, print_table, sample_complaint, write_results
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "MONGODB_URI": os.environ["BENCH_MONGODB_URI"],
+        # Measure the request path, not index loading or cache coherence between workers
+        "SEARCH_BACKEND": "none",
+        "COMPLAINT_CACHE_BACKEND": "none",
+        "RATE_LIMIT": "off",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "backend.api.serve", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 120.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/api/stats")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def drive(base_url: str, args, complaint_ids):
+    latencies, errors = [], 0
+    deadline = time.monotonic() + args.seconds
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    async def client_loop(client: httpx.AsyncClient, rng: random.Random):
+        nonlocal errors
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            if rng.random() < args.register_share:
+                response = await client.post("/api/register_complaint", json={
+                    "name": "Load Test", "mobile": f"97{rng.randint(0, 10 ** 8):08d}",
+                    "complaint_details": f"Garbage not collected in ward {rng.randint(1, 200)} for days",
+                })
+            else:
+                response = await client.get(f"/api/complaint_status/{rng.choice(complaint_ids)}")
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += response.status_code != 200
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, random.Random(n)) for n in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--register-share", type=float, default=0.2)
+    parser.add_argument("--complaints", type=int, default=5000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    if not os.getenv("BENCH_MONGODB_URI"):
+        print("Set BENCH_MONGODB_URI: worker processes need a MongoDB they can all reach")
+        return
+    db = make_database()
+    db.complaints.insert_many([sample_complaint(i) for i in range(args.complaints)])
+    complaint_ids = [f"CMP-{i:08d}" for i in range(args.complaints)]
+
+    rows = []
+    for workers in args.workers:
+        server = start_server(workers, args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            asyncio.run(wait_ready(base_url))
+            latencies, errors, elapsed = asyncio.run(drive(base_url, args, complaint_ids))
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+        rows.append({
+            "workers": workers,
+            "requests_per_s": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "errors": errors,
+        })
+    print_table(f"{args.concurrency} concurrent clients, {args.register_share:.0%} registrations", rows)
+    if args.json:
+        write_results(args.json, "api_workers", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
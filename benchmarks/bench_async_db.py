@@ -0,0 +1,63 @@
+"""Concurrent throughput of the blocking vs thread-offloaded data layer.
+
+Simulates many in-flight API requests on one event loop. With the blocking
+Database every coroutine stalls the loop for the full round trip, so
+throughput stays flat as concurrency grows; AsyncDatabase should scale until
+the thread pool is saturated. The complaint cache is off, since every hit
+would skip the round trip being measured; --cache turns it on to compare.
+
+    python -m benchmarks.bench_async_db --latency-ms 5 --requests 400
+"""
+import argparse
+import asyncio
+import time
+
+from backend.database.database import AsyncDatabase
+from benchmarks.common import cache_option, make_database, sample_complaint, print_table
+
+
+async def drive(call, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            await call(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--cache", action="store_true", help="Read through the complaint cache (COMPLAINT_CACHE_BACKEND)")
+    args = parser.parse_args()
+
+    db = make_database(latency_ms=args.latency_ms, cache=cache_option(args.cache))
+    for i in range(1000):
+        db.create_complaint(sample_complaint(i))
+    async_db = AsyncDatabase(db, max_workers=max(args.concurrency))
+
+    async def blocking(i):
+        db.get_complaint_by_id(f"CMP-{i % 1000:08d}")
+
+    async def offloaded(i):
+        await async_db.get_complaint_by_id(f"CMP-{i % 1000:08d}")
+
+    rows = []
+    for concurrency in args.concurrency:
+        rows.append({
+            "concurrency": concurrency,
+            "blocking_rps": asyncio.run(drive(blocking, args.requests, concurrency)),
+            "async_rps": asyncio.run(drive(offloaded, args.requests, concurrency)),
+        })
+    async_db.close()
+    print_table(f"get_complaint_by_id, {args.latency_ms}ms simulated latency, "
+                f"cache {'on' if args.cache else 'off'}", rows)
+
+
+if __name__ == "__main__":
+    main()
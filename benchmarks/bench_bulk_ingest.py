@@ -0,0 +1,57 @@
+"""Records/sec of bulk ingestion vs one create_complaint call per record.
+
+The bulk path runs the same streaming parser, validation and batched
+unordered insert_many as /api/bulk_register_complaints.
+
+    python -m benchmarks.bench_bulk_ingest --records 5000 --latency-ms 2
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from backend.api.ingest import ingest_complaints
+from backend.database.database import AsyncDatabase
+from benchmarks.common import make_database, sample_complaint, print_table
+
+
+def prepare(record):
+    return dict(record)
+
+
+async def stream(body: bytes, chunk_size: int = 64 * 1024):
+    for i in range(0, len(body), chunk_size):
+        yield body[i:i + chunk_size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000])
+    args = parser.parse_args()
+
+    records = [sample_complaint(i) for i in range(args.records)]
+    rows = []
+
+    db = make_database(latency_ms=args.latency_ms)
+    start = time.perf_counter()
+    for record in records:
+        db.create_complaint(dict(record))
+    rows.append({"path": "single insert", "records_per_sec": args.records / (time.perf_counter() - start)})
+
+    body = "\n".join(json.dumps(record) for record in records).encode()
+    for batch_size in args.batch_sizes:
+        async_db = AsyncDatabase(make_database(latency_ms=args.latency_ms))
+        start = time.perf_counter()
+        report = asyncio.run(ingest_complaints(stream(body), async_db, prepare, batch_size))
+        elapsed = time.perf_counter() - start
+        async_db.close()
+        assert report["inserted"] == args.records, report["errors"][:3]
+        rows.append({"path": f"bulk (batch {batch_size})", "records_per_sec": args.records / elapsed})
+
+    print_table(f"{args.records} records, {args.latency_ms}ms simulated latency per call", rows)
+
+
+if __name__ == "__main__":
+    main()
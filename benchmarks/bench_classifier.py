@@ -0,0 +1,94 @@
+"""Complaints classified per second, per batch and through the backfill job.
+
+The first table scores batches of complaint texts directly, showing how much
+vectorizing a whole batch saves over one complaint at a time. The second
+stores --backfill unclassified complaints and times the backfill_categories
+job chain until every one has a category and priority. mongomock re-checks
+indexes on every write, so keep --backfill small unless BENCH_MONGODB_URI
+is set.
+
+    python -m benchmarks.bench_classifier --complaints 20000 --backfill 2000
+"""
+import argparse
+import asyncio
+import time
+
+from backend.classification.classifier import load_or_train_classifier
+from backend.database.database import AsyncDatabase
+from backend.jobs.handlers import register_classification_handlers
+from backend.jobs.queue import JobQueue
+from benchmarks.common import make_database, sample_complaint, print_table
+
+DETAILS = [
+    "No water supply since two days in our street",
+    "Street light not working near the park gate",
+    "Garbage not collected, bins overflowing",
+    "Huge pothole on the main road near the school",
+    "Sewage overflowing after the rain",
+    "Power cut every evening for hours",
+    "Bus arrives late every morning",
+    "Loud music from the hall late at night",
+]
+
+
+def classify_rate(classifier, texts, batch_size: int) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        classifier.predict(texts[start:start + batch_size])
+    return len(texts) / (time.perf_counter() - started)
+
+
+async def backfill(async_db: AsyncDatabase, classifier, batch_size: int) -> float:
+    queue = JobQueue(workers=1, poll_interval=0.01)
+    register_classification_handlers(queue, async_db, classifier)
+    queue.start()
+    started = time.perf_counter()
+    await queue.enqueue("backfill_categories", {"after": None, "batch_size": batch_size})
+    await queue.join(timeout=600)
+    elapsed = time.perf_counter() - started
+    await queue.stop()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--complaints", type=int, default=20000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--backfill", type=int, default=2000)
+    parser.add_argument("--backfill-batch", type=int, default=500)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    classifier = load_or_train_classifier()
+    print(f"Classifier ready in {time.perf_counter() - started:.2f}s")
+
+    texts = [f"{DETAILS[i % len(DETAILS)]} (ref {i})" for i in range(args.complaints)]
+    rows = []
+    for batch_size in args.batch_sizes:
+        # Batch size 1 is slow; a sample is enough to measure it
+        sample = texts if batch_size >= 100 else texts[:2000]
+        rows.append({"batch_size": batch_size, "complaints_per_s": classify_rate(classifier, sample, batch_size)})
+    print_table("Classifier throughput (predict only)", rows)
+
+    db = make_database()
+    documents = []
+    for i in range(args.backfill):
+        document = sample_complaint(i)
+        document["complaint_details"] = texts[i % len(texts)]
+        documents.append(document)
+    db.create_complaints_bulk(documents)
+    async_db = AsyncDatabase(db)
+    elapsed = asyncio.run(backfill(async_db, classifier, args.backfill_batch))
+    remaining = db.complaints.count_documents({"category": None})
+    async_db.close()
+    print_table("Backfill job", [{
+        "complaints": args.backfill,
+        "batch": args.backfill_batch,
+        "seconds": elapsed,
+        "complaints_per_s": args.backfill / elapsed,
+        "unclassified_left": remaining,
+    }])
+
+
+if __name__ == "__main__":
+    main()
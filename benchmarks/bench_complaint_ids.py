@@ -0,0 +1,68 @@
+"""ID generation speed and insert locality for each complaint ID strategy.
+
+Locality is measured on a simulated B-tree: every new ID is placed in a
+sorted key list split into fixed-size leaf pages. ``append_ratio`` is the
+share of inserts that land at the right-hand edge of the index and
+``pages_touched`` is how many distinct leaf pages a window of inserts
+dirtied; random IDs touch nearly one page per insert.
+
+    python -m benchmarks.bench_complaint_ids --ids 50000
+"""
+import argparse
+import bisect
+import time
+
+import mongomock
+
+from backend.database.ids import RandomIdGenerator, TimeOrderedIdGenerator, SequenceIdGenerator
+from benchmarks.common import print_table
+
+
+def locality(ids, page_size: int, window: int):
+    keys = []
+    appended = 0
+    touched = set()
+    touched_per_window = []
+    for i, key in enumerate(ids):
+        position = bisect.bisect_left(keys, key)
+        if position == len(keys):
+            appended += 1
+        keys.insert(position, key)
+        touched.add(position // page_size)
+        if (i + 1) % window == 0:
+            touched_per_window.append(len(touched))
+            touched = set()
+    average = sum(touched_per_window) / len(touched_per_window) if touched_per_window else 0.0
+    return appended / len(ids), average
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ids", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--window", type=int, default=1000)
+    args = parser.parse_args()
+
+    generators = {
+        "random": RandomIdGenerator(),
+        "time": TimeOrderedIdGenerator(),
+        "sequence": SequenceIdGenerator(mongomock.MongoClient().bench.counters, block_size=1000),
+    }
+    rows = []
+    for name, generator in generators.items():
+        start = time.perf_counter()
+        ids = [generator.generate() for _ in range(args.ids)]
+        elapsed = time.perf_counter() - start
+        append_ratio, pages = locality(ids, args.page_size, args.window)
+        rows.append({
+            "strategy": name,
+            "ids_per_sec": args.ids / elapsed,
+            "append_ratio": append_ratio,
+            "pages_touched": pages,
+            "unique": len(set(ids)) == len(ids),
+        })
+    print_table(f"{args.ids} IDs, {args.page_size} keys per leaf, pages touched per {args.window} inserts", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Precision, recall and throughput of near-duplicate complaint detection.
+
+Synthetic complaints are paired with repeats from the same citizen
+(re-cased, numbers spelled out, filler words added, a word dropped or
+misspelled) and with hard negatives (same issue in another locality, or a
+different issue from the same mobile). The first table sweeps the similarity
+threshold over those labelled pairs, counting a match only when the pair also
+shares an LSH band, as the index lookup requires. The second runs the
+DuplicateDetector end to end on a stream of registrations.
+
+    python -m benchmarks.bench_dedup --pairs 5000 --stream 1500
+"""
+import argparse
+import random
+import time
+
+from backend.dedup.detector import DuplicateDetector
+from backend.dedup.minhash import MinHasher, extract_locality
+from benchmarks.common import make_database, percentile, print_table
+
+ISSUES = [
+    "no water supply", "water leakage from the main pipe", "street light not working",
+    "garbage not collected", "huge pothole on the road", "sewage overflowing on the street",
+    "drain blocked and water stagnant", "frequent power cuts", "transformer sparking",
+    "stray dogs attacking people", "bus not stopping at the stop", "tree branch about to fall",
+]
+PLACES = ["sector", "ward", "block", "phase"]
+DURATIONS = ["since three days", "for two weeks", "since yesterday", "for five days", "every night"]
+FILLERS = ["please help", "kindly do the needful", "urgent", "sir please look into this",
+           "this is the second time I am complaining"]
+
+
+def original(rng: random.Random):
+    place = f"{rng.choice(PLACES)} {rng.randint(1, 60)}"
+    issue = rng.choice(ISSUES)
+    return issue, place, f"{issue.capitalize()} in {place} {rng.choice(DURATIONS)}"
+
+
+def repeat(text: str, rng: random.Random) -> str:
+    words = text.split()
+    edits = rng.sample(["case", "numbers", "filler", "drop", "typo"], k=rng.randint(1, 3))
+    if "numbers" in edits:
+        words = [{"three": "3", "two": "2", "five": "5"}.get(w, w) for w in words]
+    if "drop" in edits and len(words) > 5:
+        words.pop(rng.randrange(len(words)))
+    if "typo" in edits:
+        i = rng.randrange(len(words))
+        if len(words[i]) > 3:
+            j = rng.randrange(1, len(words[i]) - 1)
+            words[i] = words[i][:j] + words[i][j + 1:]
+    text = " ".join(words)
+    if "filler" in edits:
+        text = f"{text}, {rng.choice(FILLERS)}"
+    if "case" in edits:
+        text = text.lower() + "!!"
+    return text
+
+
+def hard_negative(issue: str, place: str, rng: random.Random) -> str:
+    if rng.random() < 0.5:
+        kind, number = place.split()
+        return f"{issue.capitalize()} in {kind} {int(number) + rng.randint(1, 9)} {rng.choice(DURATIONS)}"
+    other = rng.choice([i for i in ISSUES if i != issue])
+    return f"{other.capitalize()} in {place} {rng.choice(DURATIONS)}"
+
+
+def is_match(hasher, threshold, first, second) -> bool:
+    loc_a, loc_b = extract_locality(first), extract_locality(second)
+    if loc_a and loc_b and loc_a != loc_b:
+        return False
+    sig_a, sig_b = hasher.signature(first), hasher.signature(second)
+    if not set(hasher.bands(sig_a)) & set(hasher.bands(sig_b)):
+        return False
+    return MinHasher.similarity(sig_a, sig_b) >= threshold
+
+
+def sweep(args, rng):
+    hasher = MinHasher()
+    pairs = []
+    for _ in range(args.pairs):
+        issue, place, text = original(rng)
+        pairs.append((text, repeat(text, rng), True))
+        pairs.append((text, hard_negative(issue, place, rng), False))
+
+    rows = []
+    for threshold in args.thresholds:
+        tp = fp = fn = 0
+        for first, second, duplicate in pairs:
+            predicted = is_match(hasher, threshold, first, second)
+            tp += predicted and duplicate
+            fp += predicted and not duplicate
+            fn += duplicate and not predicted
+        rows.append({
+            "threshold": threshold,
+            "precision": tp / (tp + fp) if tp + fp else 1.0,
+            "recall": tp / (tp + fn) if tp + fn else 1.0,
+        })
+    print_table(f"{args.pairs} repeat pairs + {args.pairs} hard negatives", rows)
+
+    texts = [text for text, _, _ in pairs]
+    started = time.perf_counter()
+    for text in texts:
+        hasher.bands(hasher.signature(text))
+    elapsed = time.perf_counter() - started
+    print(f"Fingerprints: {len(texts) / elapsed:.0f}/s ({elapsed / len(texts) * 1e6:.0f} us each)")
+
+
+def stream(args, rng):
+    db = make_database()
+    detector = DuplicateDetector(db)
+    latencies = []
+    tp = fp = fn = 0
+    sent = []
+    for i in range(args.stream):
+        mobile = f"98{rng.randint(0, args.stream // 3):08d}"
+        earlier = [entry for entry in sent if entry[0] == mobile]
+        if earlier and rng.random() < 0.3:
+            _, complaint_id, text = rng.choice(earlier)
+            details, expected = repeat(text, rng), complaint_id
+        else:
+            _, _, details = original(rng)
+            expected = None
+        document = {"complaint_id": f"CMP-{i:08d}", "name": "Citizen", "mobile": mobile,
+                    "complaint_details": details, "status": "In Progress"}
+        started = time.perf_counter()
+        duplicate_of = detector.check(document)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if duplicate_of is None:
+            db.create_complaint(document)
+            sent.append((mobile, document["complaint_id"], details))
+        tp += duplicate_of is not None and duplicate_of == expected
+        fp += duplicate_of is not None and duplicate_of != expected
+        fn += duplicate_of is None and expected is not None
+    print_table(f"End-to-end stream of {args.stream} registrations (threshold {detector.threshold})", [{
+        "precision": tp / (tp + fp) if tp + fp else 1.0,
+        "recall": tp / (tp + fn) if tp + fn else 1.0,
+        "check_p50_ms": percentile(latencies, 50),
+        "check_p95_ms": percentile(latencies, 95),
+    }])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=5000)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.4, 0.5, 0.6, 0.7, 0.8])
+    parser.add_argument("--stream", type=int, default=1500,
+                        help="Registrations for the end-to-end run (mongomock slows down past a few thousand)")
+    args = parser.parse_args()
+    rng = random.Random(11)
+    sweep(args, rng)
+    stream(args, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Registration latency with follow-up work inline vs on the job queue.
+
+Each registration inserts a complaint, writes an audit event and sends an
+acknowledgement through a notifier that takes --notify-ms (a stand-in for an
+SMS gateway). Inline, the caller waits for all three; queued, it only waits
+for the insert and the enqueue. A flaky notifier exercises retries and
+dead-lettering. The Mongo-backed queue is only measured when
+BENCH_MONGODB_URI points at a real mongod; mongomock does not make
+find_one_and_update atomic across threads, so workers would double-claim.
+
+    python -m benchmarks.bench_job_queue --registrations 300 --notify-ms 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from backend.database.database import AsyncDatabase
+from backend.jobs.handlers import register_complaint_handlers, enqueue_registration_jobs
+from backend.jobs.queue import JobQueue, InMemoryJobStore, MongoJobStore
+from benchmarks.common import make_database, sample_complaint, percentile, print_table
+
+
+class SlowNotifier:
+    def __init__(self, delay_ms: float, failure_rate: float = 0.0):
+        self.delay = delay_ms / 1000.0
+        self.failure_rate = failure_rate
+        self.sent = 0
+
+    async def send(self, mobile: str, message: str):
+        await asyncio.sleep(self.delay)
+        if random.random() < self.failure_rate:
+            raise ConnectionError("gateway unavailable")
+        self.sent += 1
+
+
+async def run(mode: str, args, async_db: AsyncDatabase, store_kind: str):
+    notifier = SlowNotifier(args.notify_ms, args.failure_rate)
+    store = MongoJobStore(async_db.database.db.jobs) if store_kind == "mongo" else InMemoryJobStore()
+    if store_kind == "mongo":
+        store.ensure_indexes()
+    queue = JobQueue(store, workers=args.workers, retry_backoff=0.01, poll_interval=0.05)
+    register_complaint_handlers(queue, async_db, notifier)
+    queue.start()
+
+    latencies = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def register(i):
+        async with semaphore:
+            started = time.perf_counter()
+            complaint = sample_complaint(i)
+            complaint.pop("complaint_id")
+            created = await async_db.create_complaint(complaint)
+            if mode == "inline":
+                payload = {"complaint_id": created.complaint_id, "name": created.name, "mobile": created.mobile}
+                for kind in ("audit_complaint", "acknowledge_complaint"):
+                    try:
+                        await queue.handlers[kind](payload)
+                    except ConnectionError:
+                        pass
+            else:
+                await enqueue_registration_jobs(queue, created)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(register(i) for i in range(args.registrations)))
+    respond_s = time.perf_counter() - started
+    await queue.join(timeout=120)
+    drained_s = time.perf_counter() - started
+    stats = await queue.stats()
+    await queue.stop()
+    return {
+        "mode": f"{mode}/{store_kind}" if mode == "queued" else mode,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "respond_s": respond_s,
+        "drained_s": drained_s,
+        "acks_sent": notifier.sent,
+        "retried": stats["retried"],
+        "dead": stats["dead_lettered"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--registrations", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--notify-ms", type=float, default=50.0)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    db = make_database(latency_ms=args.latency_ms)
+    db.db.jobs.drop()
+    async_db = AsyncDatabase(db, max_workers=args.concurrency + args.workers)
+    rows = [
+        asyncio.run(run("inline", args, async_db, "memory")),
+        asyncio.run(run("queued", args, async_db, "memory")),
+    ]
+    if os.getenv("BENCH_MONGODB_URI"):
+        rows.append(asyncio.run(run("queued", args, async_db, "mongo")))
+    async_db.close()
+    print_table(f"{args.registrations} registrations, {args.notify_ms}ms notifier, "
+                f"{args.failure_rate:.0%} notifier failures", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Mixed API workload: registrations, status polls and mobile listings at several concurrency levels.
+
+Seeds --complaints complaints through the bulk endpoint, then for each
+--concurrency value runs that many closed-loop clients for --seconds.
+Lookups are skewed the way real traffic is: status polls follow a Zipf
+distribution (--skew) over complaints, newest hottest, and complaints are
+spread over mobiles with the same skew, so a few bulk filers have long
+listings. Reports requests/sec and p50/p95/p99 per operation.
+
+The app runs in-process on uvicorn unless --base-url points at a running
+server (e.g. python -m backend.api.serve, started with RATE_LIMIT=off since
+every client comes from one IP). In-process, client and server share one
+interpreter, so absolute numbers are a floor; compare runs of the same
+setup. mongomock is not thread-safe, so concurrent writes against it can
+fail (the errors column); set BENCH_MONGODB_URI for clean numbers. The
+complaint cache is off unless --cache is given.
+
+    python -m benchmarks.bench_load --concurrency 1 8 32 --seconds 10 --json load.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import (
+    cache_option, load_api_app, make_database, percentile, print_table, serve_in_thread, write_results,
+)
+
+OPERATIONS = ("register", "status", "mobile")
+WARDS = ["Andheri", "Bandra", "Kurla", "Dadar", "Powai", "Colaba", "Worli", "Malad"]
+PROBLEMS = [
+    "water leakage from the main pipeline", "streetlight not working since last week",
+    "garbage not collected for several days", "pothole causing accidents on the road",
+    "sewage overflowing into the street", "illegal parking blocking the footpath",
+]
+
+
+class ZipfSampler:
+    """Draws ranks 0..n-1 with probability proportional to 1 / (rank + 1) ** skew"""
+
+    def __init__(self, n: int, skew: float):
+        self.cumulative = list(accumulate(1.0 / (rank + 1) ** skew for rank in range(n)))
+
+    def sample(self, rng: random.Random) -> int:
+        return bisect_left(self.cumulative, rng.random() * self.cumulative[-1])
+
+
+def complaint_body(rng: random.Random, mobile: str) -> Dict[str, str]:
+    ward = rng.choice(WARDS)
+    return {
+        "name": f"Citizen {rng.randint(1, 10 ** 6)}",
+        "mobile": mobile,
+        "complaint_details": f"{rng.choice(PROBLEMS).capitalize()} near {ward} ward "
+                             f"lane {rng.randint(1, 500)}, house {rng.randint(1, 9999)}",
+    }
+
+
+async def seed(client: httpx.AsyncClient, args, mobiles: List[str]) -> List[str]:
+    rng = random.Random(args.seed)
+    owners = ZipfSampler(len(mobiles), args.skew)
+    body = "\n".join(json.dumps(complaint_body(rng, mobiles[owners.sample(rng)]))
+                     for _ in range(args.complaints))
+    response = await client.post("/api/bulk_register_complaints", content=body.encode(),
+                                 headers={"Content-Type": "application/x-ndjson"})
+    response.raise_for_status()
+    inserted = response.json()["complaint_ids"]
+    # Newest first, so the hottest Zipf ranks are the most recent complaints
+    return [item["complaint_id"] for item in reversed(inserted)]
+
+
+async def run_level(client: httpx.AsyncClient, args, concurrency: int,
+                    complaint_ids: List[str], mobiles: List[str]) -> List[Dict]:
+    latencies: Dict[str, List[float]] = {operation: [] for operation in OPERATIONS}
+    errors = dict.fromkeys(OPERATIONS, 0)
+    complaints = ZipfSampler(len(complaint_ids), args.skew)
+    owners = ZipfSampler(len(mobiles), args.skew)
+    weights = [args.register_share, 1 - args.register_share - args.mobile_share, args.mobile_share]
+    deadline = time.monotonic() + args.seconds
+
+    async def client_loop(rng: random.Random):
+        while time.monotonic() < deadline:
+            operation = rng.choices(OPERATIONS, weights)[0]
+            started = time.perf_counter()
+            try:
+                if operation == "register":
+                    response = await client.post("/api/register_complaint",
+                                                 json=complaint_body(rng, mobiles[owners.sample(rng)]))
+                elif operation == "status":
+                    response = await client.get(f"/api/complaint_status/{complaint_ids[complaints.sample(rng)]}")
+                else:
+                    response = await client.get(f"/api/complaints_by_mobile/{mobiles[owners.sample(rng)]}",
+                                                params={"limit": 20})
+                failed = response.status_code != 200
+            except httpx.HTTPError:
+                failed = True
+            latencies[operation].append((time.perf_counter() - started) * 1000)
+            errors[operation] += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop(random.Random(args.seed + n)) for n in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    rows = []
+    everything = [value for values in latencies.values() for value in values]
+    for operation, values in list(latencies.items()) + [("all", everything)]:
+        rows.append({
+            "concurrency": concurrency,
+            "operation": operation,
+            "requests": len(values),
+            "requests_per_s": len(values) / elapsed,
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+            "errors": sum(errors.values()) if operation == "all" else errors[operation],
+        })
+    return rows
+
+
+async def drive(base_url: str, args) -> List[Dict]:
+    mobiles = [f"9{n:09d}" for n in range(max(1, args.complaints // 4))]
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        complaint_ids = await seed(client, args, mobiles)
+        rows = []
+        for concurrency in args.concurrency:
+            rows += await run_level(client, args, concurrency, complaint_ids, mobiles)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--complaints", type=int, default=2000)
+    parser.add_argument("--register-share", type=float, default=0.1)
+    parser.add_argument("--mobile-share", type=float, default=0.2)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent; 0 is uniform")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated Mongo round trip (in-process only)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Serve status polls through the complaint cache, as the app does by default (in-process only)")
+    parser.add_argument("--base-url", help="Drive an already running server instead of an in-process one")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server, base_url = serve_in_thread(load_api_app(make_database(args.latency_ms, cache=cache_option(args.cache))))
+    try:
+        rows = asyncio.run(drive(base_url, args))
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    print_table(f"{args.complaints} seeded complaints, {args.register_share:.0%} registrations, "
+                f"{args.mobile_share:.0%} mobile listings, Zipf skew {args.skew}", rows)
+    if args.json:
+        write_results(args.json, "load", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Well-behaved client latency while a scraper hammers the API, with and without limits.
+
+--users clients, each from its own IP, poll complaint status at --user-rate
+requests/second. Meanwhile --abusers connections from a single IP list the
+complaints of one mobile in a tight loop and ignore Retry-After. The API
+runs twice in a server subprocess (so client load does not steal its CPU),
+bare and wrapped in RateLimitMiddleware: per-IP and per-mobile token
+buckets plus admission control. Client IPs are set with X-Forwarded-For,
+which uvicorn trusts from 127.0.0.1.
+
+    python -m benchmarks.bench_rate_limit --users 20 --abusers 16 --seconds 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+from backend.api.readiness import wait_until_ready
+from benchmarks.common import percentile, print_table, sample_complaint, write_results
+
+ABUSED_MOBILE = "9800000001"
+
+
+async def drive(base_url: str, args, kind: str, complaint_ids):
+    latencies, statuses = [], Counter()
+    deadline = time.monotonic() + args.seconds
+    limits = httpx.Limits(max_connections=args.users + args.abusers)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def request(path: str, ip: str):
+            started = time.perf_counter()
+            try:
+                response = await client.get(path, headers={"X-Forwarded-For": ip})
+                status = response.status_code
+            except httpx.HTTPError:
+                status = "error"
+            if status == 200:
+                latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] += 1
+
+        async def user(n: int):
+            rng = random.Random(n)
+            interval = 1.0 / args.user_rate
+            await asyncio.sleep(rng.random() * interval)
+            while time.monotonic() < deadline:
+                started = time.monotonic()
+                await request(f"/api/complaint_status/{rng.choice(complaint_ids)}", f"10.0.{n // 250}.{n % 250}")
+                await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+        async def abuser():
+            while time.monotonic() < deadline:
+                await request(f"/api/complaints_by_mobile/{ABUSED_MOBILE}?limit=50", "203.0.113.7")
+
+        if kind == "user":
+            await asyncio.gather(*(user(n) for n in range(args.users)))
+        else:
+            await asyncio.gather(*(abuser() for _ in range(args.abusers)))
+    return latencies, statuses
+
+
+def abuse(base_url: str, args, results: multiprocessing.Queue):
+    # Its own process, so the scraper's client work does not delay the users' event loop
+    results.put(asyncio.run(drive(base_url, args, "abuser", [])))
+
+
+def serve(args):
+    """Server subprocess: seed a mongomock database and run the app, bare or behind the limiter"""
+    # The app's own limiter stays off and its admission cap is lifted, so "off" is really unprotected
+    os.environ.update({"RATE_LIMIT": "off", "MAX_CONCURRENT_REQUESTS": str(10 ** 6), "SEARCH_BACKEND": "none"})
+    import uvicorn
+    from backend.api.ratelimit import MemoryBucketStore, RateLimitMiddleware
+    from benchmarks.common import load_api_app, make_database
+
+    db = make_database(args.latency_ms)
+    # The abused mobile has a long history, so each listing costs a real query
+    complaints = [sample_complaint(i) for i in range(args.complaints)]
+    for complaint in complaints[::5]:
+        complaint["mobile"] = ABUSED_MOBILE
+    db.create_complaints_bulk(complaints)
+    app = load_api_app(db)
+    if args.serve == "on":
+        app = RateLimitMiddleware(app, store=MemoryBucketStore(), enabled=True, max_concurrent=args.max_concurrent)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def run(label: str, args, complaint_ids):
+    command = [sys.executable, "-m", "benchmarks.bench_rate_limit", "--serve", label, "--port", str(args.port),
+               "--complaints", str(args.complaints), "--latency-ms", str(args.latency_ms),
+               "--max-concurrent", str(args.max_concurrent)]
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        if not wait_until_ready(base_url, 60):
+            raise RuntimeError("Benchmark server did not start")
+        results = multiprocessing.Queue()
+        abusers = multiprocessing.Process(target=abuse, args=(base_url, args, results))
+        abusers.start()
+        measured = {"user": asyncio.run(drive(base_url, args, "user", complaint_ids)), "abuser": results.get()}
+        abusers.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+    rows = []
+    for kind, (latencies, statuses) in measured.items():
+        rows.append({
+            "limits": label,
+            "client": kind,
+            "ok": statuses[200],
+            "429": statuses[429],
+            "503": statuses[503],
+            "other": sum(count for status, count in statuses.items() if status not in (200, 429, 503)),
+            "ok_per_s": statuses[200] / args.seconds,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--user-rate", type=float, default=2.0, help="Requests/second per user")
+    parser.add_argument("--abusers", type=int, default=16, help="Concurrent connections from the abusive IP")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--complaints", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Simulated Mongo round trip")
+    parser.add_argument("--max-concurrent", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--serve", choices=["off", "on"], help=argparse.SUPPRESS)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+    if args.serve:
+        serve(args)
+        return
+
+    complaint_ids = [f"CMP-{i:08d}" for i in range(args.complaints)]
+    rows = run("off", args, complaint_ids) + run("on", args, complaint_ids)
+    print_table(f"{args.users} users at {args.user_rate}/s vs {args.abusers} abusive connections "
+                f"(Mongo +{args.latency_ms} ms)", rows)
+    if args.json:
+        write_results(args.json, "rate_limit", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Search latency on a synthetic complaint corpus (1M complaints by default).
+
+Builds the local inverted index straight from generated documents, so it
+measures the index itself (build time, memory, query latency) rather than
+Mongo. With BENCH_MONGODB_URI set and --mongo-docs > 0, the same queries are
+also run through the MongoDB $text engine on a collection of that size
+(mongomock has no $text support).
+
+    python -m benchmarks.bench_search --docs 1000000 --queries 200
+"""
+import argparse
+import random
+import resource
+import time
+
+from backend.search.index import LocalSearchIndex
+from benchmarks.common import percentile, print_table
+
+ISSUES = [
+    "water leakage", "no water supply", "pipeline burst", "street light not working",
+    "garbage not collected", "pothole on the road", "sewage overflow", "drain blocked",
+    "power cut", "transformer sparking", "bus late", "stray dogs", "illegal parking",
+    "broken footpath", "mosquito breeding", "noise at night", "tree fallen",
+]
+PLACES = ["sector", "ward", "block", "phase", "lane"]
+DURATIONS = ["since yesterday", "for three days", "for a week", "since last month", "every evening"]
+FIRST_NAMES = [
+    "Rajesh", "Priya", "Sunita", "Amit", "Kavita", "Mohammed", "Anjali", "Suresh", "Deepak",
+    "Fatima", "Harpreet", "Lakshmi", "Arjun", "Meena", "Vikram", "Pooja", "Ramesh", "Sneha",
+]
+LAST_NAMES = [
+    "Kumar", "Sharma", "Verma", "Singh", "Patel", "Reddy", "Khan", "Iyer", "Gupta", "Das",
+    "Nair", "Joshi", "Mehta", "Rao", "Chatterjee", "Bose", "Yadav", "Mishra",
+]
+
+QUERIES = {
+    "one common word": "water",
+    "phrase + locality": "water leakage in sector 14",
+    "rare words": "transformer sparking ward 301",
+    "exact name": "Chatterjee",
+    "misspelled name": "Chaterjee",
+    "name + issue": "Harpreet pothole",
+}
+
+
+def synthetic_complaint(i: int, rng: random.Random):
+    details = (f"{rng.choice(ISSUES).capitalize()} in {rng.choice(PLACES)} {rng.randint(1, 500)} "
+               f"{rng.choice(DURATIONS)}")
+    # Roughly one in a hundred surnames is unique, like real data's long tail
+    surname = rng.choice(LAST_NAMES) if rng.random() > 0.01 else f"{rng.choice(LAST_NAMES)}{i}"
+    return f"CMP-{i:08d}", f"{rng.choice(FIRST_NAMES)} {surname}", details
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200, help="Runs of each query")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--mongo-docs", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    index = LocalSearchIndex()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    for i in range(args.docs):
+        complaint_id, name, details = synthetic_complaint(i, rng)
+        index.add(complaint_id, name, details)
+    build_s = time.perf_counter() - started
+    rss_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+    print(f"Indexed {args.docs} complaints in {build_s:.1f}s "
+          f"({args.docs / build_s:.0f}/s, ~{rss_mb:.0f} MB)")
+
+    rows = []
+    for label, query in QUERIES.items():
+        timings = []
+        for run in range(args.queries):
+            started = time.perf_counter()
+            # Every fifth run fetches the third page
+            results, _ = index.search(query, args.limit, offset=2 * args.limit if run % 5 == 4 else 0)
+            timings.append((time.perf_counter() - started) * 1000)
+        first, _ = index.search(query, 1)
+        rows.append({
+            "query": label,
+            "p50_ms": percentile(timings, 50),
+            "p95_ms": percentile(timings, 95),
+            "top_hit": first[0][0] if first else "-",
+        })
+    print_table(f"Local index, {args.docs} complaints, limit {args.limit}", rows)
+
+    if args.mongo_docs:
+        run_mongo(args, rng)
+
+
+def run_mongo(args, rng: random.Random):
+    import os
+    from backend.search.engines import MongoTextSearch
+    from benchmarks.common import make_database
+
+    if not os.getenv("BENCH_MONGODB_URI"):
+        print("\nSkipping $text: set BENCH_MONGODB_URI (mongomock has no $text support)")
+        return
+    db = make_database()
+    batch = []
+    for i in range(args.mongo_docs):
+        complaint_id, name, details = synthetic_complaint(i, rng)
+        batch.append({"complaint_id": complaint_id, "name": name, "mobile": f"98{i % 100000:08d}",
+                      "complaint_details": details, "status": "In Progress"})
+        if len(batch) == 10000:
+            db.create_complaints_bulk(batch)
+            batch = []
+    db.create_complaints_bulk(batch)
+    engine = MongoTextSearch(db)
+    engine.ensure_indexes()
+    rows = []
+    for label, query in QUERIES.items():
+        timings = []
+        for _ in range(max(1, args.queries // 10)):
+            started = time.perf_counter()
+            engine.search(query, args.limit)
+            timings.append((time.perf_counter() - started) * 1000)
+        rows.append({"query": label, "p50_ms": percentile(timings, 50), "p95_ms": percentile(timings, 95)})
+    print_table(f"MongoDB $text, {args.mongo_docs} complaints, limit {args.limit}", rows)
+
+
+if __name__ == "__main__":
+    main()
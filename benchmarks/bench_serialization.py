@@ -0,0 +1,133 @@
+"""Serialization cost of the status and mobile-listing responses, model path vs lean path.
+
+"models + json" is what the routes used to do: build Complaint (or
+ComplaintSummary) models from the Mongo document, copy them into the
+response payload, and let FastAPI validate it against the route's response
+model and encode it with the standard json module. "models + orjson" keeps
+the models but returns an ORJSONResponse directly. "lean + orjson" is the
+current path: the projected document goes straight into the payload and
+ORJSONResponse. No database is involved; documents are built in memory.
+
+    python -m benchmarks.bench_serialization --docs 1000 --repeat 20
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+
+from backend.api.api_server import StatusResponse, app
+from backend.api.payloads import complaints_page_payload, status_payload
+from backend.database.database import (
+    Complaint, ComplaintSummary, SUMMARY_PROJECTION, STATUS_DEFAULTS, STATUS_FIELDS,
+)
+from benchmarks.common import print_table, sample_complaint
+
+
+def make_documents(count: int):
+    now = datetime(2024, 5, 1, 9, 30, 15, 123000)
+    documents = []
+    for i in range(count):
+        document = sample_complaint(i)
+        document.update(_id=ObjectId(), category="water", priority="high", version=i % 3,
+                        created_at=now - timedelta(minutes=i), updated_at=now)
+        documents.append(document)
+    return documents
+
+
+def old_page_payload(summaries):
+    # complaints_page_payload before the lean path, over ComplaintSummary models
+    return {
+        "complaints": [
+            {"complaint_id": c.complaint_id, "status": c.status, "details": c.complaint_details,
+             "category": c.category, "priority": c.priority, "created_at": c.created_at}
+            for c in summaries
+        ],
+        "next_cursor": None,
+    }
+
+
+async def status_models_json(document, field):
+    model = StatusResponse(**status_payload(Complaint(**document)))
+    content = await serialize_response(field=field, response_content=model, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+async def status_models_orjson(document, field):
+    return ORJSONResponse(status_payload(Complaint(**document))).body
+
+
+async def status_lean_orjson(document, field):
+    fields = {name: document.get(name, STATUS_DEFAULTS.get(name)) for name in STATUS_FIELDS}
+    return ORJSONResponse(fields).body
+
+
+async def listing_models_json(documents):
+    payload = old_page_payload([ComplaintSummary(**document) for document in documents])
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+async def listing_models_orjson(documents):
+    return ORJSONResponse(old_page_payload([ComplaintSummary(**document) for document in documents])).body
+
+
+async def listing_lean_orjson(documents):
+    return ORJSONResponse(complaints_page_payload(documents, None)).body
+
+
+async def timed(call, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def measure(args):
+    documents = make_documents(args.docs)
+    status_documents = [{key: document[key] for key in STATUS_FIELDS} for document in documents]
+    summary_documents = [{key: document[key] for key in ["_id", *SUMMARY_PROJECTION]} for document in documents]
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/api/complaint_status/{complaint_id}")
+    field = route.secure_cloned_response_field
+
+    cases = [
+        ("models + json", status_models_json, documents, listing_models_json),
+        ("models + orjson", status_models_orjson, documents, listing_models_orjson),
+        ("lean + orjson", status_lean_orjson, status_documents, listing_lean_orjson),
+    ]
+    rows = []
+    for label, status, status_input, listing in cases:
+        async def statuses():
+            for document in status_input:
+                await status(document, field)
+
+        status_seconds = await timed(statuses, args.repeat)
+        listing_seconds = await timed(lambda: listing(summary_documents if label.startswith("lean") else documents),
+                                      args.repeat)
+        rows.append({
+            "path": label,
+            "status_us_per_doc": status_seconds / args.docs * 1e6,
+            f"listing_{args.docs}_ms": listing_seconds * 1000,
+        })
+    baseline = rows[0]
+    for row in rows:
+        row["status_speedup"] = baseline["status_us_per_doc"] / row["status_us_per_doc"]
+        row["listing_speedup"] = baseline[f"listing_{args.docs}_ms"] / row[f"listing_{args.docs}_ms"]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20, help="Best of this many runs is reported")
+    args = parser.parse_args()
+    print_table(f"Response serialization, {args.docs} documents (best of {args.repeat})", asyncio.run(measure(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Cold-start profile: import times of the entry points and API time to ready.
+
+Each module in --modules is imported --repeat times in a fresh interpreter
+with python -X importtime; the median is reported with the heaviest direct
+imports behind it. "app.py (eager)" is what app.py imports before its first
+render, without Streamlit itself. The API is then started --repeat times in
+a subprocess on a seeded mongomock database (BENCH_MONGODB_URI for a real
+one), timing process start to the first 200 from /healthz, and to the
+classifier being loaded, which now finishes in the background.
+
+--budget NAME=MS fails the run (exit 1) when a row's median is over budget,
+so a cold-start regression can break CI:
+
+    python -m benchmarks.bench_startup --repeat 5 --budget api_ready=3000 backend.api.api_server=1500
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import requests
+
+from backend.api.readiness import wait_until_ready
+from benchmarks.common import print_table, sample_complaint, write_results
+
+# Imported at the top of app.py (streamlit aside)
+APP_EAGER_IMPORTS = ["backend.api.readiness", "backend.observability.tracing"]
+DEFAULT_MODULES = ["app.py (eager)", "backend.api.api_server", "backend.agents.agents", "backend.agents.memory"]
+
+
+def import_profile(module: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """(total ms, [(direct import, cumulative ms)]) for one import in a fresh interpreter"""
+    targets = APP_EAGER_IMPORTS if module == "app.py (eager)" else [module]
+    statement = "; ".join(f"import {target}" for target in targets)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, env={**os.environ, "RATE_LIMIT": "off"})
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    total, children = 0.0, []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        if name in targets:
+            total += int(cumulative) / 1000
+        elif depth == 1:
+            children.append((name, int(cumulative) / 1000))
+    return total, sorted(children, key=lambda child: -child[1])
+
+
+def serve(args):
+    """Server subprocess: seed a database and run the app"""
+    os.environ["RATE_LIMIT"] = "off"
+    import uvicorn
+    from benchmarks.common import load_api_app, make_database
+
+    db = make_database()
+    db.create_complaints_bulk([sample_complaint(i) for i in range(args.complaints)])
+    uvicorn.run(load_api_app(db), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def api_startup(args) -> Dict[str, float]:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_startup", "--serve", "--port", str(port),
+                               "--complaints", str(args.complaints)], stdout=subprocess.DEVNULL)
+    try:
+        if not wait_until_ready(base_url, timeout=120, initial_delay=0.01, max_delay=0.05):
+            raise RuntimeError("API did not become ready")
+        ready = time.perf_counter() - started
+        while not requests.get(f"{base_url}/healthz").json()["classifier_loaded"]:
+            time.sleep(0.02)
+        classifier = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+    return {"api_ready": ready * 1000, "api_classifier_loaded": classifier * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=3, help="Heaviest direct imports listed per module")
+    parser.add_argument("--complaints", type=int, default=200, help="Complaints seeded before the API starts")
+    parser.add_argument("--budget", nargs="+", default=[], metavar="NAME=MS")
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+    if args.serve:
+        serve(args)
+        return
+
+    rows = []
+    for module in args.modules:
+        runs = [import_profile(module) for _ in range(args.repeat)]
+        children = runs[-1][1][:args.top]
+        rows.append({
+            "name": module,
+            "median_ms": statistics.median(total for total, _ in runs),
+            "max_ms": max(total for total, _ in runs),
+            "heaviest_imports": ", ".join(f"{name} {ms:.0f}" for name, ms in children),
+        })
+    startups = [api_startup(args) for _ in range(args.repeat)]
+    for name in ("api_ready", "api_classifier_loaded"):
+        rows.append({
+            "name": name,
+            "median_ms": statistics.median(startup[name] for startup in startups),
+            "max_ms": max(startup[name] for startup in startups),
+            "heaviest_imports": "",
+        })
+
+    budgets = dict(budget.split("=", 1) for budget in args.budget)
+    for row in rows:
+        budget = budgets.get(row["name"])
+        row["budget_ms"] = float(budget) if budget else ""
+    print_table(f"Cold start, median of {args.repeat}", rows)
+    if args.json:
+        write_results(args.json, "startup", vars(args), rows)
+
+    over = [row["name"] for row in rows if row["budget_ms"] != "" and row["median_ms"] > row["budget_ms"]]
+    unknown = sorted(set(budgets) - {row["name"] for row in rows})
+    if unknown:
+        print(f"Unknown budget names: {', '.join(unknown)}")
+    if over or unknown:
+        if over:
+            print(f"Over budget: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Dashboard statistics: rollup reads vs the naive aggregation pipeline.
+
+Seeds a collection of complaints spread over the last --history-days (some
+of them resolved), rebuilds the rollups, then times GET /api/stats-style
+reads both ways. It also measures what keeping the rollups current costs a
+registration and a status change, and checks that the incrementally updated
+counts still match a fresh aggregation.
+
+    python -m benchmarks.bench_stats --docs 5000 --reads 50
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from backend.database.database import CLOSED_STATUSES, STATUS_TRANSITIONS
+from backend.classification.seed_data import CATEGORIES
+from benchmarks.common import make_database, percentile, print_table, sample_complaint
+
+STATUSES = ["In Progress", "Assigned", "Resolved", "Closed"]
+
+
+def seed(db, args, rng: random.Random):
+    now = datetime.now()
+    batch = []
+    for i in range(args.docs):
+        document = sample_complaint(i)
+        created_at = now - timedelta(days=rng.uniform(0, args.history_days))
+        document.update(created_at=created_at, updated_at=created_at,
+                        status=rng.choice(STATUSES), category=rng.choice(list(CATEGORIES) + [None]))
+        if document["status"] in CLOSED_STATUSES:
+            document["resolved_at"] = min(now, created_at + timedelta(hours=rng.lognormvariate(3.5, 1.2)))
+        batch.append(document)
+    db.complaints.insert_many(batch)
+
+
+def naive_stats(collection, days: int):
+    """What /api/stats would cost computed from scratch on every request"""
+    since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
+    day = {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}}
+    result = next(collection.aggregate([{"$facet": {
+        "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+        "by_category": [{"$group": {"_id": "$category", "count": {"$sum": 1}}}],
+        "created": [{"$match": {"created_at": {"$gte": since}}}, {"$group": {"_id": day, "count": {"$sum": 1}}}],
+        "resolution": [
+            {"$match": {"resolved_at": {"$ne": None}}},
+            {"$project": {"hours": {"$divide": [{"$subtract": ["$resolved_at", "$created_at"]}, 3600000]}}},
+            {"$sort": {"hours": 1}},
+        ],
+    }}]))
+    hours = [document["hours"] for document in result["resolution"]]
+    return {
+        "by_status": {row["_id"]: row["count"] for row in result["by_status"]},
+        "by_category": {row["_id"] or "uncategorized": row["count"] for row in result["by_category"]},
+        "created": {row["_id"]: row["count"] for row in result["created"]},
+        "p50": percentile(hours, 50), "p90": percentile(hours, 90), "p95": percentile(hours, 95),
+    }
+
+
+def timed(func, runs: int):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--history-days", type=int, default=180)
+    parser.add_argument("--days", type=int, default=30, help="Days in the by_day series")
+    parser.add_argument("--reads", type=int, default=50)
+    parser.add_argument("--writes", type=int, default=100,
+                        help="Writes per row (mongomock slows down past a few thousand documents)")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    db = make_database()
+    # Only this process writes, so the rebuild need not wait for others to notice its marker
+    db.stats.marker_ttl = 0
+    seed(db, args, rng)
+    started = time.perf_counter()
+    db.stats.rebuild()
+    print(f"Rebuilt rollups from {args.docs} complaints in {time.perf_counter() - started:.2f}s")
+
+    rollup, rollup_ms = timed(lambda: db.get_stats(args.days), args.reads)
+    naive, naive_ms = timed(lambda: naive_stats(db.complaints, args.days), max(1, args.reads // 10))
+    print_table(f"Stats read, {args.docs} complaints, {args.days}-day series", [
+        {"source": "rollups", "p50_ms": percentile(rollup_ms, 50), "p95_ms": percentile(rollup_ms, 95),
+         "res_p50_h": rollup["resolution_hours"]["p50"], "res_p90_h": rollup["resolution_hours"]["p90"]},
+        {"source": "aggregation", "p50_ms": percentile(naive_ms, 50), "p95_ms": percentile(naive_ms, 95),
+         "res_p50_h": round(naive["p50"], 1), "res_p90_h": round(naive["p90"], 1)},
+    ])
+
+    rows = []
+    for enabled in (False, True):
+        db.listeners = [db.stats] if enabled else []
+        create_ms, update_ms = [], []
+        for i in range(args.writes):
+            document = sample_complaint(args.docs + len(rows) * args.writes + i)
+            started = time.perf_counter()
+            db.create_complaint(document)
+            create_ms.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            db.update_complaint_status(document["complaint_id"], rng.choice(STATUS_TRANSITIONS["In Progress"]))
+            update_ms.append((time.perf_counter() - started) * 1000)
+        rows.append({"rollups": "on" if enabled else "off",
+                     "create_p50_ms": percentile(create_ms, 50), "update_p50_ms": percentile(update_ms, 50)})
+    print_table(f"Write cost, {args.writes} registrations + status changes", rows)
+
+    # Writes made with the rollups detached are not counted; rebuild to square up, then compare
+    db.stats.rebuild()
+    db.listeners = [db.stats]
+    for i in range(args.writes):
+        document = sample_complaint(args.docs + 2 * args.writes + i)
+        db.create_complaint(document)
+        db.update_complaint_status(document["complaint_id"], rng.choice(STATUS_TRANSITIONS["In Progress"]))
+    rollup, naive = db.get_stats(args.days), naive_stats(db.complaints, args.days)
+    created = {row["date"]: row["created"] for row in rollup["by_day"] if row["created"]}
+    matches = (rollup["by_status"] == naive["by_status"] and rollup["by_category"] == naive["by_category"]
+               and created == naive["created"])
+    print(f"\nIncremental rollups match a fresh aggregation: {matches}")
+
+
+if __name__ == "__main__":
+    main()
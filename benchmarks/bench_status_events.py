@@ -0,0 +1,97 @@
+"""Status push: memory per idle subscriber, fan-out latency, and polling load avoided.
+
+Opens --subscribers SSE streams on the broker, one complaint each, plus
+--stalled subscribers that never read, all following the same few hot
+complaints. It then publishes --events status changes from a separate
+thread, the way pymongo writes and change streams do. Memory is traced
+while the streams are idle and again after the events. A stream's first
+event allocates its queue buffers, so the busy figure climbs until every
+stream has had one and then stays flat. The stalled subscribers show that a
+client that stops reading costs no more than one that keeps up.
+
+    python -m benchmarks.bench_status_events --subscribers 10000 --events 2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+
+from backend.events.broker import StatusBroker
+from benchmarks.common import percentile, print_table
+
+
+async def run(args):
+    loop = asyncio.get_running_loop()
+    broker = StatusBroker(max_subscribers=args.subscribers + args.stalled, queue_size=args.queue_size,
+                          heartbeat=3600)
+    broker.bind(loop)
+    complaint_ids = [f"CMP-{i:08d}" for i in range(args.subscribers)]
+    hot = complaint_ids[:10]
+    # Fixed-size ring, so the samples themselves don't show up as memory growth
+    latencies, received = [0.0] * 5000, [0]
+
+    async def consume(subscription):
+        async for chunk in broker.stream(subscription):
+            if chunk.startswith("id:"):
+                event = json.loads(chunk.split("data: ", 1)[1])
+                latencies[received[0] % len(latencies)] = (time.perf_counter() - event["sent"]) * 1000
+                received[0] += 1
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tasks = [asyncio.create_task(consume(broker.subscribe([complaint_id]))) for complaint_id in complaint_ids]
+    for i in range(args.stalled):
+        broker.subscribe([hot[i % len(hot)]])
+    await asyncio.sleep(0.5)
+    idle = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    def produce():
+        rng = random.Random(3)
+        for version in range(args.events):
+            # Half the changes hit the hot complaints the stalled subscribers follow
+            complaint_id = rng.choice(hot) if version % 2 else rng.choice(complaint_ids)
+            broker.publish([{"complaint_id": complaint_id, "mobile": None, "status": "Assigned",
+                             "version": version, "updated_at": None, "sent": time.perf_counter()}])
+            time.sleep(1 / args.rate)
+
+    tracemalloc.start()
+    before_events = tracemalloc.get_traced_memory()[0]
+    await loop.run_in_executor(None, produce)
+    await asyncio.sleep(0.5)
+    growth = tracemalloc.get_traced_memory()[0] - before_events
+    tracemalloc.stop()
+    broker.close()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    total = args.subscribers + args.stalled
+    print_table(f"{args.subscribers} streaming + {args.stalled} stalled subscribers", [{
+        "idle_kb_per_subscriber": idle / total / 1024,
+        "busy_kb_per_subscriber": (idle + growth) / total / 1024,
+        "delivered": broker.delivered,
+        "p50_delivery_ms": percentile(latencies[:received[0]], 50),
+        "p95_delivery_ms": percentile(latencies[:received[0]], 95),
+    }])
+    print_table(f"Load from {args.subscribers} clients watching one complaint each", [
+        {"approach": f"polling every {interval}s", "requests_per_s": args.subscribers / interval}
+        for interval in (5, 30)
+    ] + [{"approach": f"push at {args.rate} changes/s", "requests_per_s": 0.0}])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--stalled", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--rate", type=int, default=500, help="Status changes per second")
+    parser.add_argument("--queue-size", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
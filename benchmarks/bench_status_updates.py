@@ -0,0 +1,124 @@
+"""Status-update throughput under concurrent updaters, and single vs bulk transitions.
+
+The first table runs --threads updaters against a small set of hot
+complaints. Each one reads a complaint, picks a transition the state machine
+allows, and writes it with expected_version, re-reading and retrying on a
+VersionConflict. Afterwards the stored versions must add up to the number of
+successful updates, or an update was lost. mongomock does not make
+find_one_and_update atomic across threads, so run this against a real
+mongod (BENCH_MONGODB_URI) to check the no-lost-updates property.
+
+The second table moves --docs complaints one step along the lifecycle, first
+one call per complaint and then with bulk_update_status in --batch batches,
+with --latency-ms added to every collection call. mongomock scans the
+collection for every matched update, so at larger --docs its own CPU time
+hides the round trips that bulk_write saves.
+
+    python -m benchmarks.bench_status_updates --docs 1000 --threads 1 4 16
+"""
+import argparse
+import random
+import threading
+import time
+from datetime import datetime
+
+from backend.database.database import STATUS_TRANSITIONS, VersionConflict
+from benchmarks.common import make_database, percentile, print_table, sample_complaint
+
+# Closed is final; leaving it out keeps every hot complaint in play
+NEXT_STATUSES = {status: [t for t in targets if t != "Closed"] for status, targets in STATUS_TRANSITIONS.items()}
+
+
+def seed(db, count: int):
+    now = datetime.now()
+    db.complaints.insert_many([{**sample_complaint(i), "created_at": now, "updated_at": now} for i in range(count)])
+    return [f"CMP-{i:08d}" for i in range(count)]
+
+
+def contended(args):
+    rows = []
+    for threads in args.threads:
+        db = make_database()
+        hot = seed(db, args.hot)
+        latencies, counts, lock = [], {"ok": 0, "conflicts": 0, "errors": 0}, threading.Lock()
+
+        def updater(seed_value: int):
+            rng = random.Random(seed_value)
+            for _ in range(args.updates // threads):
+                complaint_id = rng.choice(hot)
+                started = time.perf_counter()
+                while True:
+                    current = db.complaints.find_one({"complaint_id": complaint_id}, {"status": 1, "version": 1})
+                    try:
+                        db.update_complaint_status(complaint_id, rng.choice(NEXT_STATUSES[current["status"]]),
+                                                   expected_version=current.get("version", 0))
+                        break
+                    except VersionConflict:
+                        with lock:
+                            counts["conflicts"] += 1
+                    except RuntimeError:
+                        # mongomock iterating a document another thread is changing
+                        with lock:
+                            counts["errors"] += 1
+                with lock:
+                    counts["ok"] += 1
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+        workers = [threading.Thread(target=updater, args=(n,)) for n in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        versions = sum(d.get("version", 0) for d in db.complaints.find({}, {"version": 1}))
+        rows.append({
+            "threads": threads,
+            "updates_per_s": counts["ok"] / elapsed,
+            "conflicts": counts["conflicts"],
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "lost_updates": counts["ok"] - versions,
+            "errors": counts["errors"],
+        })
+    print_table(f"{args.updates} CAS updates on {args.hot} hot complaints", rows)
+
+
+def lifecycle(args):
+    rows = []
+    for mode in ("single", "bulk"):
+        db = make_database(latency_ms=args.latency_ms)
+        complaint_ids = seed(db, args.docs)
+        started = time.perf_counter()
+        if mode == "single":
+            for complaint_id in complaint_ids:
+                db.update_complaint_status(complaint_id, "Assigned", expected_version=0)
+            failed = 0
+        else:
+            failed = 0
+            for start in range(0, len(complaint_ids), args.batch):
+                results = db.bulk_update_status([
+                    {"complaint_id": complaint_id, "status": "Assigned", "expected_version": 0}
+                    for complaint_id in complaint_ids[start:start + args.batch]
+                ])
+                failed += sum(not result["ok"] for result in results)
+        elapsed = time.perf_counter() - started
+        rows.append({"mode": mode, "seconds": elapsed, "updates_per_s": args.docs / elapsed, "failed": failed})
+    print_table(f"{args.docs} transitions, {args.latency_ms} ms per collection call, batch {args.batch}", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--hot", type=int, default=50, help="Complaints the updaters fight over")
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    contended(args)
+    lifecycle(args)
+
+
+if __name__ == "__main__":
+    main()
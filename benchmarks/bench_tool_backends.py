@@ -0,0 +1,70 @@
+"""Tool-call latency for the HTTP and in-process ComplaintTools backends.
+
+Correctness is checked by tests/test_tool_backends.py, which runs the same
+contract against both backends; this script only times them.
+
+    python -m benchmarks.bench_tool_backends --turns 300
+"""
+import argparse
+import time
+
+from backend.agents.agents import ComplaintTools
+from backend.agents.backends import HttpComplaintBackend
+from backend.agents.direct_backend import DirectComplaintBackend
+from benchmarks.common import make_database, load_api_app, serve_in_thread, percentile, print_table
+
+
+def seed(tools: ComplaintTools, mobile: str) -> str:
+    """Register the complaint whose lookups are timed; returns its ID"""
+    registered = tools.register_complaint(f"Asha Rao, {mobile}, Streetlight broken on 4th cross")
+    if "registered successfully" not in registered:
+        raise RuntimeError(f"Setup registration failed: {registered}")
+    return registered.rsplit(" ", 1)[-1]
+
+
+def measure(call, turns: int):
+    latencies = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=300)
+    args = parser.parse_args()
+
+    database = make_database()
+    server, base_url = serve_in_thread(load_api_app(database))
+    backends = {
+        "http": HttpComplaintBackend(base_url),
+        "direct": DirectComplaintBackend(database),
+    }
+
+    rows = []
+    for n, (name, backend) in enumerate(backends.items()):
+        tools = ComplaintTools(backend=backend)
+        # A mobile per backend, or the second registration would be flagged as a repeat
+        mobile = f"912345678{n}"
+        complaint_id = seed(tools, mobile)
+        for tool, call in (
+            ("status", lambda: tools.check_complaint_status(complaint_id)),
+            ("by_mobile", lambda: tools.get_complaints_by_mobile(mobile)),
+        ):
+            latencies = measure(call, args.turns)
+            rows.append({
+                "backend": name,
+                "tool": tool,
+                "mean_ms": sum(latencies) / len(latencies),
+                "p50_ms": percentile(latencies, 50),
+                "p95_ms": percentile(latencies, 95),
+            })
+
+    server.should_exit = True
+    print_table(f"Tool-call latency per turn, {args.turns} turns", rows)
+
+
+if __name__ == "__main__":
+    main()
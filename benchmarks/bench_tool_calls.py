@@ -0,0 +1,101 @@
+"""Per-tool-call latency: one-off requests.get vs the pooled ComplaintTools session.
+
+Runs against a local stub of the complaint API so only client-side
+connection handling is measured.
+
+    python -m benchmarks.bench_tool_calls --calls 500
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from backend.agents.agents import ComplaintTools
+from backend.agents.backends import HttpComplaintBackend
+from benchmarks.common import percentile, print_table
+
+STATUS = {
+    "complaint_id": "CMP-00000001",
+    "status": "In Progress",
+    "created_at": "2024-01-01T00:00:00",
+    "updated_at": "2024-01-01T00:00:00",
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment, otherwise delayed ACKs dominate
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = json.dumps(STATUS).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def measure(call, calls: int):
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(name, latencies):
+    return {
+        "client": name,
+        "mean_ms": sum(latencies) / len(latencies),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server()
+    tools = ComplaintTools(api_base_url=base_url, backend=HttpComplaintBackend(base_url))
+
+    rows = [
+        summarize("requests.get", measure(
+            lambda: requests.get(f"{base_url}/api/complaint_status/CMP-00000001"), args.calls)),
+        summarize("pooled session", measure(
+            lambda: tools.check_complaint_status("CMP-00000001"), args.calls)),
+    ]
+
+    async def async_calls():
+        latencies = []
+        for _ in range(args.calls):
+            start = time.perf_counter()
+            await tools.acheck_complaint_status("CMP-00000001")
+            latencies.append((time.perf_counter() - start) * 1000)
+        await tools.backend.aclose()
+        return latencies
+
+    rows.append(summarize("async client", asyncio.run(async_calls())))
+    server.shutdown()
+    print_table(f"check_complaint_status, {args.calls} sequential calls", rows)
+
+
+if __name__ == "__main__":
+    main()
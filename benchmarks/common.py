@@ -0,0 +1,150 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a local mongod when ``BENCH_MONGODB_URI`` is set and
+fall back to mongomock otherwise, so they work without Atlas credentials.
+"""
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+from backend.database.database import CACHE_FROM_ENV, Database
+from backend.database.migrate import ensure_indexes
+
+
+class SlowCollection:
+    """Proxy that adds a fixed delay to every collection call.
+
+    mongomock answers in microseconds, which hides the cost of a network round
+    trip. Sleeping releases the GIL just like waiting on a socket does, so the
+    proxy is a reasonable stand-in for Atlas latency.
+    """
+
+    def __init__(self, collection, latency_ms: float):
+        self._collection = collection
+        self._latency = latency_ms / 1000.0
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            time.sleep(self._latency)
+            return attr(*args, **kwargs)
+        return call
+
+
+def cache_option(enabled: bool):
+    """make_database's cache for a benchmark's --cache flag"""
+    return CACHE_FROM_ENV if enabled else None
+
+
+def make_client():
+    uri = os.getenv("BENCH_MONGODB_URI")
+    if uri:
+        from pymongo import MongoClient
+        return MongoClient(uri)
+    import mongomock
+    return mongomock.MongoClient()
+
+
+def make_database(latency_ms: float = 0.0, client=None, cache: Any = None) -> Database:
+    """Build a Database on a fresh benchmark collection.
+
+    The complaint cache is off unless ``cache`` is given (CACHE_FROM_ENV for the
+    app's default), so reads measure the round trip rather than a dict lookup.
+    """
+    client = client or make_client()
+    database = client[os.getenv("DATABASE_NAME", "grievance_db")]
+    database.complaints.drop()
+    database.stats_rollups.drop()
+    database.stats_rollups_journal.drop()
+    db = Database(client=client, cache=cache)
+    ensure_indexes(db)
+    if latency_ms:
+        db.complaints = SlowCollection(db.complaints, latency_ms)
+    return db
+
+
+def sample_complaint(i: int) -> Dict[str, Any]:
+    return {
+        "complaint_id": f"CMP-{i:08d}",
+        "name": f"Citizen {i}",
+        "mobile": f"98{i % 100000:08d}",
+        "complaint_details": f"Water leakage near block {i % 50} for the last {i % 7 + 1} days",
+        "status": "In Progress"
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_table(title: str, rows: List[Dict[str, Any]], columns: Optional[List[str]] = None):
+    columns = columns or list(rows[0].keys())
+
+    def cell(value):
+        return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+    widths = [max([len(c)] + [len(cell(row.get(c, ""))) for row in rows]) for c in columns]
+    print(f"\n{title}")
+    print(" | ".join(c.rjust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print(" | ".join(cell(row.get(c, "")).rjust(w) for c, w in zip(columns, widths)))
+
+
+def write_results(path: str, benchmark: str, params: Dict[str, Any], rows: List[Dict[str, Any]]):
+    """Save a run as JSON so results can be compared across commits and machines"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    run = {
+        "benchmark": benchmark,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "mongo": "mongod" if os.getenv("BENCH_MONGODB_URI") else "mongomock",
+        "params": params,
+        "results": rows,
+    }
+    with open(path, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"\nResults written to {path}")
+
+
+def load_api_app(database: Database):
+    """The FastAPI app, set up by its lifespan on ``database`` instead of a new client"""
+    # Every benchmark client shares 127.0.0.1; bench_rate_limit applies the limits itself
+    os.environ.setdefault("RATE_LIMIT", "off")
+    from backend.api import api_server
+    api_server.app.state.database = database
+    return api_server.app
+
+
+def serve_in_thread(app):
+    """Run an ASGI app with uvicorn on a free local port; returns (server, base_url)"""
+    import socket
+    import threading
+    import uvicorn
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    # Set should_exit and join server.thread to wait for the lifespan shutdown
+    server.thread = threading.Thread(target=server.run, daemon=True)
+    server.thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
@@ -0,0 +1,26 @@
+import os
+
+# Before the app is imported: the limiter and the search index are not under test here
+os.environ.setdefault("RATE_LIMIT", "off")
+os.environ.setdefault("SEARCH_BACKEND", "none")
+os.environ.setdefault("JOB_QUEUE_BACKEND", "memory")
+# Operator routes need it: TestClient connects from "testclient", not loopback
+os.environ.setdefault("INTERNAL_API_TOKEN", "test-internal-token")
+
+import mongomock
+import pytest
+
+
+@pytest.fixture
+def api():
+    """TestClient on the API over a fresh mongomock Database, exposed as client.database"""
+    from fastapi.testclient import TestClient
+    from backend.api import api_server
+    from backend.database.database import Database
+
+    database = Database(client=mongomock.MongoClient())
+    api_server.app.state.database = database
+    with TestClient(api_server.app) as client:
+        client.database = database
+        yield client
+    api_server.app.state.database = None
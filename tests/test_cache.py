@@ -0,0 +1,143 @@
+import fnmatch
+
+import mongomock
+
+from backend.database.cache import RedisCache, TTLCache
+from backend.database.database import Complaint, Database
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """The get/setex/delete/scan_iter subset of redis-py that RedisCache uses, with expiry"""
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.values = {}
+
+    def get(self, key):
+        value, expires_at = self.values.get(key, (None, None))
+        if value is not None and expires_at <= self.clock():
+            del self.values[key]
+            return None
+        return value
+
+    def setex(self, key, seconds, value):
+        assert isinstance(seconds, int) and seconds >= 1
+        self.values[key] = (value.encode(), self.clock() + seconds)
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+    def scan_iter(self, pattern):
+        return [key for key in list(self.values) if fnmatch.fnmatch(key, pattern)]
+
+
+def make_database(cache) -> Database:
+    return Database(client=mongomock.MongoClient(), cache=cache)
+
+
+def register(database: Database, n: int = 0) -> str:
+    return database.create_complaint({
+        "name": "Asha Rao", "mobile": f"91234567{n:02d}", "complaint_details": f"Complaint {n}",
+        "status": "In Progress",
+    }).complaint_id
+
+
+def test_entries_expire_after_the_ttl():
+    clock = Clock()
+    cache = TTLCache(ttl_seconds=30, clock=clock)
+    cache.set("a", 1)
+    clock.now += 29.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert cache.stats.as_dict() == {"hits": 1, "misses": 1, "evictions": 1, "invalidations": 0, "hit_rate": 0.5}
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = TTLCache(max_size=2, clock=Clock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert len(cache) == 2 and cache.stats.evictions == 1
+
+
+def test_delete_counts_only_entries_that_were_there():
+    cache = TTLCache(clock=Clock())
+    cache.set("a", 1)
+    cache.delete("a")
+    cache.delete("a")
+    assert cache.get("a") is None and cache.stats.invalidations == 1
+
+
+def test_reads_come_from_the_cache_once_warm():
+    database = make_database(TTLCache())
+    complaint_id = register(database)
+    database.cache.clear()
+    database.get_complaint_by_id(complaint_id)
+    # Changed behind the cache's back: a hit still returns the cached copy
+    database.complaints.update_one({"complaint_id": complaint_id}, {"$set": {"complaint_details": "edited"}})
+    assert database.get_complaint_by_id(complaint_id).complaint_details == "Complaint 0"
+    assert database.cache.stats.hits == 1
+
+
+def test_status_updates_refresh_or_invalidate_the_cached_complaint():
+    database = make_database(TTLCache())
+    single, bulk = register(database, 0), register(database, 1)
+    database.get_complaint_by_id(single)
+    database.get_complaint_by_id(bulk)
+
+    database.update_complaint_status(single, "Assigned")
+    assert database.get_status_fields(single)["status"] == "Assigned"
+
+    database.bulk_update_status([{"complaint_id": bulk, "status": "Closed"}])
+    assert database.cache.stats.invalidations == 1
+    assert database.get_status_fields(bulk)["status"] == "Closed"
+
+    # An update for an ID that no longer exists drops any stale copy
+    database.complaints.delete_one({"complaint_id": single})
+    assert database.update_complaint_status(single, "Resolved") is None
+    assert database.get_complaint_by_id(single) is None
+
+
+def make_redis_cache(clock: Clock) -> RedisCache:
+    # The encode/decode pair Database uses when it builds the cache itself
+    return RedisCache(FakeRedis(clock), ttl_seconds=30, prefix="complaint:",
+                      encode=lambda c: c.model_dump_json(by_alias=True), decode=Complaint.model_validate_json)
+
+
+def test_redis_cache_round_trips_complaints_and_expires_them():
+    clock = Clock()
+    database = make_database(make_redis_cache(clock))
+    complaint_id = register(database)
+    cached = database.cache.get(complaint_id)
+    assert isinstance(cached, Complaint)
+    assert cached == database.get_complaint_by_id(complaint_id)
+    assert list(database.cache.client.values) == [f"complaint:{complaint_id}"]
+    clock.now += 30
+    assert database.cache.get(complaint_id) is None
+
+
+def test_redis_cache_drops_values_it_cannot_decode():
+    cache = make_redis_cache(Clock())
+    cache.client.values["complaint:CMP-1"] = (b"not json", float("inf"))
+    assert cache.get("CMP-1") is None
+    assert "complaint:CMP-1" not in cache.client.values
+    assert (cache.stats.evictions, cache.stats.misses) == (1, 1)
+
+
+def test_redis_cache_clear_only_touches_its_prefix():
+    cache = make_redis_cache(Clock())
+    cache.client.values["other:key"] = (b"1", float("inf"))
+    cache.client.values["complaint:CMP-1"] = (b"{}", float("inf"))
+    cache.clear()
+    assert list(cache.client.values) == ["other:key"]
@@ -0,0 +1,22 @@
+import mongomock
+
+from backend.database.cache import TTLCache
+from backend.database.database import Database
+
+
+def make_database(cache=None) -> Database:
+    return Database(client=mongomock.MongoClient(), cache=cache)
+
+
+def test_status_is_the_same_from_cache_and_from_mongo():
+    database = make_database(cache=TTLCache())
+    created = database.create_complaint({
+        "name": "Asha Rao", "mobile": "9123456780", "complaint_details": "Streetlight broken", "status": "In Progress"
+    })
+    assert created.created_at.microsecond % 1000 == 0
+    assert created.created_at == created.updated_at
+
+    cached = database.get_status_fields(created.complaint_id)
+    database.cache.clear()
+    stored = database.get_status_fields(created.complaint_id)
+    assert cached == stored
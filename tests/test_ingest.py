@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from backend.api import ingest
+from backend.api.ingest import iter_json_records
+
+
+def parse(*chunks):
+    """Every (record, error) pair for a body arriving as these chunks"""
+    async def stream():
+        for chunk in chunks:
+            yield chunk.encode() if isinstance(chunk, str) else chunk
+
+    async def collect():
+        return [pair async for pair in iter_json_records(stream())]
+
+    return asyncio.run(collect())
+
+
+def records(pairs):
+    return [record for record, error in pairs if error is None]
+
+
+def errors(pairs):
+    return [error for _, error in pairs if error is not None]
+
+
+@pytest.mark.parametrize("chunks", [
+    ['[{"a": 1}, {"a": 2}, 3]'],
+    ['[{"a"', ': 1}', ',', ' {"a": 2', '}, 3', ']'],
+    ['  [\n', '{"a": 1},{"a": 2},', '3]\n  '],
+])
+def test_array_split_across_chunks(chunks):
+    assert parse(*chunks) == [({"a": 1}, None), ({"a": 2}, None), (3, None)]
+
+
+def test_ndjson_split_across_chunks_and_multibyte_characters():
+    body = '{"name": "Aśha"}\n\n{"name": "Ravi"}'.encode()
+    cut = body.index(b"\xc5") + 1
+    assert records(parse(body[:cut], body[cut:])) == [{"name": "Aśha"}, {"name": "Ravi"}]
+
+
+def test_a_number_cut_by_a_chunk_boundary_is_read_whole():
+    assert records(parse("[12", "34]")) == [1234]
+
+
+def test_empty_bodies():
+    assert parse("") == []
+    assert parse("[ ]") == []
+
+
+def test_malformed_ndjson_line_fails_only_that_record():
+    pairs = parse('{"a": 1}\n{"a": \n{"a": 3}\n')
+    assert records(pairs) == [{"a": 1}, {"a": 3}]
+    assert errors(pairs)[0].startswith("Invalid JSON")
+
+
+def test_malformed_array_element_ends_the_stream():
+    pairs = parse('[{"a": 1}, {"a": }, {"a": 3}]')
+    assert records(pairs) == [{"a": 1}]
+    assert len(errors(pairs)) == 1 and errors(pairs)[0].startswith("Invalid JSON")
+
+
+@pytest.mark.parametrize("body, parsed", [
+    ('[{"a": 1} {"a": 2}]', [{"a": 1}]),
+    ('[1 2]', [1]),
+    ('[1,, 2]', [1]),
+    ('[1, 2,]', [1, 2]),
+    ('[,1]', []),
+])
+def test_array_separators_are_enforced(body, parsed):
+    pairs = parse(body)
+    assert records(pairs) == parsed
+    assert len(errors(pairs)) == 1 and errors(pairs)[0].startswith("Invalid JSON")
+
+
+@pytest.mark.parametrize("tail", ['garbage', '[3]', ', 3', '}'])
+def test_trailing_data_after_the_array_is_rejected(tail):
+    pairs = parse('[1, 2]', ' ' + tail)
+    assert records(pairs) == [1, 2]
+    assert errors(pairs) == ["Unexpected data after the JSON array"]
+
+
+def test_unterminated_array():
+    assert errors(parse('[1, 2')) == ["Unterminated JSON array"]
+
+
+def test_oversized_ndjson_line_is_skipped_without_buffering_it(monkeypatch):
+    monkeypatch.setattr(ingest, "MAX_RECORD_CHARS", 100)
+    long_line = '{"details": "' + "x" * 500 + '"}'
+    chunks = ['{"a": 1}\n'] + [long_line[i:i + 40] for i in range(0, len(long_line), 40)] + ['\n{"a": 2}\n']
+    pairs = parse(*chunks)
+    assert records(pairs) == [{"a": 1}, {"a": 2}]
+    assert errors(pairs) == ["Record longer than 100 characters"]
+
+
+def test_oversized_last_line_without_newline(monkeypatch):
+    monkeypatch.setattr(ingest, "MAX_RECORD_CHARS", 100)
+    assert errors(parse('{"a": 1}\n', "y" * 300)) == ["Record longer than 100 characters"]
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import mongomock
+
+from backend.jobs.queue import InMemoryJobStore, JobQueue, MongoJobStore
+
+
+def test_a_job_outliving_its_lease_is_not_claimed_again():
+    collection = mongomock.MongoClient().db.jobs
+    # mongomock is not thread-safe, so the store gets a single thread
+    store = MongoJobStore(collection, lease_seconds=0.3, executor=ThreadPoolExecutor(1))
+    runs = []
+
+    async def slow(payload):
+        runs.append(payload)
+        await asyncio.sleep(1.0)
+
+    async def scenario():
+        queue = JobQueue(store, workers=2, poll_interval=0.05)
+        queue.register("slow", slow, timeout=5)
+        queue.start()
+        job = await queue.enqueue("slow", {"n": 1})
+        await asyncio.sleep(0.1)
+        await queue.join(timeout=5)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert runs == [{"n": 1}]
+    document = collection.find_one({"_id": job.id})
+    assert document["status"] == "done" and document["attempts"] == 1
+
+
+def run_queue(register, enqueue, **options):
+    """Run a queue over an InMemoryJobStore until it has nothing left to do"""
+    store = InMemoryJobStore()
+
+    async def scenario():
+        queue = JobQueue(store, **{"workers": 1, "poll_interval": 0.01, **options})
+        register(queue)
+        queue.start()
+        job = await enqueue(queue)
+        await queue.join(timeout=5)
+        await queue.stop()
+        return queue, job
+
+    queue, job = asyncio.run(scenario())
+    return queue, store, job
+
+
+def test_failures_are_retried_with_exponential_backoff():
+    attempts = []
+
+    async def flaky(payload):
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise ConnectionError("upstream down")
+
+    queue, store, job = run_queue(lambda q: q.register("flaky", flaky),
+                                  lambda q: q.enqueue("flaky", {}), max_attempts=5, retry_backoff=0.05)
+    assert len(attempts) == 3 and job.status == "done" and job.attempts == 3
+    assert job.last_error == "ConnectionError: upstream down"
+    gaps = [later - earlier for earlier, later in zip(attempts, attempts[1:])]
+    assert gaps[0] >= 0.05 and gaps[1] >= 0.1
+    assert (queue.metrics.retried, queue.metrics.completed, queue.metrics.dead_lettered) == (2, 1, 0)
+
+
+def test_a_job_failing_every_attempt_is_dead_lettered():
+    async def broken(payload):
+        raise ValueError("bad payload")
+
+    queue, store, job = run_queue(lambda q: q.register("broken", broken),
+                                  lambda q: q.enqueue("broken", {"n": 1}), max_attempts=3, retry_backoff=0.01)
+    assert (job.status, job.attempts, job.last_error) == ("dead", 3, "ValueError: bad payload")
+    assert list(store.dead) == [job]
+    assert (queue.metrics.retried, queue.metrics.dead_lettered) == (2, 1)
+
+
+def test_a_handler_past_its_timeout_counts_as_a_failure():
+    calls = []
+
+    async def hangs(payload):
+        calls.append(payload)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+
+    # The per-kind timeout overrides the queue-wide one
+    queue, store, job = run_queue(lambda q: q.register("hangs", hangs, timeout=0.05),
+                                  lambda q: q.enqueue("hangs", {}), max_attempts=2, retry_backoff=0.01, timeout=10)
+    assert len(calls) == 2 and job.status == "done"
+    assert job.last_error == "TimeoutError"
+
+
+def test_a_job_with_no_handler_is_dead_lettered_at_once():
+    async def enqueue(queue):
+        job = await queue.enqueue("known", {})
+        del queue.handlers["known"]
+        return job
+
+    async def known(payload):
+        pass
+
+    queue, store, job = run_queue(lambda q: q.register("known", known), enqueue, max_attempts=5)
+    assert (job.status, job.attempts) == ("dead", 1)
+    assert job.last_error == "LookupError: No handler registered for job kind: known"
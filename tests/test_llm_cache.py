@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, FunctionMessage, HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI
+
+from backend.agents.fake_llm import FakeStreamingChatModel
+from backend.agents.llm_cache import CachedChatOpenAI, HashingEmbedder, ResponseCache
+
+LLM = "gpt-3.5-turbo temperature=0"
+SYSTEM = SystemMessage(content="You are a grievance assistant.")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def ask(cache: ResponseCache, llm: FakeStreamingChatModel, text: str, history=(SYSTEM,)) -> str:
+    """One turn through the cache, with the fake model answering the misses"""
+    messages = [*history, HumanMessage(content=text)]
+    cached = cache.lookup(messages, LLM)
+    if cached is not None:
+        return cached.content
+    reply = llm.invoke(messages)
+    cache.store(messages, LLM, reply)
+    return reply.content
+
+
+def make_cache(**options) -> ResponseCache:
+    return ResponseCache(**{"clock": Clock(), "ttl_seconds": 60, **options})
+
+
+def test_exact_tier_ignores_case_spacing_and_trailing_punctuation():
+    cache = make_cache()
+    llm = FakeStreamingChatModel(responses=["first", "second"])
+    assert ask(cache, llm, "How do I register a complaint?") == "first"
+    assert ask(cache, llm, "  how do I  register a complaint ") == "first"
+    # Another history, or another model configuration, is another prompt
+    assert ask(cache, llm, "How do I register a complaint?", history=()) == "second"
+    assert cache.lookup([SYSTEM, HumanMessage(content="How do I register a complaint?")], "gpt-4") is None
+    assert cache.stats()["exact_hits"] == 1 and llm.index == 2
+
+
+def test_semantic_tier_matches_rephrasings_above_the_threshold():
+    llm = FakeStreamingChatModel(responses=["first", "second", "third"])
+    cache = make_cache(embedder=HashingEmbedder(), similarity=0.8)
+    assert ask(cache, llm, "how do i register a complaint") == "first"
+    assert ask(cache, llm, "how do i register a complaint please") == "first"
+    assert ask(cache, llm, "what are your office hours") == "second"
+    assert (cache.counters.exact_hits, cache.counters.semantic_hits, cache.counters.misses) == (0, 1, 2)
+
+    strict = make_cache(embedder=HashingEmbedder(), similarity=0.99)
+    ask(strict, llm, "how do i register a complaint")
+    assert strict.lookup([SYSTEM, HumanMessage(content="how do i register a complaint please")], LLM) is None
+
+
+def test_semantic_hits_never_swap_identifiers():
+    llm = FakeStreamingChatModel(responses=["about the first", "about the second"])
+    cache = make_cache(embedder=HashingEmbedder(), similarity=0.5)
+    assert ask(cache, llm, "what happened to CMP-01M56CBCZT9WSFF9") == "about the first"
+    assert ask(cache, llm, "what happened to CMP-01M56CBCZT9WSFF8") == "about the second"
+
+
+def test_both_tiers_expire_after_the_ttl():
+    clock = Clock()
+    llm = FakeStreamingChatModel(responses=["first", "second"])
+    cache = ResponseCache(ttl_seconds=60, clock=clock, embedder=HashingEmbedder(), similarity=0.8)
+    ask(cache, llm, "how do i register a complaint")
+    clock.now += 59
+    assert ask(cache, llm, "how do i register a complaint please") == "first"
+    clock.now += 1
+    assert ask(cache, llm, "how do i register a complaint") == "second"
+    assert ask(cache, llm, "how do i register a complaint please") == "second"
+
+
+def test_tool_results_and_function_calls_are_not_cached():
+    cache = make_cache()
+    call = AIMessage(content="", additional_kwargs={"function_call": {"name": "register_complaint",
+                                                                      "arguments": "{}"}})
+    prompt = [SYSTEM, HumanMessage(content="Asha, 9123456780, streetlight broken")]
+    cache.store(prompt, LLM, call)
+    assert cache.lookup(prompt, LLM) is None
+
+    with_tool_output = [SYSTEM, FunctionMessage(name="check_complaint_status", content="Assigned"),
+                        HumanMessage(content="and now?")]
+    cache.store(with_tool_output, LLM, AIMessage(content="It is assigned."))
+    assert cache.lookup(with_tool_output, LLM) is None
+    assert cache.stats()["uncacheable"] == 1
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """Serve ChatOpenAI's calls from a FakeStreamingChatModel instead of the API"""
+    llm = FakeStreamingChatModel(responses=["Hello there!", "Something else"])
+
+    def generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return llm._generate(messages, stop=stop, run_manager=run_manager)
+
+    async def agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return llm._generate(messages, stop=stop)
+
+    monkeypatch.setattr(ChatOpenAI, "_generate", generate)
+    monkeypatch.setattr(ChatOpenAI, "_agenerate", agenerate)
+    return llm
+
+
+def test_cached_chat_model_answers_repeats_without_calling_the_api(fake_openai):
+    cache = make_cache()
+    chat = CachedChatOpenAI(openai_api_key="test", response_cache=cache)
+    prompt = [SYSTEM, HumanMessage(content="hi")]
+    assert chat.invoke(prompt).content == "Hello there!"
+    assert chat.invoke(prompt).content == "Hello there!"
+    assert asyncio.run(chat.ainvoke(prompt)).content == "Hello there!"
+    assert fake_openai.index == 1 and cache.stats()["exact_hits"] == 2
@@ -0,0 +1,73 @@
+from langchain_core.messages import SystemMessage
+
+from backend.agents.fake_llm import FakeStreamingChatModel
+from backend.agents.memory import MAX_PINNED_IDS, create_memory
+
+SUMMARY = "The user registered a streetlight complaint."
+
+
+def make_memory(max_token_limit: int = 1200):
+    # The fake model writes every summary, and estimates a token per four characters
+    return create_memory(llm=FakeStreamingChatModel(responses=[SUMMARY]), max_token_limit=max_token_limit)
+
+
+def turn(memory, user_input: str, output: str = "Noted."):
+    memory.save_context({"input": user_input}, {"output": output})
+
+
+def history(memory):
+    return memory.load_memory_variables({})["chat_history"]
+
+
+def test_turns_within_the_budget_are_kept_verbatim():
+    memory = make_memory()
+    turn(memory, "Hello")
+    turn(memory, "How do I register a complaint?")
+    messages = history(memory)
+    assert [message.content for message in messages] == [
+        "Hello", "Noted.", "How do I register a complaint?", "Noted."
+    ]
+    assert memory.llm.index == 0 and memory.moving_summary_buffer == ""
+
+
+def test_going_over_the_budget_summarises_the_oldest_turns():
+    memory = make_memory(max_token_limit=40)
+    for n in range(6):
+        turn(memory, f"Turn {n}: the streetlight on 4th cross is still broken, please help", "We are on it.")
+    assert memory.llm.index >= 1
+    assert memory.moving_summary_buffer == SUMMARY
+    assert memory.llm.get_num_tokens_from_messages(memory.chat_memory.messages) <= 40
+    messages = history(memory)
+    assert messages[0].content == SUMMARY
+    assert messages[-2].content.startswith("Turn 5:")
+    assert not any(message.content.startswith("Turn 0:") for message in messages)
+
+
+def test_pinned_facts_survive_summarisation():
+    memory = make_memory(max_token_limit=20)
+    turn(memory, "Asha Rao, 9123456780, Streetlight broken on 4th cross",
+         "Registered as CMP-01M56CBCZT9WSFF9.")
+    for n in range(5):
+        turn(memory, f"Any update on the repair crew, day {n}?", "Not yet, sorry.")
+    assert memory.moving_summary_buffer == SUMMARY
+    pinned = history(memory)[0]
+    assert isinstance(pinned, SystemMessage)
+    assert pinned.content == ("Details the user has already shared:\nName: Asha Rao\nMobile: 9123456780\n"
+                              "Complaint IDs: CMP-01M56CBCZT9WSFF9")
+    assert "Asha Rao" not in "".join(str(message.content) for message in memory.chat_memory.messages)
+
+
+def test_facts_take_the_latest_mentions():
+    memory = make_memory()
+    turn(memory, "I am not happy with the service")
+    assert "name" not in memory.pinned_facts
+    turn(memory, "My name is asha rao")
+    turn(memory, "Call me on +91 9123456780")
+    turn(memory, "Sorry, use 9123456781 instead")
+    ids = [f"CMP-{n:08d}" for n in range(MAX_PINNED_IDS + 2)]
+    turn(memory, " ".join(ids[:-1]), f"Also {ids[-1]}, and {ids[0].lower()} again")
+    assert memory.pinned_facts == {
+        "name": "Asha Rao", "mobile": "9123456781", "complaint_ids": ids[3:] + [ids[0]],
+    }
+    memory.clear()
+    assert memory.pinned_facts == {} and history(memory) == []
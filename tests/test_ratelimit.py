@@ -0,0 +1,114 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.ratelimit import (
+    INTERNAL_TOKEN_HEADER, MemoryBucketStore, RateLimitMiddleware, bucket_limit, is_internal_request
+)
+
+TOKEN = "internal-secret"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_app(clock: Clock = None, release: asyncio.Event = None, **options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/complaint_status/{complaint_id}")
+    async def status(complaint_id: str):
+        if release is not None:
+            await release.wait()
+        return {"complaint_id": complaint_id}
+
+    @app.get("/api/complaints_by_mobile/{mobile}")
+    async def by_mobile(mobile: str):
+        return {"complaints": []}
+
+    @app.post("/api/register_complaint")
+    async def register():
+        return {}
+
+    settings = {"enabled": True, "per_ip": (1, 2), "per_mobile": (1, 100), "exempt_loopback": True,
+                "internal_token": TOKEN, **options}
+    app.add_middleware(RateLimitMiddleware, store=MemoryBucketStore(clock=clock or Clock()), **settings)
+    return app
+
+
+def test_ip_bucket_allows_a_burst_then_refills():
+    clock = Clock()
+    client = TestClient(make_app(clock))
+    assert [client.get("/api/complaint_status/CMP-1").status_code for _ in range(3)] == [200, 200, 429]
+    refused = client.get("/api/complaint_status/CMP-1")
+    assert refused.headers["retry-after"] == "1" and refused.json() == {"detail": "Too many requests"}
+    clock.now += 1
+    assert client.get("/api/complaint_status/CMP-1").status_code == 200
+    # Writes and other methods are not limited
+    assert client.post("/api/register_complaint").status_code == 200
+
+
+def test_mobile_bucket_is_keyed_by_the_mobile_listed():
+    client = TestClient(make_app(per_ip=(1, 100), per_mobile=(0.5, 2)))
+    codes = [client.get("/api/complaints_by_mobile/9123456780").status_code for _ in range(3)]
+    assert codes == [200, 200, 429]
+    assert client.get("/api/complaints_by_mobile/9123456781").status_code == 200
+    assert client.get("/api/complaints_by_mobile/9123456780").headers["retry-after"] == "2"
+
+
+def test_internal_token_skips_the_buckets():
+    client = TestClient(make_app())
+    headers = {INTERNAL_TOKEN_HEADER: TOKEN}
+    assert all(client.get("/api/complaint_status/CMP-1", headers=headers).status_code == 200 for _ in range(10))
+    wrong = {INTERNAL_TOKEN_HEADER: "guess"}
+    assert [client.get("/api/complaint_status/CMP-1", headers=wrong).status_code for _ in range(3)][-1] == 429
+
+
+def test_loopback_is_internal_unless_a_proxy_forwarded_it():
+    loopback = {"client": ("127.0.0.1", 5000), "headers": []}
+    assert is_internal_request(loopback, exempt_loopback=True, token="")
+    assert not is_internal_request(loopback, exempt_loopback=False, token="")
+    forwarded = {"client": ("127.0.0.1", 5000), "headers": [(b"x-forwarded-for", b"203.0.113.9")]}
+    assert not is_internal_request(forwarded, exempt_loopback=True, token="")
+    remote = {"client": ("203.0.113.9", 5000), "headers": [(INTERNAL_TOKEN_HEADER.lower().encode(), b"t")]}
+    assert is_internal_request(remote, exempt_loopback=False, token="t")
+    assert not is_internal_request(remote, exempt_loopback=False, token="")
+
+
+def test_zero_rate_turns_a_bucket_off():
+    client = TestClient(make_app(per_ip=(0, 0), per_mobile=(0, 0)))
+    assert all(client.get("/api/complaints_by_mobile/9123456780").status_code == 200 for _ in range(20))
+
+
+@pytest.mark.parametrize("limit", [(-1, 10), (1, 0)])
+def test_invalid_limits_fail_at_startup(limit):
+    with pytest.raises(ValueError, match="RATE_LIMIT_PER_IP"):
+        bucket_limit("RATE_LIMIT_PER_IP", limit)
+
+
+def test_admission_control_sheds_requests_past_the_cap():
+    async def scenario():
+        release = asyncio.Event()
+        app = make_app(release=release, enabled=False, max_concurrent=1, queue_size=1, queue_timeout=0.05)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            held = asyncio.ensure_future(client.get("/api/complaint_status/CMP-1"))
+            await asyncio.sleep(0.05)
+            # One request may wait for the slot; it times out, and one past the queue is refused at once
+            waiting, shed = await asyncio.gather(
+                client.get("/api/complaint_status/CMP-2"), client.get("/api/complaint_status/CMP-3")
+            )
+            release.set()
+            return (await held).status_code, waiting, shed
+
+    held, waiting, shed = asyncio.run(scenario())
+    assert held == 200
+    assert (waiting.status_code, shed.status_code) == (503, 503)
+    assert shed.json() == {"detail": "Server is busy, retry shortly"} and shed.headers["retry-after"] == "1"
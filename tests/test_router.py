@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from backend.agents.router import (
+    LIST_PROMPT, REGISTER_PROMPT, STATUS_PROMPT, FastPathAgent, IntentRouter, Route
+)
+
+ID = "CMP-01M56CBCZT9WSFF9"
+LEGACY_ID = "CMP-A1B2C3D4"
+REGISTERING = [
+    HumanMessage(content="I want to register a complaint"),
+    AIMessage(content=REGISTER_PROMPT),
+]
+
+
+class Tools:
+    def check_complaint_status(self, complaint_id):
+        return f"status of {complaint_id}"
+
+    def get_complaints_by_mobile(self, mobile):
+        return f"complaints for {mobile}"
+
+    async def acheck_complaint_status(self, complaint_id):
+        return self.check_complaint_status(complaint_id)
+
+    async def aget_complaints_by_mobile(self, mobile):
+        return self.get_complaints_by_mobile(mobile)
+
+
+class Executor:
+    """Stands in for the LLM agent and records the turns handed to it"""
+
+    def __init__(self):
+        self.turns = []
+
+    def invoke(self, inputs, config=None):
+        self.turns.append(inputs["input"])
+        return {"input": inputs["input"], "output": "from the LLM"}
+
+    async def ainvoke(self, inputs, config=None):
+        return self.invoke(inputs, config)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Quick-action buttons, whatever the case and punctuation
+    ("I want to register a new complaint", Route("register_prompt", [], REGISTER_PROMPT)),
+    ("i want to check my complaint status.", Route("status_prompt", [], STATUS_PROMPT)),
+    ("Show all my complaints!", Route("list_prompt", [], LIST_PROMPT)),
+    # Complaint IDs, bare or with status words; lowercase, repeated and excess IDs
+    (ID, Route("check_complaint_status", [ID])),
+    (f"my complaint id is {ID.lower()}", Route("check_complaint_status", [ID])),
+    (f"What is the status of {LEGACY_ID}?", Route("check_complaint_status", [LEGACY_ID])),
+    (f"track {ID} and {ID}", Route("check_complaint_status", [ID])),
+    ("check CMP-AAAAAAA1 CMP-AAAAAAA2 CMP-AAAAAAA3 CMP-AAAAAAA4",
+     Route("check_complaint_status", ["CMP-AAAAAAA1", "CMP-AAAAAAA2", "CMP-AAAAAAA3"])),
+    # Mobile numbers, bare, with a country code or with list words
+    ("9123456780", Route("get_complaints_by_mobile", ["9123456780"])),
+    ("+91 9123456780", Route("get_complaints_by_mobile", ["9123456780"])),
+    ("show complaints for 91-9123456780", Route("get_complaints_by_mobile", ["9123456780"])),
+    # Everything else goes to the LLM
+    (f"{ID} was closed but the pothole is still there", None),
+    ("My name is Asha, mobile 9123456780, the streetlight is broken", None),
+    ("9123456780 and 9123456781", None),
+    ("call me on 9123456780 tomorrow", None),
+    ("123456789012", None),
+    ("Hello", None),
+])
+def test_match(text, expected):
+    assert IntentRouter(Tools()).match(text) == expected
+
+
+@pytest.mark.parametrize("text", [ID, "9123456780", f"status of {ID}"])
+def test_registration_dialog_goes_to_the_llm(text):
+    router = IntentRouter(Tools())
+    assert router.match(text, REGISTERING) is None
+    # Once the bot has moved on, lookups are routed again
+    assert router.match(text, REGISTERING + [HumanMessage(content="ok"), AIMessage(content="Registered!")])
+
+
+def test_quick_actions_are_routed_even_mid_registration():
+    route = IntentRouter(Tools()).match("Show all my complaints", REGISTERING)
+    assert route == Route("list_prompt", [], LIST_PROMPT)
+
+
+def test_fast_path_answers_lookups_and_falls_through_to_the_llm():
+    executor = Executor()
+    agent = FastPathAgent(executor, IntentRouter(Tools()))
+    routed = agent.invoke({"input": f"{ID} {LEGACY_ID}", "chat_history": []})
+    assert routed == {"input": f"{ID} {LEGACY_ID}", "output": f"status of {ID}\n\nstatus of {LEGACY_ID}",
+                      "fast_path": True}
+    assert agent.invoke({"input": "9123456780", "chat_history": REGISTERING})["output"] == "from the LLM"
+    assert asyncio.run(agent.ainvoke({"input": "9123456780"}))["output"] == "complaints for 9123456780"
+    assert executor.turns == ["9123456780"]
+    assert agent.stats.as_dict() == {
+        "total_turns": 3, "fast_path_turns": 2, "fast_path_percent": 66.7,
+        "by_intent": {"check_complaint_status": 1, "get_complaints_by_mobile": 1},
+    }
@@ -0,0 +1,20 @@
+import mongomock
+
+from backend.api.ratelimit import INTERNAL_API_TOKEN, INTERNAL_TOKEN_HEADER
+from backend.database.database import Database
+from backend.search.engines import LocalSearch, MongoTextSearch, create_search_engine
+
+
+def test_text_search_is_the_default_and_local_is_opt_in(monkeypatch):
+    database = Database(client=mongomock.MongoClient())
+    monkeypatch.delenv("SEARCH_BACKEND", raising=False)
+    assert isinstance(create_search_engine(database), MongoTextSearch)
+    monkeypatch.setenv("SEARCH_BACKEND", "local")
+    assert isinstance(create_search_engine(database), LocalSearch)
+
+
+def test_search_route_is_for_operators(api):
+    assert api.get("/api/search", params={"q": "Asha"}).status_code == 403
+    # conftest sets SEARCH_BACKEND=none, so an operator gets as far as the disabled engine
+    response = api.get("/api/search", params={"q": "Asha"}, headers={INTERNAL_TOKEN_HEADER: INTERNAL_API_TOKEN})
+    assert response.status_code == 404
@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import mongomock
+
+from backend.api.ratelimit import INTERNAL_API_TOKEN, INTERNAL_TOKEN_HEADER
+from backend.database.database import Database
+
+OPERATOR = {INTERNAL_TOKEN_HEADER: INTERNAL_API_TOKEN}
+
+
+class WritesDuringScan:
+    """Stands in for the complaints collection: the rebuild's scan reads each
+    document as it is at that moment, and ``write`` runs after ``after`` of them"""
+
+    def __init__(self, complaints, after: int, write):
+        self.complaints = complaints
+        self.after = after
+        self.write = write
+
+    def find(self, query, projection):
+        ids = [document["_id"] for document in self.complaints.find(query, {"_id": 1}).sort("_id", 1)]
+        return Scan(self, ids, projection)
+
+
+class Scan:
+    def __init__(self, source: WritesDuringScan, ids, projection):
+        self.source, self.ids, self.projection = source, ids, projection
+
+    def batch_size(self, size: int):
+        return self
+
+    def __iter__(self):
+        for position, _id in enumerate(self.ids):
+            if position == self.source.after:
+                self.source.write()
+            yield self.source.complaints.find_one({"_id": _id}, self.projection)
+
+
+def make_database() -> Database:
+    database = Database(client=mongomock.MongoClient())
+    database.stats.marker_ttl = 0
+    return database
+
+
+def register(database: Database, n: int, category=None):
+    return database.create_complaint({
+        "name": "Asha Rao", "mobile": f"91234567{n:02d}", "complaint_details": f"Complaint {n}",
+        "status": "In Progress", "category": category, "priority": None,
+    })
+
+
+def classify(database: Database, complaint_id: str, category: str):
+    document = database.complaints.find_one({"complaint_id": complaint_id}, {"complaint_id": 1})
+    database.set_classifications([{**document, "category": category, "priority": "Medium"}])
+
+
+def test_rebuild_keeps_writes_made_during_the_scan():
+    database = make_database()
+    complaints = [register(database, n, None if n in (0, 5) else "Water Supply") for n in range(6)]
+    early, late = complaints[0].complaint_id, complaints[5].complaint_id
+
+    def write():
+        # The scan has read the first three complaints, so it saw early before and late after these
+        classify(database, early, "Roads")
+        database.update_complaint_status(early, "Closed")
+        classify(database, late, "Electricity")
+        database.update_complaint_status(late, "Assigned")
+        register(database, 6, "Sanitation")
+
+    stats = database.stats
+    real_complaints = stats.complaints
+    stats.complaints = WritesDuringScan(real_complaints, 3, write)
+    result = stats.rebuild()
+    stats.complaints = real_complaints
+
+    assert result["complaints"] == 6 and result["journaled"] == 5
+    rebuilt = stats.read()
+    assert rebuilt["total"] == 7
+    assert rebuilt["by_status"] == {"In Progress": 5, "Closed": 1, "Assigned": 1}
+    assert rebuilt["by_category"] == {"Water Supply": 4, "Roads": 1, "Electricity": 1, "Sanitation": 1}
+    assert rebuilt["resolution_hours"]["resolved"] == 1
+
+    # A rebuild with nothing writing alongside it agrees, and leaves no marker or journal behind
+    stats.rebuild()
+    assert stats.read() == rebuilt
+    assert database.db.stats_rollups.find_one({"_id": "rebuild"}) is None
+    assert database.db.stats_rollups_journal.count_documents({}) == 0
+
+
+def test_writes_after_a_rebuild_apply_directly():
+    database = make_database()
+    register(database, 0, "Roads")
+    database.stats.rebuild()
+    register(database, 1, "Roads")
+    assert database.stats.read()["by_category"] == {"Roads": 2}
+    assert database.db.stats_rollups_journal.count_documents({}) == 0
+
+
+def test_rebuild_route_is_for_operators_and_refuses_a_second_rebuild(api):
+    assert api.post("/api/jobs/rebuild_stats").status_code == 403
+    api.database.stats._set_marker(datetime.now())
+    refused = api.post("/api/jobs/rebuild_stats", headers=OPERATOR)
+    assert refused.status_code == 409 and "running since" in refused.json()["detail"]
+    api.database.db.stats_rollups.delete_one({"_id": "rebuild"})
+    assert api.post("/api/jobs/rebuild_stats", headers=OPERATOR).status_code == 200
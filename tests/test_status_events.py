@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.api.ratelimit import INTERNAL_API_TOKEN, INTERNAL_TOKEN_HEADER
+from backend.events.broker import StatusBroker, TooManySubscribers, format_sse
+
+OPERATOR = {INTERNAL_TOKEN_HEADER: INTERNAL_API_TOKEN}
+
+
+def event(complaint_id: str, version: int = 1, mobile: str = "9123456700", status: str = "Assigned"):
+    return {"complaint_id": complaint_id, "status": status, "version": version, "mobile": mobile}
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def with_broker(scenario, **options):
+    """Run ``scenario(broker)`` on a fresh loop the broker is bound to"""
+    async def run():
+        broker = StatusBroker(**{"heartbeat": 60, **options})
+        broker.bind(asyncio.get_running_loop())
+        try:
+            return await scenario(broker)
+        finally:
+            broker.close()
+
+    return asyncio.run(run())
+
+
+def test_events_fan_out_to_complaint_and_mobile_subscribers():
+    async def scenario(broker):
+        first = broker.subscribe(["CMP-1"])
+        second = broker.subscribe(["CMP-1", "CMP-2"])
+        by_mobile = broker.subscribe(mobiles=["9123456700"])
+        other = broker.subscribe(["CMP-3"], ["9123456799"])
+        broker.publish([event("CMP-1"), event("CMP-2", mobile="9123456711")])
+        # From another thread the events are handed to the loop
+        thread = threading.Thread(target=broker.publish, args=([event("CMP-1", version=2)],))
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0.01)
+        return [[e["complaint_id"] for e in drain(s)] for s in (first, second, by_mobile, other)], broker.stats()
+
+    received, stats = with_broker(scenario)
+    assert received == [["CMP-1", "CMP-1"], ["CMP-1", "CMP-2", "CMP-1"], ["CMP-1", "CMP-1"], []]
+    assert stats == {"subscribers": 4, "published": 3, "delivered": 7}
+
+
+def test_a_slow_subscriber_keeps_only_the_newest_events():
+    async def scenario(broker):
+        slow = broker.subscribe(["CMP-1"])
+        broker.publish([event("CMP-1", version) for version in range(1, 6)])
+        return [e["version"] for e in drain(slow)], slow.dropped
+
+    assert with_broker(scenario, queue_size=2) == ([4, 5], 3)
+
+
+def test_subscriber_cap_refuses_new_streams_until_one_closes():
+    async def scenario(broker):
+        first = broker.subscribe(["CMP-1"], ["9123456700"])
+        broker.subscribe(["CMP-1"])
+        with pytest.raises(TooManySubscribers):
+            broker.subscribe(["CMP-2"])
+        broker.unsubscribe(first)
+        broker.subscribe(["CMP-2"])
+        return broker
+
+    broker = with_broker(scenario, max_subscribers=2)
+    assert broker.subscribers == 2
+    assert set(broker.by_complaint) == {"CMP-1", "CMP-2"} and broker.by_mobile == {}
+
+
+def test_sse_frames_leave_out_the_mobile():
+    frame = format_sse(event("CMP-1", version=3))
+    assert frame.startswith("id: CMP-1:3\nevent: status\n")
+    assert "9123456700" not in frame
+
+
+def test_stream_route_refuses_past_the_cap(api):
+    from backend.api import api_server
+
+    broker = api_server.status_broker
+    cap = broker.max_subscribers
+    broker.max_subscribers = broker.subscribers
+    try:
+        assert api.get("/api/status_events", params={"complaint_id": "CMP-1"}).status_code == 503
+    finally:
+        broker.max_subscribers = cap
+
+
+def test_local_feed_delivers_a_patched_status(api):
+    from backend.api import api_server
+
+    complaint_id = api.database.create_complaint({
+        "name": "Asha Rao", "mobile": "9123456700", "complaint_details": "Streetlight out",
+        "status": "In Progress",
+    }).complaint_id
+    broker = api_server.status_broker
+    # mongomock has no change streams, so the broker listens to this process's Database
+    subscription = broker.subscribe(mobiles=["9123456700"])
+    try:
+        assert api.patch(f"/api/complaint_status/{complaint_id}", json={"status": "Assigned"},
+                         headers=OPERATOR).status_code == 200
+        delivered = api.portal.call(asyncio.wait_for, subscription.queue.get(), 5)
+    finally:
+        broker.unsubscribe(subscription)
+    assert (delivered["complaint_id"], delivered["status"], delivered["version"]) == (complaint_id, "Assigned", 1)
@@ -0,0 +1,134 @@
+from datetime import datetime
+
+import mongomock
+import pytest
+
+from backend.api.ratelimit import INTERNAL_API_TOKEN, INTERNAL_TOKEN_HEADER
+from backend.database.database import Database, StatusTransitionError, VersionConflict
+
+OPERATOR = {INTERNAL_TOKEN_HEADER: INTERNAL_API_TOKEN}
+
+
+def make_database() -> Database:
+    return Database(client=mongomock.MongoClient())
+
+
+def register(database: Database, n: int = 0) -> str:
+    return database.create_complaint({
+        "name": "Asha Rao", "mobile": f"91234567{n:02d}", "complaint_details": f"Complaint {n}",
+        "status": "In Progress",
+    }).complaint_id
+
+
+def test_legal_transition_bumps_the_version_and_stamps_resolution():
+    database = make_database()
+    complaint_id = register(database)
+    assigned = database.update_complaint_status(complaint_id, "Assigned", expected_version=0)
+    assert (assigned.status, assigned.version) == ("Assigned", 1)
+    resolved = database.update_complaint_status(complaint_id, "Resolved")
+    assert (resolved.status, resolved.version) == ("Resolved", 2)
+    assert database.complaints.find_one({"complaint_id": complaint_id})["resolved_at"] is not None
+    reopened = database.update_complaint_status(complaint_id, "In Progress")
+    assert "resolved_at" not in database.complaints.find_one({"complaint_id": complaint_id})
+    assert reopened.version == 3
+
+
+def test_illegal_transition_is_refused_and_leaves_the_complaint_alone():
+    database = make_database()
+    complaint_id = register(database)
+    with pytest.raises(StatusTransitionError, match="cannot move from In Progress to Resolved"):
+        database.update_complaint_status(complaint_id, "Resolved")
+    database.update_complaint_status(complaint_id, "Closed")
+    with pytest.raises(StatusTransitionError):
+        database.update_complaint_status(complaint_id, "In Progress")
+    assert database.complaints.find_one({"complaint_id": complaint_id})["version"] == 1
+
+
+def test_stale_version_is_a_conflict_carrying_the_current_state():
+    database = make_database()
+    complaint_id = register(database)
+    database.update_complaint_status(complaint_id, "Assigned", expected_version=0)
+    with pytest.raises(VersionConflict) as raised:
+        database.update_complaint_status(complaint_id, "Resolved", expected_version=0)
+    assert (raised.value.current.status, raised.value.current.version) == ("Assigned", 1)
+    assert raised.value.expected_version == 0
+
+
+def test_unknown_status_and_unknown_id():
+    database = make_database()
+    with pytest.raises(ValueError, match="Unknown status"):
+        database.update_complaint_status(register(database), "Escalated")
+    assert database.update_complaint_status("CMP-MISSING", "Assigned") is None
+
+
+def test_complaint_stored_before_versioning_counts_as_version_zero():
+    database = make_database()
+    stored_at = datetime(2024, 1, 1)
+    database.complaints.insert_one({"complaint_id": "CMP-LEGACY01", "name": "Asha Rao", "mobile": "9123456700",
+                                    "complaint_details": "Old complaint", "status": "In Progress",
+                                    "created_at": stored_at, "updated_at": stored_at})
+    updated = database.update_complaint_status("CMP-LEGACY01", "Assigned", expected_version=0)
+    assert updated.version == 1
+
+
+def test_bulk_update_reports_each_item_on_its_own():
+    database = make_database()
+    fresh, stale, closed, twice = (register(database, n) for n in range(4))
+    database.update_complaint_status(stale, "Assigned")
+    database.update_complaint_status(closed, "Closed")
+
+    results = database.bulk_update_status([
+        {"complaint_id": fresh, "status": "Assigned", "expected_version": 0},
+        {"complaint_id": stale, "status": "Resolved", "expected_version": 0},
+        {"complaint_id": closed, "status": "In Progress"},
+        {"complaint_id": "CMP-MISSING", "status": "Assigned"},
+        {"complaint_id": twice, "status": "Escalated"},
+        {"complaint_id": twice, "status": "Assigned"},
+    ])
+    assert [result.get("error") for result in results] == [
+        None, "version_conflict", "invalid_transition", "not_found", "unknown_status", "duplicate_in_batch"
+    ]
+    assert results[0] == {"complaint_id": fresh, "ok": True, "status": "Assigned", "version": 1}
+    assert (results[1]["status"], results[1]["version"]) == ("Assigned", 1)
+    assert database.complaints.find_one({"complaint_id": twice})["status"] == "In Progress"
+
+
+def test_routes_map_failures_to_404_409_and_422(api):
+    complaint_id = register(api.database)
+    url = f"/api/complaint_status/{complaint_id}"
+
+    response = api.patch(url, json={"status": "Assigned", "expected_version": 0}, headers=OPERATOR)
+    assert response.status_code == 200 and response.json()["version"] == 1
+    assert api.patch(url, json={"status": "Closed", "expected_version": 0}, headers=OPERATOR).status_code == 409
+    assert api.patch(url, json={"status": "Assigned"}, headers=OPERATOR).status_code == 409
+    assert api.patch(url, json={"status": "Escalated"}, headers=OPERATOR).status_code == 422
+    assert api.patch("/api/complaint_status/CMP-MISSING", json={"status": "Assigned"},
+                     headers=OPERATOR).status_code == 404
+
+    bulk = api.patch("/api/complaint_status", headers=OPERATOR, json={"updates": [
+        {"complaint_id": complaint_id, "status": "Resolved", "expected_version": 1},
+        {"complaint_id": "CMP-MISSING", "status": "Assigned"},
+    ]}).json()
+    assert (bulk["updated"], bulk["failed"]) == (1, 1)
+    assert bulk["results"][1]["error"] == "not_found"
+
+
+def test_status_routes_refuse_the_public(api):
+    complaint_id = register(api.database)
+    assert api.patch(f"/api/complaint_status/{complaint_id}", json={"status": "Closed"}).status_code == 403
+    wrong = {INTERNAL_TOKEN_HEADER: "guess"}
+    assert api.patch("/api/complaint_status", headers=wrong, json={"updates": [
+        {"complaint_id": complaint_id, "status": "Closed"}
+    ]}).status_code == 403
+    assert api.database.complaints.find_one({"complaint_id": complaint_id})["status"] == "In Progress"
+
+
+@pytest.mark.parametrize("method, path", [
+    ("GET", "/api/cache/stats"),
+    ("GET", "/api/jobs/stats"),
+    ("GET", "/api/status_events/stats"),
+    ("POST", "/api/jobs/backfill_categories"),
+])
+def test_operator_endpoints_refuse_the_public(api, method, path):
+    assert api.request(method, path).status_code == 403
+    assert api.request(method, path, headers=OPERATOR).status_code == 200
@@ -0,0 +1,188 @@
+"""Contract every ComplaintTools backend must meet.
+
+The same tests run against HttpComplaintBackend, talking to the FastAPI app,
+and DirectComplaintBackend, calling Database in process. Both sit on
+mongomock. A backend that answers differently fails here. It does not show up
+as a speed-up in benchmarks/bench_tool_backends.py.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.agents.agents import ComplaintTools
+from backend.agents.backends import BUSY_MESSAGE, BackendError, HttpComplaintBackend
+from backend.agents.direct_backend import DirectComplaintBackend
+from backend.database.database import Database
+
+DETAILS = [
+    "Streetlight broken on 4th cross since Monday",
+    "Garbage has not been collected from the market road",
+    "Water pipe burst flooding the school playground",
+]
+
+
+def make_database() -> Database:
+    return Database(client=mongomock.MongoClient())
+
+
+@pytest.fixture(params=["http", "direct"])
+def harness(request):
+    """The backend under test, the Database behind it and the AsyncDatabase it writes through"""
+    database = make_database()
+    if request.param == "http":
+        from backend.api import api_server
+        api_server.app.state.database = database
+        with TestClient(api_server.app) as client:
+            # TestClient is a requests-style session; the timeout must be a single number for httpx
+            backend = HttpComplaintBackend(api_base_url=str(client.base_url), session=client, timeout=10)
+            yield SimpleNamespace(backend=backend, database=database,
+                                  async_database=lambda: api_server.db)
+        api_server.app.state.database = None
+    else:
+        backend = DirectComplaintBackend(database)
+        yield SimpleNamespace(backend=backend, database=database,
+                              async_database=lambda: backend._async_database)
+        asyncio.run(backend.aclose())
+
+
+def register(backend, mobile: str, details: str = DETAILS[0], name: str = "Asha Rao"):
+    return backend.register_complaint({"name": name, "mobile": mobile, "complaint_details": details})
+
+
+def wait_for_audit(database: Database, complaint_id: str, timeout: float = 5.0):
+    """The audit entry a follow-up job writes after the registration has replied"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        entry = database.audit_log.find_one({"complaint_id": complaint_id, "event": "registered"})
+        if entry is not None:
+            return entry
+        time.sleep(0.02)
+    return None
+
+
+def test_register_returns_id_and_runs_follow_up_jobs(harness):
+    data = register(harness.backend, "9123456780")
+    assert data["duplicate"] is False
+    assert data["complaint_id"].startswith("CMP-")
+    assert data["message"] == f"Complaint registered successfully with ID: {data['complaint_id']}"
+    entry = wait_for_audit(harness.database, data["complaint_id"])
+    assert entry is not None and entry["details"] == {"mobile": "9123456780"}
+
+
+def test_repeat_registration_returns_the_open_complaint(harness):
+    first = register(harness.backend, "9123456781")
+    repeat = register(harness.backend, "9123456781")
+    assert repeat["duplicate"] is True
+    assert repeat["complaint_id"] == first["complaint_id"]
+    assert harness.database.complaints.count_documents({"mobile": "9123456781"}) == 1
+    stored = harness.database.complaints.find_one({"complaint_id": first["complaint_id"]})
+    assert stored["repeat_reports"] == 1
+    assert [followup["details"] for followup in stored["followups"]] == [DETAILS[0]]
+    assert stored["followups"][0]["reported_at"] == stored["last_reported_at"]
+
+
+def test_status(harness):
+    complaint_id = register(harness.backend, "9123456782")["complaint_id"]
+    status = harness.backend.get_complaint_status(complaint_id)
+    assert list(status) == ["complaint_id", "status", "category", "priority", "created_at", "updated_at", "version"]
+    assert status["complaint_id"] == complaint_id
+    assert status["status"] == "In Progress"
+    assert status["version"] == 0
+    assert isinstance(status["created_at"], str)
+
+
+def test_status_not_found(harness):
+    assert harness.backend.get_complaint_status("CMP-MISSING") is None
+    tools = ComplaintTools(backend=harness.backend)
+    assert "No complaint found with ID: CMP-MISSING" in tools.check_complaint_status(" CMP-MISSING ")
+
+
+def test_listing_newest_first_with_next_cursor(harness):
+    ids = [register(harness.backend, "9123456783", details)["complaint_id"] for details in DETAILS]
+
+    page = harness.backend.get_complaints_by_mobile("9123456783", 2)
+    assert [item["complaint_id"] for item in page["complaints"]] == ids[::-1][:2]
+    assert page["next_cursor"]
+    assert set(page["complaints"][0]) == {"complaint_id", "status", "details", "category", "priority", "created_at"}
+
+    everything = harness.backend.get_complaints_by_mobile("9123456783", 10)
+    assert [item["complaint_id"] for item in everything["complaints"]] == ids[::-1]
+    assert everything["next_cursor"] is None
+
+
+def test_listing_for_unknown_mobile_is_empty(harness):
+    assert harness.backend.get_complaints_by_mobile("0000000000", 10) == {"complaints": [], "next_cursor": None}
+    tools = ComplaintTools(backend=harness.backend)
+    assert "No complaints found" in tools.get_complaints_by_mobile("0000000000")
+
+
+def test_tools_format_both_backends_alike(harness):
+    tools = ComplaintTools(backend=harness.backend, page_size=1)
+    registered = tools.register_complaint("Asha Rao, 9123456784, Streetlight broken on 4th cross")
+    assert "registered successfully" in registered
+    complaint_id = registered.rsplit(" ", 1)[-1]
+    status = tools.check_complaint_status(complaint_id)
+    assert f"- ID: {complaint_id}" in status and "- Status: In Progress" in status
+    register(harness.backend, "9123456784", DETAILS[1])
+    listing = tools.get_complaints_by_mobile("9123456784")
+    assert "Garbage has not been collected" in listing and "Showing the 1 most recent" in listing
+    assert "Please provide all required information" in tools.register_complaint("just a name")
+
+
+def test_storage_failure_on_register_raises_backend_error(harness, monkeypatch):
+    async def fail(document):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(harness.async_database(), "create_complaint", fail)
+    with pytest.raises(BackendError, match="database unavailable"):
+        register(harness.backend, "9123456785")
+    tools = ComplaintTools(backend=harness.backend)
+    assert "Failed to register complaint" in tools.register_complaint("Asha Rao, 9123456785, Broken pipe")
+
+
+class CannedSession:
+    """requests-style session answering every call with one status code"""
+
+    def __init__(self, status_code: int, detail: str = "boom"):
+        self.response = SimpleNamespace(status_code=status_code, text=detail, json=lambda: {"detail": detail})
+
+    def get(self, url, **kwargs):
+        return self.response
+
+    def post(self, url, **kwargs):
+        return self.response
+
+
+@pytest.mark.parametrize("status_code", [429, 503])
+def test_http_busy_responses_are_errors_not_missing_complaints(status_code):
+    backend = HttpComplaintBackend(session=CannedSession(status_code, "Too many requests"))
+    with pytest.raises(BackendError, match=BUSY_MESSAGE):
+        backend.get_complaint_status("CMP-0001")
+    with pytest.raises(BackendError, match=BUSY_MESSAGE):
+        backend.get_complaints_by_mobile("9123456786", 10)
+    with pytest.raises(BackendError, match=BUSY_MESSAGE):
+        register(backend, "9123456786")
+    assert "busy" in ComplaintTools(backend=backend).check_complaint_status("CMP-0001")
+
+
+def test_http_other_errors_carry_the_api_detail():
+    backend = HttpComplaintBackend(session=CannedSession(500, "Internal failure"))
+    with pytest.raises(BackendError, match="Internal failure"):
+        backend.get_complaint_status("CMP-0001")
+
+
+def test_listing_route_without_paging_keeps_the_bare_list(api):
+    ids = [api.database.create_complaint({
+        "name": "Asha Rao", "mobile": "9123456787", "complaint_details": details, "status": "In Progress",
+    }).complaint_id for details in DETAILS]
+    listing = api.get("/api/complaints_by_mobile/9123456787").json()
+    assert [item["complaint_id"] for item in listing] == ids[::-1]
+    assert set(listing[0]) == {"complaint_id", "status", "details", "category", "priority", "created_at"}
+    page = api.get("/api/complaints_by_mobile/9123456787", params={"limit": 2}).json()
+    assert [item["complaint_id"] for item in page["complaints"]] == ids[::-1][:2]
+    rest = api.get("/api/complaints_by_mobile/9123456787", params={"after": page["next_cursor"]}).json()
+    assert [item["complaint_id"] for item in rest["complaints"]] == ids[:1] and rest["next_cursor"] is None